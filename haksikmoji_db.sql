@@ -56,8 +56,10 @@ CREATE TABLE `cafeteria_menu` (
   `day_id` int(11) NOT NULL,
   `menu_id` int(11) NOT NULL,
   `meal_id` int(11) NOT NULL,
+  `menu_date` date DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `cafeteria_id` (`cafeteria_id`),
+  KEY `ix_cafeteria_menu_cafeteria_date_meal` (`cafeteria_id`,`menu_date`,`meal_id`),
   KEY `day_id` (`day_id`),
   KEY `menu_id` (`menu_id`),
   KEY `fk_meal_type` (`meal_id`),
@@ -74,7 +76,7 @@ CREATE TABLE `cafeteria_menu` (
 
 LOCK TABLES `cafeteria_menu` WRITE;
 /*!40000 ALTER TABLE `cafeteria_menu` DISABLE KEYS */;
-INSERT INTO `cafeteria_menu` VALUES (1,1,1,1,1),(2,1,1,2,1),(3,1,1,3,1),(4,1,1,4,1),(5,1,1,5,1),(6,1,1,6,1),(7,1,2,7,1),(8,1,2,8,1),(9,1,2,9,1),(10,1,2,10,1),(11,1,2,11,1),(12,1,2,12,1),(13,1,3,13,1),(14,1,3,14,1),(15,1,3,15,1),(16,1,3,16,1),(17,1,3,17,1),(18,1,3,18,1),(19,1,4,19,1),(20,1,4,20,1),(21,1,4,21,1),(22,1,4,22,1),(23,1,4,23,1),(24,1,4,24,1),(25,1,5,25,1),(26,1,5,26,1),(27,1,5,27,1),(28,1,5,28,1),(29,1,5,29,1),(30,1,5,30,1),(31,1,1,31,2),(32,1,1,32,2),(33,1,1,33,2),(34,1,1,34,2),(35,1,1,35,2),(36,1,1,36,2),(37,1,2,37,2),(38,1,2,38,2),(39,1,2,39,2),(40,1,2,40,2),(41,1,2,41,2),(42,1,2,42,2),(43,1,3,43,2),(44,1,3,44,2),(45,1,3,45,2),(46,1,3,46,2),(47,1,3,47,2),(48,1,3,48,2),(49,1,4,49,2),(50,1,4,50,2),(51,1,4,51,2),(52,1,4,52,2),(53,1,4,53,2),(54,1,4,54,2),(55,1,5,55,2),(56,1,5,56,2),(57,1,5,57,2),(58,1,5,58,2),(59,1,5,59,2),(60,1,5,60,2);
+INSERT INTO `cafeteria_menu` (`id`, `cafeteria_id`, `day_id`, `menu_id`, `meal_id`) VALUES (1,1,1,1,1),(2,1,1,2,1),(3,1,1,3,1),(4,1,1,4,1),(5,1,1,5,1),(6,1,1,6,1),(7,1,2,7,1),(8,1,2,8,1),(9,1,2,9,1),(10,1,2,10,1),(11,1,2,11,1),(12,1,2,12,1),(13,1,3,13,1),(14,1,3,14,1),(15,1,3,15,1),(16,1,3,16,1),(17,1,3,17,1),(18,1,3,18,1),(19,1,4,19,1),(20,1,4,20,1),(21,1,4,21,1),(22,1,4,22,1),(23,1,4,23,1),(24,1,4,24,1),(25,1,5,25,1),(26,1,5,26,1),(27,1,5,27,1),(28,1,5,28,1),(29,1,5,29,1),(30,1,5,30,1),(31,1,1,31,2),(32,1,1,32,2),(33,1,1,33,2),(34,1,1,34,2),(35,1,1,35,2),(36,1,1,36,2),(37,1,2,37,2),(38,1,2,38,2),(39,1,2,39,2),(40,1,2,40,2),(41,1,2,41,2),(42,1,2,42,2),(43,1,3,43,2),(44,1,3,44,2),(45,1,3,45,2),(46,1,3,46,2),(47,1,3,47,2),(48,1,3,48,2),(49,1,4,49,2),(50,1,4,50,2),(51,1,4,51,2),(52,1,4,52,2),(53,1,4,53,2),(54,1,4,54,2),(55,1,5,55,2),(56,1,5,56,2),(57,1,5,57,2),(58,1,5,58,2),(59,1,5,59,2),(60,1,5,60,2);
 /*!40000 ALTER TABLE `cafeteria_menu` ENABLE KEYS */;
 UNLOCK TABLES;
 
@@ -261,6 +263,32 @@ INSERT INTO `menu_option` VALUES (1,1,'단품','5,900원'),(2,1,'세트','7,500
 /*!40000 ALTER TABLE `menu_option` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `message_outbox`
+--
+
+DROP TABLE IF EXISTS `message_outbox`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `message_outbox` (
+  `id` int(11) NOT NULL AUTO_INCREMENT,
+  `channel` varchar(30) NOT NULL,
+  `recipient` varchar(50) NOT NULL,
+  `payload` text NOT NULL,
+  `status` varchar(20) NOT NULL DEFAULT 'pending',
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `next_attempt_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `claim_token` varchar(36) DEFAULT NULL,
+  `claimed_at` timestamp NULL DEFAULT NULL,
+  `last_error` varchar(500) DEFAULT NULL,
+  `created_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `sent_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `ix_message_outbox_status_next_attempt` (`status`,`next_attempt_at`),
+  KEY `ix_message_outbox_claim_token` (`claim_token`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `notice`
 --
@@ -337,6 +365,7 @@ CREATE TABLE `store` (
   PRIMARY KEY (`sid`),
   KEY `school_id` (`school_id`),
   KEY `fk_category` (`category_id`),
+  KEY `ix_store_school_category_sid` (`school_id`,`category_id`,`sid`),
   CONSTRAINT `fk_category` FOREIGN KEY (`category_id`) REFERENCES `category` (`id`),
   CONSTRAINT `store_ibfk_1` FOREIGN KEY (`school_id`) REFERENCES `school` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=33 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
@@ -385,6 +414,20 @@ INSERT INTO `store_hours` VALUES (1,1,1,'11:30:00','21:00:00','15:00:00','16:30:
 /*!40000 ALTER TABLE `store_hours` ENABLE KEYS */;
 UNLOCK TABLES;
 
+--
+-- Table structure for table `store_schedule_change`
+--
+
+DROP TABLE IF EXISTS `store_schedule_change`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `store_schedule_change` (
+  `sid` int(11) NOT NULL,
+  `version` int(11) NOT NULL DEFAULT 1,
+  PRIMARY KEY (`sid`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `user`
 --
@@ -458,6 +501,41 @@ LOCK TABLES `user_favorite_store` WRITE;
 INSERT INTO `user_favorite_store` VALUES (55,16,'2024-11-19 03:41:38'),(55,22,'2024-11-19 02:40:30'),(56,19,'2024-11-19 06:51:00'),(56,24,'2024-11-19 06:50:55'),(58,1,'2024-11-24 11:05:57'),(58,5,'2024-11-24 11:06:02'),(62,3,'2024-11-26 09:12:36'),(62,4,'2024-11-26 09:12:41'),(62,16,'2024-11-26 09:16:24'),(62,17,'2024-11-26 09:11:19'),(62,18,'2024-11-26 09:11:24'),(62,19,'2024-11-26 09:11:22'),(62,20,'2024-11-26 09:11:27'),(62,22,'2024-11-26 09:11:15'),(62,23,'2024-11-26 09:11:29'),(82,9,'2025-01-15 11:58:11'),(82,16,'2025-01-15 11:58:07'),(82,23,'2025-01-15 11:18:55');
 /*!40000 ALTER TABLE `user_favorite_store` ENABLE KEYS */;
 UNLOCK TABLES;
+
+--
+-- Table structure for table `user_token_version`
+--
+
+DROP TABLE IF EXISTS `user_token_version`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `user_token_version` (
+  `uid` int(11) NOT NULL,
+  `version` int(11) NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  PRIMARY KEY (`uid`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Table structure for table `verification_code`
+--
+
+DROP TABLE IF EXISTS `verification_code`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!40101 SET character_set_client = utf8 */;
+CREATE TABLE `verification_code` (
+  `key` varchar(100) NOT NULL,
+  `code_hash` varchar(64) DEFAULT NULL,
+  `attempts` int(11) NOT NULL DEFAULT 0,
+  `expires_at` timestamp NULL DEFAULT NULL,
+  `verified_until` timestamp NULL DEFAULT NULL,
+  `send_count` int(11) NOT NULL DEFAULT 0,
+  `window_started_at` timestamp NULL DEFAULT NULL,
+  `last_sent_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`key`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 /*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
 
 /*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
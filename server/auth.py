@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from server.utils import get_skt_time
 from fastapi.security import APIKeyHeader
 from server.db import get_db
-from server.models import User
+from server.util.principal import Principal, decode_token, load_principal
+from server.util.token_version import is_token_current
 
 from datetime import timedelta
 
@@ -19,37 +20,75 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 
 
 # 토큰 생성 함수
-def create_jwt_token(user):
+# role / sid(운영 매장) / ver(토큰 버전) claims로 매장 사장님 권한은 DB 조회 없이 확인
+def create_jwt_token(user, version: int = 0):
   payload = {
     "uid": user.uid,
     "std_id": user.std_id,
+    "role": user.role,
+    "sid": user.store_id,
+    "ver": version,
     "exp": get_skt_time() + timedelta(days=60)  # 토큰 유효 기간 설정 (1시간)
   }
   
   token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
   return token
 
-# 토큰 검증 함수
-def verify_jwt_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# 토큰 서명/만료/버전 검증 후 payload 반환
+def decode_jwt_token(token: str, db: Session) -> dict:
   try:
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    user_id: str = payload.get("uid")
-    
-    if user_id is None:
-      raise HTTPException(status_code=403, detail="토큰이 유효하지 않음")
-    
-    
-    # 유저 정보 조회
-    user = db.query(User).filter(User.uid == user_id).first()
-    
-    if user is None:
-      raise HTTPException(status_code=403, detail="유저를 찾을 수 없음")
-    
-    return user
-
+    payload = decode_token(token, SECRET_KEY, ALGORITHM)
   except jwt.ExpiredSignatureError:
     raise HTTPException(status_code=403, detail="토큰이 만료됨")
   except jwt.InvalidTokenError:
     raise HTTPException(status_code=403, detail="토큰이 유효하지 않음")
+  
+  if payload.get("uid") is None:
+    raise HTTPException(status_code=403, detail="토큰이 유효하지 않음")
+  
+  try:
+    is_current = is_token_current(db, payload)
   except Exception as e:
-    raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
\ No newline at end of file
+    raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+  
+  # 비밀번호 변경, 탈퇴 등으로 무효화된 토큰
+  if not is_current:
+    raise HTTPException(status_code=403, detail="토큰이 만료됨")
+  
+  return payload
+
+# 토큰 검증 함수 (검증된 토큰과 유저 정보는 캐시하여 매 요청마다 DB를 조회하지 않음)
+def verify_jwt_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+  payload = decode_jwt_token(token, db)
+  
+  try:
+    # 유저 정보 조회
+    user = load_principal(db, payload["uid"])
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
+  
+  if user is None:
+    raise HTTPException(status_code=403, detail="유저를 찾을 수 없음")
+  
+  return user
+
+# 매장 사장님 권한 확인 (경로의 store_id를 운영하는 사장님인지 토큰 claims만으로 확인)
+# role / sid claims가 없는 이전 토큰은 유저 정보를 조회하여 확인
+def require_store_owner(store_id: int, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> dict:
+  payload = decode_jwt_token(token, db)
+  
+  if "ver" in payload:
+    role, owned_store_id = payload.get("role"), payload.get("sid")
+  else:
+    user = verify_jwt_token(token, db)
+    role, owned_store_id = user.role, user.store_id
+  
+  # 사장님이 아닐 때
+  if role != 2:
+    raise HTTPException(status_code=403, detail="해당 작업을 수행할 권한이 없습니다.")
+  
+  # 해당 매장 사장님이 아닐 때
+  if owned_store_id != store_id:
+    raise HTTPException(status_code=403, detail="해당 매장에 대한 접근 권한이 없습니다.")
+  
+  return payload
@@ -8,7 +8,12 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from server.routes.__init__ import router
-from server.scheduler.update_store_status_scheduler import start_scheduler
+from server.scheduler.update_store_status_scheduler import start_scheduler, stop_scheduler
+from server.util.leader import run_as_leader
+from server.util.password import shutdown_password_pool
+from server.util.http_client import close_clients, upstream_states
+from server.util.outbox import start_dispatcher, stop_dispatcher
+from server.db import engine
 from dotenv import load_dotenv
 import threading
 import os
@@ -77,6 +82,11 @@ async def get_open_api_endpoint(credentials: Annotated[HTTPBasicCredentials, Dep
       routes=app.routes,
   )
 
+# 외부 API 서킷 브레이커, 동시 요청 수 상태 조회 (장애 확인용)
+@app.get("/health/upstreams", include_in_schema=False)
+async def get_upstream_states(credentials: Annotated[HTTPBasicCredentials, Depends(authenticate_user)],):
+  return upstream_states()
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -84,6 +94,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 모든 HTTP 메서드 허용 (GET, POST, 등)
     allow_headers=["*"],  # 모든 HTTP 헤더 허용
+    expose_headers=["X-Next-Cursor"],  # 페이지네이션 커서 헤더 노출
 )
 
 app.mount("/images", StaticFiles(directory="server/images", html=True), name="images")
@@ -103,14 +114,39 @@ async def custom_http_exception_handler(request: Request, exc: CustomHTTPExcepti
     }
   )
 
+# 워커가 여러 개여도 리더로 선출된 워커 하나에서만 스케쥴러 실행
+leader_stop_event = threading.Event()
+
 @app.on_event('startup')
 def start_background_scheduler():
-  print(f"매장 상태 스케쥴러 실행 {get_skt_time().now().time()}")
-  scheduler_thread = threading.Thread(target=start_scheduler)
-  scheduler_thread.daemon = True
-  scheduler_thread.start()
+  print(f"매장 상태 스케쥴러 리더 선출 시작 {get_skt_time().now().time()}")
+  leader_thread = threading.Thread(
+    target=run_as_leader,
+    args=(engine, start_scheduler, stop_scheduler, leader_stop_event),
+  )
+  leader_thread.daemon = True
+  leader_thread.start()
+
+@app.on_event('shutdown')
+def stop_background_scheduler():
+  leader_stop_event.set()
+
+@app.on_event('shutdown')
+def stop_password_pool():
+  shutdown_password_pool()
+
+# 워커마다 메세지 전송 대기열 dispatcher 실행
+@app.on_event('startup')
+async def start_message_dispatcher():
+  start_dispatcher()
+
+@app.on_event('shutdown')
+async def stop_message_dispatcher():
+  await stop_dispatcher()
+
+@app.on_event('shutdown')
+async def close_http_clients():
+  await close_clients()
   
 if __name__ == '__main__':
-  start_background_scheduler()
-  
   uvicorn.run(app, host="0.0.0.0", port=8080, reload=True, proxy_headers=True)
\ No newline at end of file
@@ -1,8 +1,7 @@
-from sqlalchemy import Column, Integer, String, TIMESTAMP, ForeignKey, Enum, Time, Boolean
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Enum, Time, Boolean, Date, Index
 # SQLAlchemy 모델에서 테이블의 각 필드를 정의하기 위한 모듈
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from datetime import time
 from server.utils import get_skt_time
 
 
@@ -50,6 +49,12 @@ class CafeteriaMenu(Base):
   menu = relationship('HaksikMenu')
   meal_id = Column(Integer, ForeignKey('meal_type.id'), nullable=False)
   meal = relationship('MealType')
+  # 메뉴가 제공되는 날짜 (NULL이면 날짜가 지정되지 않은 기본 주간 메뉴)
+  menu_date = Column(Date, nullable=True)
+
+  __table_args__ = (
+    Index('ix_cafeteria_menu_cafeteria_date_meal', 'cafeteria_id', 'menu_date', 'meal_id'),
+  )
 
 class HaksikMenu(Base):
   __tablename__ = 'haksik_menu'
@@ -79,6 +84,14 @@ class StoreHours(Base):
   break_start_time = Column(Time)
   break_exit_time = Column(Time)
 
+# 운영시간이 수정된 매장 (update_store가 추가하고, 리더 워커의 매장 상태 스케쥴러가 가져가서 전환 시각을 다시 계산한 뒤 삭제)
+class StoreScheduleChange(Base):
+  __tablename__ = 'store_schedule_change'
+  
+  sid = Column(Integer, primary_key=True, autoincrement=False)
+  # 수정될 때마다 1씩 증가 (같은 초에 다시 수정되어도 구분)
+  version = Column(Integer, default=1, nullable=False)
+
 # 매장 공지사항
 class StoreNotice(Base):
   __tablename__ = 'notice'
@@ -118,32 +131,10 @@ class Store(Base):
   menus = relationship('Menu', back_populates='store')
   menu_categories = relationship('MenuCategory', back_populates='store')
 
-  def update_is_open(self, db_session):
-    now = get_skt_time().time().replace(microsecond=0)
-    today_day_id = get_skt_time().weekday() + 1
-    
-    store_hours_today = db_session.query(StoreHours).filter_by(store_id=self.sid, day_of_week_id=today_day_id).first()
-    
-    if store_hours_today and store_hours_today.opening_time != None and store_hours_today.closing_time != None:
-      closing_time = store_hours_today.closing_time
-      
-      if closing_time == time(0, 0):
-        closing_time = time(23, 59, 59)
-      
-      if store_hours_today.opening_time <= now <= closing_time:
-        if store_hours_today.break_start_time and store_hours_today.break_exit_time:
-          if store_hours_today.break_start_time <= now <= store_hours_today.break_exit_time:
-            self.is_open = 'breaktime'
-          else:
-            self.is_open = 'opened'
-        else:
-          self.is_open = 'opened'
-      else:
-        self.is_open = 'closed'
-    else:
-      self.is_open = 'closed'
-    
-    db_session.commit()
+  __table_args__ = (
+    # 학교/카테고리별 매장 목록의 sid 기준 페이지 조회용
+    Index('ix_store_school_category_sid', 'school_id', 'category_id', 'sid'),
+  )
 
 # 즐겨찾기 테이블 정의 (User와 Store 간 다대다 관계)
 class UserFavoriteStore(Base):
@@ -199,6 +190,51 @@ class User(Base):
     back_populates='user'
   )
 
+# 유저별 토큰 버전 (비밀번호 변경, 탈퇴, 권한/매장 변경 시 증가하여 이전에 발급된 토큰을 무효화)
+# 유저 삭제 후에도 무효화가 유지되도록 user 테이블과 FK로 묶지 않음
+class UserTokenVersion(Base):
+  __tablename__ = 'user_token_version'
+  
+  uid = Column(Integer, primary_key=True, autoincrement=False)
+  version = Column(Integer, nullable=False, default=0)
+  updated_at = Column(TIMESTAMP, default=get_skt_time, nullable=False)
+
+# 외부로 보낼 메세지 (알림톡 등) - 요청은 행만 추가하고 백그라운드 dispatcher가 전송 (server/util/outbox.py)
+# status : pending(전송 대기) -> sending(dispatcher가 가져감) -> sent / failed(재시도 횟수 초과)
+class MessageOutbox(Base):
+  __tablename__ = 'message_outbox'
+  __table_args__ = (
+    Index('ix_message_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    Index('ix_message_outbox_claim_token', 'claim_token'),
+  )
+  
+  id = Column(Integer, primary_key=True, autoincrement=True)
+  channel = Column(String(30), nullable=False)
+  recipient = Column(String(50), nullable=False)
+  payload = Column(Text, nullable=False)
+  status = Column(String(20), nullable=False, default='pending')
+  attempts = Column(Integer, nullable=False, default=0)
+  next_attempt_at = Column(TIMESTAMP, default=get_skt_time, nullable=False)
+  claim_token = Column(String(36), nullable=True)
+  claimed_at = Column(TIMESTAMP, nullable=True)
+  last_error = Column(String(500), nullable=True)
+  created_at = Column(TIMESTAMP, default=get_skt_time, nullable=False)
+  sent_at = Column(TIMESTAMP, nullable=True)
+
+# 휴대폰 인증번호와 전송 제한 (VERIFICATION_STORE=db 일 때 사용, server/util/verification_store.py)
+# key : 'phone:{번호}' (인증번호, 번호별 전송 횟수) / 'ip:{IP}' (IP별 전송 횟수)
+class VerificationCode(Base):
+  __tablename__ = 'verification_code'
+  
+  key = Column(String(100), primary_key=True)
+  code_hash = Column(String(64), nullable=True)
+  attempts = Column(Integer, nullable=False, default=0)
+  expires_at = Column(TIMESTAMP, nullable=True)
+  verified_until = Column(TIMESTAMP, nullable=True)
+  send_count = Column(Integer, nullable=False, default=0)
+  window_started_at = Column(TIMESTAMP, nullable=True)
+  last_sent_at = Column(TIMESTAMP, nullable=True)
+
 # 매장 메뉴
 class Menu(Base):
   __tablename__ = 'menu'
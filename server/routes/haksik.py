@@ -1,4 +1,8 @@
-from fastapi import APIRouter, HTTPException, Depends, Response, Body
+import datetime
+from datetime import timedelta
+from typing import Optional, Literal
+
+from fastapi import APIRouter, HTTPException, Depends, Response, Body, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
@@ -6,7 +10,10 @@ from sqlalchemy.exc import SQLAlchemyError
 from server.db import get_db
 from server.models import CafeteriaMenu, Cafeteria, HaksikMenu, MealType
 from server.schemas import CafeteriaMenuSchema, CafeteriaSchema
-from collections import defaultdict
+from server.util.haksik_snapshot import get_snapshot, rebuild_snapshot
+from server.util.haksik_query import DAY_NAMES, MEAL_TYPES, current_meal_type, group_haksik_rows, load_haksik_rows, today_kst, week_start_of
+from server.util.time import get_skt_time
+from server.util.haksik_import import HaksikImportError, flatten_haksik_payload, plan_haksik_changes, apply_haksik_changes, has_changes
 
 
 haksik_router = APIRouter(
@@ -14,55 +21,76 @@ haksik_router = APIRouter(
 )
 
 
+# 학식 조회
+# 조건이 없으면 메모리에 저장된 이번 주 스냅샷을 그대로 응답하고,
+# 조건이 지정되면 (cafeteria_id, menu_date, meal_id) 인덱스를 타는 컬럼 조회로 해당 범위만 응답
 @haksik_router.get('')
-async def get_haksik(db: Session = Depends(get_db)):
-  menus = db.query(CafeteriaMenu).options(
-    joinedload(CafeteriaMenu.cafeteria),
-    joinedload(CafeteriaMenu.day_of_week),
-    joinedload(CafeteriaMenu.meal),
-    joinedload(CafeteriaMenu.menu)
-  ).all()
-  
-  haksik_data = defaultdict(lambda: {"menu": {"breakfast": defaultdict(list), "lunch": defaultdict(list)}})
-  
-  day_map = {1: "MON", 2: "TUE", 3: "WED", 4: "THU", 5: "FRI"}
+async def get_haksik(
+  date: Optional[datetime.date] = Query(None, description="조회할 날짜 (YYYY-MM-DD)"),
+  week: Optional[datetime.date] = Query(None, description="조회할 주에 포함된 아무 날짜 (YYYY-MM-DD)"),
+  day: Optional[Literal[DAY_NAMES]] = Query(None, description="조회할 요일 (week 또는 이번 주 기준)"),
+  meal: Optional[Literal[MEAL_TYPES]] = Query(None, description="breakfast 또는 lunch"),
+  cafeteria_id: Optional[int] = Query(None),
+  db: Session = Depends(get_db),
+):
+  if date is None and week is None and day is None and meal is None and cafeteria_id is None:
+    return Response(status_code=200, content=get_snapshot(db), media_type="application/json")
 
-  # 데이터를 그룹화
-  for menu in menus:
-      cafeteria_id = int(menu.cafeteria_id)
-      meal_type = menu.meal.type  # 'breakfast' 또는 'lunch'
-      day_name = day_map[menu.day_id]  # 'MON', 'TUE' 등
-      menu_name = menu.menu.name  # 실제 메뉴 이름
+  if date is not None:
+    start = end = date
+  elif day is not None:
+    start = end = week_start_of(week or today_kst()) + timedelta(days=DAY_NAMES.index(day))
+  else:
+    start = week_start_of(week or today_kst())
+    end = start + timedelta(days=6)
 
-      # 데이터 구조에 추가
-      haksik_data[cafeteria_id]["menu"][meal_type][day_name].append(menu_name)
+  rows = load_haksik_rows(db, start, end, cafeteria_id, meal)
+  return JSONResponse(status_code=200, content={'success' : True, 'body' : group_haksik_rows(rows)})
 
-  haksik_data = dict(haksik_data)  # defaultdict를 일반 dict로 변환
-  return JSONResponse(status_code=200, content={'success' : True, 'body' : haksik_data})
+# 현재 KST 시각 기준 오늘의 현재 식사 메뉴 조회
+@haksik_router.get('/now')
+async def get_haksik_now(cafeteria_id: Optional[int] = Query(None), db: Session = Depends(get_db)):
+  now = get_skt_time()
+  today = now.date()
+  meal = current_meal_type(now.time())
 
-@haksik_router.put('')
-async def update_haksik(data: dict = Body(...), db: Session = Depends(get_db)):
-    # Fix : 그냥 들어오는 순서대로 덮어쓰게 되어있으므로 추후 수정해야함
-    
-    # 데이터 수정
-    all_menu_names = []
+  cafeteria_menu = {}
+  for row_cafeteria_id, _, _, _, menu_name in load_haksik_rows(db, today, today, cafeteria_id, meal):
+    cafeteria_menu.setdefault(int(row_cafeteria_id), []).append(menu_name)
 
-    # 메뉴 데이터를 하나의 리스트로 결합
-    for cafeteria_id, cafeteria_data in data.items():
-        for meal_type, meal_data in cafeteria_data["menu"].items():
-            for day, menu_list in meal_data.items():
-                # 각 메뉴 리스트를 모두 합침
-                all_menu_names.extend(menu_list)
+  return JSONResponse(status_code=200, content={
+    'success' : True,
+    'body' : {
+      'date' : today.isoformat(),
+      'day' : DAY_NAMES[today.weekday()],
+      'meal' : meal,
+      'menu' : cafeteria_menu,
+    }
+  })
+
+# (식당, 식사, 날짜, 순서)로 기존 메뉴와 비교하여 바뀐 메뉴만 한 번의 트랜잭션으로 반영
+# week를 지정하지 않으면 이번 주 메뉴를 수정하며, 다른 주의 메뉴는 그대로 보존
+@haksik_router.put('')
+async def update_haksik(
+  data: dict = Body(...),
+  week: Optional[datetime.date] = Query(None, description="수정할 주에 포함된 아무 날짜 (YYYY-MM-DD)"),
+  db: Session = Depends(get_db),
+):
+  try:
+    groups = flatten_haksik_payload(db, data, week_start_of(week or today_kst()))
+    plan = plan_haksik_changes(db, groups)
 
-    # 합쳐진 all_menu_names 리스트의 값들을 순차적으로 업데이트
-    for idx, menu_name in enumerate(all_menu_names):
-      # haksik_menu의 id를 idx에 맞게 찾아서 name을 덮어씀
-      haksik_menu = db.query(HaksikMenu).filter(HaksikMenu.id == idx + 1).first()
+    if has_changes(plan):
+      apply_haksik_changes(db, plan)
+      db.commit()
 
-      if haksik_menu:
-        haksik_menu.name = menu_name  
-        db.commit()
-      else:
-        print(f"HaksikMenu with id {idx + 1} not found")
+      # 수정된 메뉴로 스냅샷 갱신
+      rebuild_snapshot(db)
+  except HaksikImportError as e:
+    db.rollback()
+    raise HTTPException(status_code=400, detail=str(e))
+  except SQLAlchemyError:
+    db.rollback()
+    raise HTTPException(status_code=500, detail="학식 메뉴 업데이트 중 오류가 발생했습니다.")
 
-    return JSONResponse(status_code=200, content={'success': True, 'message': "학식 메뉴가 업데이트 되었습니다!"})
+  return JSONResponse(status_code=200, content={'success': True, 'message': "학식 메뉴가 업데이트 되었습니다!", 'body': plan['summary']})
@@ -1,14 +1,22 @@
 from sqlalchemy import or_, and_, distinct
 from fastapi import APIRouter, HTTPException, Depends, Response, Query
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm import Session, aliased, joinedload
 from sqlalchemy import desc
-from server.schemas import StoreDetailSchema, StoreListSchema, StoreUpdateSchema, StoreUpdateNoticeSchema, StoreSearchSchema
+from server.schemas import StoreDetailSchema, StoreListSchema, StoreUpdateSchema, StoreUpdateNoticeSchema, StoreSearchSchema, StoreSearchResultSchema
 from server.models import Store, DayOfWeek, StoreHours, StoreNotice, User, StoreCategory, UserFavoriteStore
 from fastapi.security.api_key import APIKeyHeader
 from server.db import get_db
-from server.auth import verify_jwt_token
+from server.auth import verify_jwt_token, require_store_owner
+from server.util.principal import Principal
 from server.utils import get_skt_time
+from server.util.store_catalog import CATEGORY_GROUPS, get_catalog_page, refresh_catalog, store_list_entry
+from server.util.store_detail_cache import get_store_detail_body, invalidate_store_detail
+from server.util.store_search_index import search_store_names, refresh_store_terms
+from server.util.store_fulltext import search_stores, refresh_store_documents
+from server.util.store_schedule import apply_current_status, refresh_store_schedule
+from server.scheduler.update_store_status_scheduler import mark_store_schedule_changed, notify_scheduler
+from typing import Optional, List
 
 
 store_router = APIRouter(
@@ -16,147 +24,134 @@ store_router = APIRouter(
 )
 
 
-# 전체 매장 조회 API
-@store_router.get('', response_model=list[StoreListSchema],summary="전체 매장 조회")
-async def get_store_all(db: Session = Depends(get_db)):
-  
-  store_all = db.query(Store).filter(Store.school_id == 1).all()
-  
-  return store_all
+# 연세대 미래
+DEFAULT_SCHOOL_ID = 1
+
+# 매장 목록 페이지 크기
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+# 매장 목록 조회 API
+# 학교별 카탈로그에서 sid 기준 커서(after) 페이지네이션으로 응답하며, 다음 페이지가 있으면 X-Next-Cursor 헤더에 다음 after 값을 담아 응답
+@store_router.get('', response_model=list[StoreListSchema],summary="학교/카테고리별 매장 목록 조회")
+async def get_store_all(
+  school_id: int = Query(DEFAULT_SCHOOL_ID),
+  category: Optional[str] = Query(None, description="food / cafe / convenience / facilities 또는 카테고리 id"),
+  after: Optional[int] = Query(None, description="이전 페이지의 마지막 sid"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  db: Session = Depends(get_db),
+):
+  if category is None:
+    group = 'all'
+  elif category in CATEGORY_GROUPS:
+    group = category
+  elif category.isdigit():
+    group = int(category)
+  else:
+    raise HTTPException(status_code=400, detail=f"잘못된 카테고리: {category}")
+
+  body, next_cursor = get_catalog_page(db, school_id, group, after, limit)
+
+  headers = {'X-Next-Cursor': str(next_cursor)} if next_cursor is not None else None
+  return Response(content=body, media_type="application/json", headers=headers)
 
 
 # *검색어 자동완성 관련*
+# 매장명/카테고리/메뉴명을 메모리 색인에서 접두어, 초성('ㅅㅌㅂ'), 입력 중인 글자('스타ㅂ') 단위로 매칭
 @store_router.get('/search-keyword', response_model=list[StoreSearchSchema], summary="검색 자동 완성 키워드 10개 조회")
-async def search_keyword_store(query: str, db: Session = Depends(get_db), limit: int = 10):
+async def search_keyword_store(query: str, db: Session = Depends(get_db), limit: int = Query(10, ge=1, le=50), school_id: int = Query(DEFAULT_SCHOOL_ID)):
   
-  if not query:
+  if not query.strip():
       raise HTTPException(status_code=400, detail="")
 
-  category_alias = aliased(StoreCategory)
-  
-  stores = db.query(Store).join(category_alias, Store.category).filter(
-      and_(
-          Store.school_id == 1,
-          or_(
-              Store.store_name.ilike(f"%{query}%")
-          )
-      )
-  ).group_by(Store.store_name).limit(limit).all()
+  store_names = search_store_names(db, school_id, query, limit)
 
-  return stores
+  return [{'store_name': store_name} for store_name in store_names]
 
 # 매장 키워드 검색하여 매장 조회
-@store_router.get('/search', response_model=list[StoreListSchema], summary="검색한 매장 조회")
-async def search_keyword_store(query: str, db: Session = Depends(get_db)):
+# 매장명/카테고리/메뉴명/메뉴 옵션명의 n-gram 색인으로 검색하여 점수순으로 응답 ("김밥", "아메리카노" 등 메뉴 검색 가능)
+@store_router.get('/search', response_model=list[StoreSearchResultSchema], summary="검색한 매장 조회")
+async def search_store(query: str, db: Session = Depends(get_db), limit: int = Query(30, ge=1, le=100), school_id: int = Query(DEFAULT_SCHOOL_ID)):
   
-  if not query:
+  if not query.strip():
       raise HTTPException(status_code=400, detail="")
 
-  category_alias = aliased(StoreCategory)
-  
-  stores = db.query(Store).join(category_alias, Store.category).filter(
-    and_(
-      Store.school_id == 1,
-      or_(
-          Store.store_name.ilike(f"%{query}%"),
-          category_alias.main_category.ilike(f"%{query}%"),
-      )
-    )
-  ).all()
+  return search_stores(db, school_id, query, limit)
 
-  return stores
-
-# 음식점 카테고라 매장 조회
+# 음식점 카테고라 매장 조회 (GET /v1/store?category=food 와 같은 페이지네이션)
 @store_router.get('/food', response_model=list[StoreListSchema], summary="음식점 매장 조회")
-async def get_cafe_store_list(db: Session = Depends(get_db)):
-  # 연세대 미래
-  store_list = db.query(Store).filter(Store.school_id == 1, Store.category_id == 1).all()
-    
-  return store_list
+async def get_cafe_store_list(
+  school_id: int = Query(DEFAULT_SCHOOL_ID),
+  after: Optional[int] = Query(None, description="이전 페이지의 마지막 sid"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  db: Session = Depends(get_db),
+):
+  
+  return await get_store_all(school_id, 'food', after, limit, db)
 
 # 카페 카테고리 매장 조회
 @store_router.get('/cafe', response_model=list[StoreListSchema], summary="카페 매장 조회")
-async def get_cafe_store_list(db: Session = Depends(get_db)):
-  # 연세대 미래
-  store_list = db.query(Store).filter(Store.school_id == 1, Store.category_id == 2).all()
-    
-  return store_list
+async def get_cafe_store_list(
+  school_id: int = Query(DEFAULT_SCHOOL_ID),
+  after: Optional[int] = Query(None, description="이전 페이지의 마지막 sid"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  db: Session = Depends(get_db),
+):
+  
+  return await get_store_all(school_id, 'cafe', after, limit, db)
 
 # 편의점 카테고리 매장 조회
 @store_router.get('/convenience', response_model=list[StoreListSchema], summary="편의점 매장 조회")
-async def get_con_store_list(db: Session = Depends(get_db)):
-  # 연세대 미래
-  store_list = db.query(Store).filter(Store.school_id == 1, Store.category_id == 3).all()
-    
-  return store_list
+async def get_con_store_list(
+  school_id: int = Query(DEFAULT_SCHOOL_ID),
+  after: Optional[int] = Query(None, description="이전 페이지의 마지막 sid"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  db: Session = Depends(get_db),
+):
+  
+  return await get_store_all(school_id, 'convenience', after, limit, db)
 
 # 편의시설 카테고리 매장 조회
 @store_router.get('/facilities', response_model=list[StoreListSchema], summary="편의시설 매장 조회")
-async def get_con_store_list(db: Session = Depends(get_db)):
-  # 연세대 미래
-  store_list = db.query(Store).filter(Store.school_id == 1, Store.category_id.in_([4,5,6,7,8])).all()
-    
-  return store_list
+async def get_con_store_list(
+  school_id: int = Query(DEFAULT_SCHOOL_ID),
+  after: Optional[int] = Query(None, description="이전 페이지의 마지막 sid"),
+  limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+  db: Session = Depends(get_db),
+):
+  
+  return await get_store_all(school_id, 'facilities', after, limit, db)
+
+# 여러 매장 한 번에 조회 (즐겨찾기, 최근 본 매장 등)
+# ids=1,2,3 (또는 ids=1&ids=2) 형태로 받아 요청한 순서대로 응답하며, 없는 매장은 제외
+@store_router.get('/batch', response_model=list[StoreListSchema], summary="여러 매장 목록 정보 한 번에 조회")
+async def get_store_batch(ids: List[str] = Query(..., description="매장 id 목록 (쉼표로 구분)"), db: Session = Depends(get_db)):
+  
+  try:
+    store_ids = [int(store_id) for value in ids for store_id in value.split(',') if store_id.strip()]
+  except ValueError:
+    raise HTTPException(status_code=400, detail="매장 id는 숫자여야 합니다.")
+  
+  store_ids = list(dict.fromkeys(store_ids))
+  if not store_ids:
+    return []
+  
+  stores = db.query(Store).options(joinedload(Store.category)).filter(Store.sid.in_(store_ids)).all()
+  store_map = {store.sid: store for store in stores}
+  
+  return apply_current_status(db, [store_list_entry(store_map[store_id]) for store_id in store_ids if store_id in store_map])
 
 # 매장 id로 상세정보 조회
 @store_router.get('/{store_id}', response_model=StoreDetailSchema, summary="매장 상세 정보 조회")
-async def get_store_detail(store_id: str ,db: Session = Depends(get_db)):
+async def get_store_detail(store_id: int ,db: Session = Depends(get_db)):
   
-  store = db.query(Store).filter(Store.sid == store_id).first()
+  body = get_store_detail_body(db, store_id)
   
-  store_hours_dict = {}
-  for store_hour in store.store_hours:
-    day_of_week = store_hour.day_of_week.name
-    store_hours_dict[day_of_week] = {
-      'running_time' : {
-        'opening_time' : store_hour.opening_time.strftime('%H:%M') if store_hour.opening_time else None,
-        'closing_time' : store_hour.closing_time.strftime('%H:%M') if store_hour.closing_time else None
-      },
-      'break_time' : {
-        'break_start_time' : store_hour.break_start_time.strftime('%H:%M') if store_hour.break_start_time else None,
-        'break_exit_time' : store_hour.break_exit_time.strftime('%H:%M') if store_hour.break_exit_time else None,
-      }
-    }
-  
-  categories = []
-  for category in store.menu_categories:
-    menus = []
-    for menu in category.menus:
-      options=[]
-      for option in menu.options:
-        options.append({
-          'option_name': option.option_name,
-          'price': option.price
-        })
-      
-      menus.append({
-        'menu_name': menu.menu_name,
-        'menu_image_url': menu.menu_image_url,
-        'options': options
-      })
-    
-    categories.append({
-      'category_name': category.category_name,
-      'menus': menus
-    })
-  
-  sorted_notices = sorted(store.store_notice, key=lambda notice: (notice.is_pinned, notice.created_at), reverse=True)
-  
-  result_store = {
-    'sid': store.sid,
-    'store_name': store.store_name,
-    'store_number': store.store_number,
-    'store_location': store.store_location,
-    'is_open': store.is_open,
-    'store_thumb_url': store.store_thumb_url,
-    'store_banner_url': store.store_banner_url,
-    'category': store.category,
-    'store_hours': store_hours_dict,
-    'store_notice': sorted_notices,
-    'menu': categories
-  }
-  
-  return result_store
+  if body is None:
+    raise HTTPException(status_code=400, detail='없는 매장입니다')
+  
+  return Response(content=body, media_type="application/json")
 
 # 매장 정보 수정 (현재는 매장 시간만 수정 가능)
 # TODO : 전화번호, 배너이미지, 썸네일 이미지 수정가능하게
@@ -188,9 +183,19 @@ async def update_store(store_id: int, store_data: StoreUpdateSchema, db: Session
         store_hour.break_start_time = updated_hours.content.break_time.break_start_time if updated_hours.content.break_time.break_start_time is not None else None
         store_hour.break_exit_time = updated_hours.content.break_time.break_exit_time if updated_hours.content.break_time.break_exit_time is not None else None
         
-  store.update_is_open(db)
+  # 리더 워커의 매장 상태 스케쥴러가 전환 시각을 다시 계산하고 is_open 컬럼을 동기화하도록 기록
+  # (응답의 매장 상태는 요청 시점에 공유 운영시간으로 계산하므로 여기서 is_open을 쓰지 않음)
+  mark_store_schedule_changed(db, store.sid)
   
   db.commit()
+  
+  # 수정된 매장 정보로 운영시간, 카탈로그, 상세 정보, 검색 색인들 갱신
+  refresh_store_schedule(db, store.sid)
+  notify_scheduler()
+  refresh_catalog(db, store.school_id)
+  invalidate_store_detail(store.sid)
+  refresh_store_terms(db, store.sid)
+  refresh_store_documents(db, store.sid)
   return JSONResponse(status_code=200, content={'success' : True, 'message' : '정상적으로 수정되었습니다!'})
 
 # TODO : 매장 메뉴 수정 API 개발 예정
@@ -211,17 +216,7 @@ async def get_notice_store(store_id: int, db: Session = Depends(get_db)):
 
 # 매장 id에 따른 각 매장 공지사항 등록
 @store_router.post('/{store_id}/notice', summary="각 매장 공지사항 등록")
-async def add_notice(store_id: int, notice_data: StoreUpdateNoticeSchema, confirm: bool = Query(False), db:Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
-  
-  # 사장님이 아닐 때
-  if token.role != 2:
-    raise HTTPException(status_code=403, detail="해당 작업을 수행할 권한이 없습니다.")
-  
-  user_store = db.query(User).filter(User.uid == token.uid).first()
-  
-  # 해당 매장 사장님이 아닐 때
-  if not user_store or user_store.store_id != store_id:
-    raise HTTPException(status_code=403, detail="해당 매장에 대한 접근 권한이 없습니다.")
+async def add_notice(store_id: int, notice_data: StoreUpdateNoticeSchema, confirm: bool = Query(False), db:Session = Depends(get_db), owner: dict = Depends(require_store_owner)):
   
   # 해당 공지사항을 고정하려고하는데 이미 고정된 공지사항이 있을 경우
   if notice_data.is_pinned:
@@ -253,6 +248,7 @@ async def add_notice(store_id: int, notice_data: StoreUpdateNoticeSchema, confir
   db.add(new_notice)
   db.commit()
   db.refresh(new_notice)
+  invalidate_store_detail(store_id)
     
   return JSONResponse(status_code=200, content={'success' : True, 'message' : '정상적으로 생성되었습니다!'})
 
@@ -272,17 +268,7 @@ async def get_notice(store_id: int, notice_id: int, db: Session = Depends(get_db
 
 # 공지사항 id에 따른 공지사항 수정
 @store_router.put('/{store_id}/notice/{notice_id}', summary="각 매장의 해당하는 공지사항 하나 수정")
-async def update_notice(store_id: int, notice_id: int, notice_data: StoreUpdateNoticeSchema, confirm: bool = Query(False), db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
-  
-  # 사장님이 아닐 때
-  if token.role != 2:
-    raise HTTPException(status_code=403, detail="해당 작업을 수행할 권한이 없습니다.")
-  
-  user_store = db.query(User).filter(User.uid == token.uid).first()
-  
-  # 해당 매장 사장님이 아닐 때
-  if not user_store or user_store.store_id != store_id:
-    raise HTTPException(status_code=403, detail="해당 매장에 대한 접근 권한이 없습니다.")
+async def update_notice(store_id: int, notice_id: int, notice_data: StoreUpdateNoticeSchema, confirm: bool = Query(False), db: Session = Depends(get_db), owner: dict = Depends(require_store_owner)):
   
   notice = db.query(StoreNotice).filter(StoreNotice.store_id == store_id, StoreNotice.id == notice_id).first()
   
@@ -314,23 +300,14 @@ async def update_notice(store_id: int, notice_id: int, notice_data: StoreUpdateN
   notice.updated_at = get_skt_time()
   
   db.commit()
+  invalidate_store_detail(store_id)
   
   return JSONResponse(status_code=200, content={'success' : True, 'message' : '정상적으로 수정되었습니다!'})
   
 # 공지사항 id에 따른 공지사항 삭제
 @store_router.delete('/{store_id}/notice/{notice_id}', summary="각 매장 공지사항 삭제")
-async def delete_notice(store_id: int, notice_id:int, db:Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def delete_notice(store_id: int, notice_id:int, db:Session = Depends(get_db), owner: dict = Depends(require_store_owner)):
 
-  # 사장님이 아닐 때
-  if token.role != 2:
-    raise HTTPException(status_code=403, detail="해당 작업을 수행할 권한이 없습니다.")
-  
-  user_store = db.query(User).filter(User.uid == token.uid).first()
-  
-  # 해당 매장 사장님이 아닐 때
-  if not user_store or user_store.store_id != store_id:
-    raise HTTPException(status_code=403, detail="해당 매장에 대한 접근 권한이 없습니다.")
-  
   notice = db.query(StoreNotice).filter(StoreNotice.store_id == store_id, StoreNotice.id == notice_id).first()
   
   if not notice:
@@ -339,21 +316,14 @@ async def delete_notice(store_id: int, notice_id:int, db:Session = Depends(get_d
   
   db.delete(notice)
   db.commit()
+  invalidate_store_detail(store_id)
   
   return JSONResponse(status_code=200, content={'success' : True, 'message' : '정상적으로 삭제되었습니다!'})
   
 
 # 매장 즐겨찾기 추가
 @store_router.post('/{store_id}/favorite', summary="매장 즐겨찾기 추가")
-async def create_favorite_store(store_id: int, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
-    # JWT 토큰을 통해 유저 확인
-    current_user = db.query(User).filter(User.uid == token.uid).first()
-
-    if not current_user:
-        raise HTTPException(status_code=400, detail="유효하지 않은 사용자입니다.")
-    
-    # print(current_user.std_id)
-
+async def create_favorite_store(store_id: int, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
     # 해당 매장이 존재하는지 확인
     store = db.query(Store).filter(Store.sid == store_id).first()
 
@@ -362,7 +332,7 @@ async def create_favorite_store(store_id: int, db: Session = Depends(get_db), to
 
     # 이미 즐겨찾기에 추가된 매장인지 확인
     existing_favorite = db.query(UserFavoriteStore).filter(
-        UserFavoriteStore.uid == current_user.uid,
+        UserFavoriteStore.uid == token.uid,
         UserFavoriteStore.store_id == store_id
     ).first()
 
@@ -370,7 +340,7 @@ async def create_favorite_store(store_id: int, db: Session = Depends(get_db), to
         raise HTTPException(status_code=400, detail="이미 즐겨찾기한 매장입니다.")
 
     # 즐겨찾기 추가
-    favorite = UserFavoriteStore(uid=current_user.uid, store_id=store.sid, created_at=get_skt_time())
+    favorite = UserFavoriteStore(uid=token.uid, store_id=store.sid, created_at=get_skt_time())
     db.add(favorite)
     db.commit()
 
@@ -378,13 +348,7 @@ async def create_favorite_store(store_id: int, db: Session = Depends(get_db), to
 
 # 매장 즐겨찾기 삭제
 @store_router.delete('/{store_id}/favorite', summary="매장 즐겨찾기 삭제")
-async def delete_favorite_store(store_id: int, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
-    # JWT 토큰을 통해 유저 확인
-    current_user = db.query(User).filter(User.uid == token.uid).first()
-
-    if not current_user:
-        raise HTTPException(status_code=400, detail="유효하지 않은 사용자입니다.")
-    
+async def delete_favorite_store(store_id: int, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
     # 해당 매장이 존재하는지 확인
     store = db.query(Store).filter(Store.sid == store_id).first()
 
@@ -393,7 +357,7 @@ async def delete_favorite_store(store_id: int, db: Session = Depends(get_db), to
 
     # 즐겨찾기에 이미 등록된 매장인지 확인
     existing_favorite = db.query(UserFavoriteStore).filter(
-        UserFavoriteStore.uid == current_user.uid,
+        UserFavoriteStore.uid == token.uid,
         UserFavoriteStore.store_id == store_id
     ).first()
 
@@ -1,34 +1,101 @@
-import random
+import asyncio
 import os
-import requests
 import base64
 import re
-import json
-import time
 
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload
 from pydantic import EmailStr
-from passlib.context import CryptContext
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from server.auth import create_jwt_token
 from server.models import User, UserFavoriteStore, Store, School
-from server.schemas import UserSchema, UserLoginSchema, StoreListSchema, UserCreateSchema, UserSignSchema, VerifyPhoneNum, VerifyId, VerifySchool, VerifyEmail
-from server.db import get_db
+from server.schemas import UserSchema, UserLoginSchema, StoreListSchema, UserCreateSchema, UserSignSchema, VerifyPhoneNum, VerifyPhoneCode, VerifyId, VerifySchool, VerifyEmail
+from server.db import SessionLocal, get_db
 
 from server.util.custom_exception import CustomHTTPException
-from server.util.auth import verify_jwt_token
+from server.util.auth import verify_jwt_token, require_admin
+from server.util.principal import Principal, invalidate_principal
+from server.util.password import verify_password, hash_password
+from server.util.token_version import get_token_version, bump_token_version, invalidate_token_version
 from server.util.time import get_skt_time
-from server.util.config import KAKAO_ACCESS_TOKEN, INFO_BANK_URL, INFO_BANK_TEMPLATE_CODE, INFO_BANK_SENDER_KEY, INFO_BANK_IB_ID, INFO_BANK_IB_PW, UNIVCERT_API_KEY, UNIVCERT_URL
-
-# 비밀번호 해싱
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from server.util.http_client import UpstreamError, UpstreamUnavailable
+from server.util import univcert
+from server.util.outbox import enqueue_message, notify_dispatcher
+from server.util.store_schedule import status_lookup
+from server.util.json_body import encode_json
+from server.util.verification_store import VerificationThrottled, issue_code, confirm_code, is_phone_verified, consume_phone_verification
 
 users_router = APIRouter(
   prefix="/v1/users"
 )
+
+
+# 유저 조회 시 즐겨찾기 매장(매장, 카테고리)과 학교를 함께 불러옴 (즐겨찾기 수와 상관없이 쿼리 수 고정)
+USER_PROFILE_OPTIONS = (
+  selectinload(User.favorite_stores).joinedload(UserFavoriteStore.store).joinedload(Store.category),
+  joinedload(User.school),
+  joinedload(User.school_selected),
+)
+
+
+# 유저 목록 스트리밍 시 한 번에 불러오는 유저 수
+USER_EXPORT_BATCH_SIZE = 500
+# 유저 조회 응답(목록, 스트리밍, 단건, /me)에서 제외하는 필드
+USER_EXPORT_EXCLUDE = {'user_pw'}
+
+
+# 유저 정보를 UserSchema로 변환 (status_of : 매장 sid -> 현재 운영 상태)
+def user_profile(user: User, status_of, with_created_at: bool = True) -> UserSchema:
+  favorite_stores = [
+    StoreListSchema(
+      sid=favorite.store.sid,
+      store_name=favorite.store.store_name,
+      store_number=favorite.store.store_number,
+      store_location=favorite.store.store_location,
+      store_thumb_url=favorite.store.store_thumb_url,
+      store_banner_url=favorite.store.store_banner_url,
+      is_open=status_of(favorite.store.sid),
+      category=favorite.store.category,
+    )
+    for favorite in sorted(user.favorite_stores, key=lambda favorite: favorite.store_id)
+    if favorite.store is not None
+  ]
+
+  return UserSchema(
+    uid=user.uid,
+    name=user.name,
+    user_id=user.user_id,
+    user_pw=user.user_pw,
+    user_birth=user.user_birth,
+    std_id=user.std_id,
+    email=user.email,
+    major=user.major,
+    gender=user.gender,
+    phone_number=user.phone_number,
+    marketing_term=user.marketing_term,
+    sign_url=user.sign_url,
+    created_at=user.created_at if with_created_at else None,
+    role=user.role,
+    store_id=user.store_id,
+    is_school_verified=user.is_school_verified,
+    school_selected=user.school_selected,
+    school=user.school,
+    favorite_stores=favorite_stores,  # 즐겨찾기한 매장 리스트 추가
+  )
+
+
+# 외부 API 장애로 요청을 보내지 않은 경우 (서킷 브레이커 open, 동시 요청 수 초과) 바로 503 응답
+def upstream_unavailable_response(e: UpstreamUnavailable) -> JSONResponse:
+  return JSONResponse(status_code=503, headers={"Retry-After" : str(e.retry_after)}, content={
+    "status" : 503,
+    "isSuccess" : False,
+    "message" : f"인증 서버가 일시적으로 응답하지 않습니다. {e.retry_after}초 후 다시 시도해주세요.",
+    "result": None,
+  })
     
     
 # 유저 로그인 API
@@ -43,16 +110,17 @@ async def login_user(login_data: UserLoginSchema, db: Session = Depends(get_db))
     raise CustomHTTPException(status_code=404, message="존재하지 않는 사용자입니다.")
   
   # 해당 유저 비밀번호 검증
-  if not pwd_context.verify(login_data.user_pw, user.user_pw):
+  if not await verify_password(login_data.user_pw, user.user_pw):
     raise CustomHTTPException(status_code=400, message="잘못된 비밀번호입니다.")
   
   # JWT 생성
-  token = create_jwt_token(user)
+  token = create_jwt_token(user, get_token_version(db, user.uid))
   
   # 로그인한 사용자의 역할에 따른 매니저 여부
   # role : 1 => 일반 사용자
   # role : 2 => 매장 사장님
   # role : 3 => 쿠폰 관리자(교직원)
+  # role : 4 => 서비스 관리자
   # TODO: 쿠폰 관리자도 manager로 부여해야하는지 확인
   manager = True if user.role == 2 else False
   
@@ -89,13 +157,17 @@ async def create_user(create_data: UserCreateSchema, db: Session = Depends(get_d
   if existing_user:
     raise CustomHTTPException(status_code=409, message="이미 인증된 전화번호입니다.")
   
+  # 휴대폰 인증 여부 확인
+  if not is_phone_verified(db, create_data.phone_number):
+    raise CustomHTTPException(status_code=403, message="휴대폰 번호 인증이 필요합니다.")
+  
   # 생년월일 검증
   if not create_data.user_birth or create_data.user_birth.strip() == "":
       raise CustomHTTPException(status_code=400, message="생년월일은 필수 입력 항목입니다. 올바른 값을 입력하세요.")
   
   
   # 비밀번호 암호화
-  hashed_password = pwd_context.hash(create_data.user_pw)
+  hashed_password = await hash_password(create_data.user_pw)
   
   # 새 일반 유저 객체 생성
   new_user = User(
@@ -121,6 +193,10 @@ async def create_user(create_data: UserCreateSchema, db: Session = Depends(get_d
   db.commit()
   db.refresh(new_user) 
   
+  # 가입을 마친 번호의 인증 완료 상태 제거
+  consume_phone_verification(db, create_data.phone_number)
+  db.commit()
+  
   response = JSONResponse(status_code=201, content={
     "status" : 201,
     "isSuccess" : True,
@@ -132,81 +208,63 @@ async def create_user(create_data: UserCreateSchema, db: Session = Depends(get_d
 
 # 유저 핸드폰 번호 중복검사 및 인증번호 검증
 @users_router.post('/verification/phone', summary='003. 유저 휴대폰번호 중복체크 및 인증번호 검증')
-async def verification_phone(input_data: VerifyPhoneNum ,db: Session = Depends(get_db)):
+async def verification_phone(input_data: VerifyPhoneNum, request: Request, db: Session = Depends(get_db)):
   
   if not re.fullmatch(r"^010\d{8}$", input_data.phone_number):
     raise CustomHTTPException(status_code=422, message="휴대폰 번호 형식이 올바르지 않습니다. 010으로 시작하는 11자리 번호를 입력하세요.")
   
   
-  timestamp = int(time.time() * 1000)
-  timestamp = str(timestamp)
-  
   existing_user = db.query(User).filter(User.phone_number == input_data.phone_number).first()
   if existing_user:
     raise CustomHTTPException(status_code=409, message="이미 인증된 전화번호가 있습니다.")
   
   # TODO: 카카오 비즈메세지에서 드림시큐리티 인증으로 변경 예정
-  # 인증번호
-  verify_code = str(random.randint(0, 999999)).zfill(6)
-  
-  # 비즈고 요청 헤더
-  token_headers={
-    'X-IB-Client-Id' : INFO_BANK_IB_ID,
-    'X-IB-Client-Passwd' : INFO_BANK_IB_PW,
-    'Accept' : 'application/json'
-  }
+  # 인증번호 발급 (서버에 보관하고, 번호/IP별 전송 횟수 제한)
+  try:
+    verify_code = issue_code(db, input_data.phone_number, request.client.host if request.client else None)
+  except VerificationThrottled as e:
+    raise CustomHTTPException(status_code=429, message=f"인증번호 요청이 너무 많습니다. {e.retry_after}초 후 다시 시도해주세요.")
   
-  # 비즈고 토큰 발급
+  # 카카오 비즈메세지 알림톡 전송 대기열에 추가 (전송과 재시도는 백그라운드 dispatcher가 처리)
   try:
-    token_response = requests.post(f"{INFO_BANK_URL}/v1/auth/token", headers=token_headers)
-    
-    
-    token_response = token_response.json()
-    
-    # 토큰 발급 완료시
-    if token_response.get('result') == 'Success':
-      token = token_response.get('data', {}).get('token')
-      schema = token_response.get('data', {}).get('schema')
-      
-      # 카카오 비즈메세지 알림톡 요청 헤더
-      alim_headers={
-        "Authorization" : f"{schema} {token}",
-        "Content-Type" : "application/json",
-        "Accept" : "application/json"
-      }
-      
-      # 카카오 비즈메세지 알림톡 요청 바디
-      alim_payload=json.dumps({
-        "senderKey" : INFO_BANK_SENDER_KEY,
-        "msgType" : "AT",
-        "to" : input_data.phone_number,
-        "templateCode" : INFO_BANK_TEMPLATE_CODE,
-        "text" : 
-          f"[학식모지] \n\n본인확인을 위해 인증번호 [{verify_code}]를 입력해주세요."
-      })
-      
-      try:
-        alim_response = requests.post(f"{INFO_BANK_URL}/v1/send/alimtalk", headers=alim_headers, data=alim_payload)
-        
-        print(alim_response.text)
-        
-        
-      except:
-        raise CustomHTTPException(status_code=500, message="서버오류로 인증번호를 보내지 못하였습니다. 다시 시도해주세요.")
-      
-      
-  except:
+    enqueue_message(db, 'alimtalk', input_data.phone_number, {
+      "text" : f"[학식모지] \n\n본인확인을 위해 인증번호 [{verify_code}]를 입력해주세요.",
+    })
+    db.commit()
+  except SQLAlchemyError as e:
+    db.rollback()
+    print(f"인증번호 전송 요청 실패 - {e}")
     raise CustomHTTPException(status_code=500, message="서버오류로 인증번호를 보내지 못하였습니다. 다시 시도해주세요.")
   
+  notify_dispatcher()
     
-  # 인증번호도 함께 담아서 전송
   response = JSONResponse(status_code=200, content={
     "status" : 200,
     "isSuccess" : True,
     "message" : f"인증번호가 요청되었습니다.",
-    "result": {
-      "code" : verify_code
-    },
+    "result": None,
+  })
+  
+  return response
+
+# 휴대폰 인증번호 확인
+@users_router.post('/verification/phone/confirm', summary='003-1. 유저 휴대폰 인증번호 확인')
+async def confirm_phone(input_data: VerifyPhoneCode, db: Session = Depends(get_db)):
+  
+  result = confirm_code(db, input_data.phone_number, input_data.code)
+  
+  if result == 'expired':
+    raise CustomHTTPException(status_code=410, message="인증번호가 만료되었습니다. 인증번호를 다시 요청해주세요.")
+  if result == 'too_many_attempts':
+    raise CustomHTTPException(status_code=429, message="인증번호 입력 횟수를 초과했습니다. 인증번호를 다시 요청해주세요.")
+  if result == 'mismatch':
+    raise CustomHTTPException(status_code=400, message="인증번호가 일치하지 않습니다.")
+  
+  response = JSONResponse(status_code=200, content={
+    "status" : 200,
+    "isSuccess" : True,
+    "message" : f"휴대폰 인증이 완료되었습니다.",
+    "result": None,
   })
   
   return response
@@ -231,10 +289,10 @@ async def verification_id(input_data:VerifyId, db: Session = Depends(get_db)):
 
 
 @users_router.post('/verification/school', summary="005. 학교 인증")
-async def verified_school(input_data: VerifySchool, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def verified_school(input_data: VerifySchool, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   
   # token의 uid에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  user = db.get(User, token.uid)
   
   # 사용자가 없을 시 처리
   if not user:
@@ -249,6 +307,7 @@ async def verified_school(input_data: VerifySchool, db: Session = Depends(get_db
       
       db.commit()
       db.refresh(user)
+      invalidate_principal(user.uid)
       
       response = JSONResponse(status_code=200, content={
         "status": 200,
@@ -279,16 +338,7 @@ async def verified_school(input_data: VerifySchool, db: Session = Depends(get_db
 async def verified_email():
   try:
     
-    headers={
-      "Content-Type" : "application/json",
-    }
-    
-    payload={
-      "key" : UNIVCERT_API_KEY
-    }
-    
-    email_response = requests.post(f"{UNIVCERT_URL}/certifiedlist", json=payload, headers=headers)
-    email_response = email_response.json()
+    email_response = await univcert.certified_list()
     
     if email_response.get('success') == True:
       response = JSONResponse(status_code=200, content={
@@ -306,6 +356,8 @@ async def verified_email():
         "result": None,
       })
     
+  except UpstreamUnavailable as e:
+    response = upstream_unavailable_response(e)
   except:
     response = JSONResponse(status_code=500, content={
       "status" : 500,
@@ -317,10 +369,10 @@ async def verified_email():
   return response
 
 @users_router.post('/verification/email', summary='006. 학교 이메일 인증', description="이메일만 먼저 post요청 보낸 후 이후에 이메일과 인증코드를 함께 요청하면 인증 결과가 나옴")
-async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   
   # token의 uid에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  user = db.get(User, token.uid)
   
   if not user:
     raise CustomHTTPException(status_code=404, message="로그인 된 유저를 찾을 수 없습니다.")
@@ -337,19 +389,7 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
   if input_data.verify_code is None:
     try:
       
-      headers={
-        "Content-Type" : "application/json",
-      }
-      
-      payload={
-        "key" : UNIVCERT_API_KEY,
-        "email" : input_data.email,
-        "univName" : f"{school.name}학교",
-        "univ_check" : True
-      }
-      
-      email_response = requests.post(f"{UNIVCERT_URL}/certify", json=payload, headers=headers)
-      email_response = email_response.json()
+      email_response = await univcert.certify(input_data.email, f"{school.name}학교")
       
       if email_response.get('success') == True:
         response = JSONResponse(status_code=200, content={
@@ -367,6 +407,8 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
           "result": None,
         })
       
+    except UpstreamUnavailable as e:
+      response = upstream_unavailable_response(e)
     except:
       response = JSONResponse(status_code=500, content={
         "status" : 500,
@@ -376,19 +418,7 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
       })
   else:
     try:
-      headers={
-        "Content-Type" : "application/json",
-      }
-      
-      payload={
-        "key" : UNIVCERT_API_KEY,
-        "email" : input_data.email,
-        "univName" : f"{school.name}학교",
-        "code" : input_data.verify_code
-      }
-      
-      verify_response = requests.post(f"{UNIVCERT_URL}/certifycode", json=payload, headers=headers)
-      verify_response = verify_response.json()
+      verify_response = await univcert.certify_code(input_data.email, f"{school.name}학교", input_data.verify_code)
       
       if verify_response.get('success') == True:
         
@@ -398,6 +428,7 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
         # 데이터베이스 업데이트
         db.commit()
         db.refresh(user)
+        invalidate_principal(user.uid)
         
         response = JSONResponse(status_code=200, content={
           "status" : 200,
@@ -414,6 +445,8 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
           "result": None,
         })
       
+    except UpstreamUnavailable as e:
+      response = upstream_unavailable_response(e)
     except:
       response = JSONResponse(status_code=500, content={
         "status" : 500,
@@ -426,16 +459,7 @@ async def verification_email(input_data:VerifyEmail, db: Session = Depends(get_d
 @users_router.delete('/verification/email', summary='007. 인증된 이메일 삭제')
 async def verification_email():
   try:
-    headers={
-      "Content-Type" : "application/json",
-    }
-    
-    payload={
-      "key" : UNIVCERT_API_KEY,
-    }
-    
-    email_response = requests.post(f"{UNIVCERT_URL}/clear", json=payload, headers=headers)
-    email_response = email_response.json()
+    email_response = await univcert.clear()
     
     if email_response.get('success') == True:
       response = JSONResponse(status_code=200, content={
@@ -451,6 +475,8 @@ async def verification_email():
         "message" : f"값이 유효하지 않습니다.",
         "result": None,
       })
+  except UpstreamUnavailable as e:
+    response = upstream_unavailable_response(e)
   except:
     response = JSONResponse(status_code=500, content={
       "status" : 500,
@@ -461,66 +487,70 @@ async def verification_email():
   
   return response
 
-# 유저 전체 리스트 조회 API
-@users_router.get('', summary="[TEST용] 가입된 유저들 리스트 조회")
-async def read_users(db: Session = Depends(get_db)):
-  # 모든 유저 조회
-  users = db.query(User).all()
+# 유저 목록 조회 조건 (school_id, role, 커서 after(이전에 받은 마지막 uid))
+def filter_users(query, school_id: int = None, role: int = None, after: int = None):
+  if school_id is not None:
+    query = query.filter(User.school_id == school_id)
+  if role is not None:
+    query = query.filter(User.role == role)
+  if after is not None:
+    query = query.filter(User.uid > after)
+  return query
+
+
+# 유저 목록을 uid 순서로 한 줄에 한 명씩 NDJSON으로 전송
+# 요청 세션과 별개의 세션으로 USER_EXPORT_BATCH_SIZE명씩 (즐겨찾기 매장 포함) 불러오고, 전송한 묶음은 세션에서 제거하여 메모리 사용량 유지
+# 중간에 끊기면 마지막으로 받은 uid를 after로 지정하여 이어서 받을 수 있음
+def stream_users(school_id: int = None, role: int = None, after: int = None):
+  db = SessionLocal()
+  try:
+    status_of = status_lookup(db)
 
-  # 결과 저장을 위한 리스트
-  user_list = []
+    while True:
+      users = filter_users(
+        db.query(User).options(*USER_PROFILE_OPTIONS), school_id, role, after
+      ).order_by(User.uid).limit(USER_EXPORT_BATCH_SIZE).all()
 
-  # 각 유저의 즐겨찾기 매장을 포함한 데이터를 구성
-  for user in users:
-    favorite_store_records = db.query(UserFavoriteStore).filter(UserFavoriteStore.uid == user.uid).all()
-
-    # 각 유저의 favorite_stores 정보 저장
-    favorite_stores = []
-    for favorite in favorite_store_records:
-      store = db.query(Store).filter(Store.sid == favorite.store_id).first()
-      if store:
-        favorite_stores.append(StoreListSchema(
-          sid=store.sid,
-          store_name=store.store_name,
-          store_number=store.store_number,
-          store_location=store.store_location,
-          store_thumb_url=store.store_thumb_url, 
-          store_banner_url=store.store_banner_url,
-          is_open=store.is_open,
-          category=store.category
-        ))
-
-    # 유저 데이터를 UserSchema로 변환
-    user_data = UserSchema(
-      uid=user.uid,
-      name=user.name,
-      user_id=user.user_id,
-      user_pw=user.user_pw,
-      user_birth=user.user_birth,
-      std_id=user.std_id,
-      email=user.email,
-      major=user.major,
-      gender=user.gender,
-      phone_number=user.phone_number,
-      marketing_term=user.marketing_term,
-      sign_url=user.sign_url,
-      created_at=user.created_at,
-      role=user.role,
-      store_id=user.store_id,
-      is_school_verified=user.is_school_verified,
-      school_selected=user.school_selected,
-      school=user.school,
-      favorite_stores=favorite_stores,  # 즐겨찾기한 매장 리스트 추가
-    )
+      if not users:
+        break
+
+      yield b"".join(encode_json(user_profile(user, status_of).model_dump(mode='json', exclude=USER_EXPORT_EXCLUDE)) + b"\n" for user in users)
+
+      after = users[-1].uid
+      db.expunge_all()
 
-    # 결과 리스트에 추가
-    user_list.append(user_data)
+      if len(users) < USER_EXPORT_BATCH_SIZE:
+        break
+  finally:
+    db.close()
+
+
+# 유저 전체 리스트 조회 API (서비스 관리자만 조회 가능, 비밀번호 해시는 제외)
+# stream=true 이면 전체 목록을 메모리에 모으지 않고 NDJSON(application/x-ndjson)으로 전송
+@users_router.get('', summary="[TEST용] 가입된 유저들 리스트 조회")
+async def read_users(
+  school_id: Optional[int] = Query(None),
+  role: Optional[int] = Query(None, description="1 : 일반 유저 / 2 : 매장 사장님 / 3 : 쿠폰 관리 교직원"),
+  after: Optional[int] = Query(None, description="이전에 받은 마지막 uid"),
+  stream: bool = Query(False, description="NDJSON 스트리밍 여부"),
+  db: Session = Depends(get_db),
+  admin: Principal = Depends(require_admin),
+):
+  if stream:
+    return StreamingResponse(stream_users(school_id, role, after), media_type="application/x-ndjson")
+
+  # 조건에 맞는 유저를 즐겨찾기 매장과 함께 조회
+  users = filter_users(db.query(User).options(*USER_PROFILE_OPTIONS), school_id, role, after).order_by(User.uid).all()
+
+  # 각 유저의 즐겨찾기 매장을 포함한 데이터를 구성
+  status_of = status_lookup(db)
+  user_list = [user_profile(user, status_of) for user in users]
 
   response = JSONResponse(status_code=200, content={
     "status" : 200,
     "isSuccess" : True,
     "message" : f"정상적으로 조회가 완료되었습니다.",
-    "result": [user.model_dump() for user in user_list],
+    "result": [user.model_dump(mode='json', exclude=USER_EXPORT_EXCLUDE) for user in user_list],
   })
 
   return response
@@ -531,90 +561,60 @@ async def read_users(db: Session = Depends(get_db)):
 
 # 현재 로그인 된 유저 정보 조회
 @users_router.get('/me', summary="008. 현재 로그인 된 유저 조회")
-async def read_current_user(db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def read_current_user(db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   
-  # uid에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  # uid에 해당하는 유저를 즐겨찾기 매장과 함께 조회
+  user = db.query(User).options(*USER_PROFILE_OPTIONS).filter(User.uid == token.uid).first()
 
   if not user:
     raise CustomHTTPException(status_code=404, message="로그인 유저를 찾을 수 없습니다.")
 
-  # 유저의 즐겨찾기 매장 가져오기
-  favorite_store_records = db.query(UserFavoriteStore).filter(UserFavoriteStore.uid == user.uid).all()
-  # Favorite 조회 에러 수정해야 함
-  
-  # Store 정보 추출 및 StoreSchema로 변환
-  favorite_stores = []
-  for favorite in favorite_store_records:
-    store = db.query(Store).filter(Store.sid == favorite.store_id).first()
-    
-    if store:
-      favorite_stores.append(StoreListSchema(
-        sid=store.sid, 
-        store_name=store.store_name, 
-        store_number=store.store_number, 
-        store_location=store.store_location, 
-        store_thumb_url=store.store_thumb_url, 
-        store_banner_url=store.store_banner_url, 
-        is_open=store.is_open, 
-        category=store.category
-      ))
-
   # UserSchema로 변환할 때 favorite_stores 필드에 매장 리스트 추가
-  user_data = UserSchema(
-    uid=user.uid,
-    name=user.name,
-    user_id=user.user_id,
-    user_pw=user.user_pw,
-    user_birth=user.user_birth,
-    std_id=user.std_id,
-    email=user.email,
-    major=user.major,
-    gender=user.gender,
-    phone_number=user.phone_number,
-    marketing_term=user.marketing_term,
-    sign_url=user.sign_url,
-    # created_at=user.created_at,
-    role=user.role,
-    store_id=user.store_id,
-    is_school_verified=user.is_school_verified,
-    school_selected=user.school_selected,
-    school=user.school,
-    favorite_stores=favorite_stores,  # 즐겨찾기한 매장 리스트 추가
-  )
+  user_data = user_profile(user, status_lookup(db), with_created_at=False)
   
   response = JSONResponse(status_code=200, content={
     "status" : 200,
     "isSuccess" : True,
     "message" : f"정상적으로 조회가 완료되었습니다.",
-    "result": user_data.model_dump(),
+    "result": user_data.model_dump(exclude=USER_EXPORT_EXCLUDE),
   })
 
   return response
 
 @users_router.put('/me/password', summary="010. 현재 로그인된 유저 비밀번호 수정")
-async def update_password(current_password: str, new_password: str, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def update_password(current_password: str, new_password: str, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   
   # uid에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  user = db.get(User, token.uid)
   
   # 현재 로그인 된 유저 조회
   if not user:
     raise CustomHTTPException(status_code=404, message="로그인 된 유저를 찾을 수 없습니다.")
   
+  # 현재 비밀번호 검증과 새 비밀번호 중복 검증을 동시에 처리
+  is_current, is_same = await asyncio.gather(
+    verify_password(current_password, user.user_pw),
+    verify_password(new_password, user.user_pw),
+  )
+  
   # 현재 비밀번호가 맞는지 검증
-  if not pwd_context.verify(current_password, user.user_pw):
+  if not is_current:
     raise CustomHTTPException(status_code=400, message="현재 비밀번호가 올바르지 않습니다.")
   
   # 새로운 비밀번호와 기존 비밀번호가 동일하면 예외처리
-  if pwd_context.verify(new_password, user.user_pw):
+  if is_same:
     raise CustomHTTPException(status_code=400, message="새로운 비밀번호는 기존 비밀번호와 동일할 수 없습니다.")
   
-  hashed_password = pwd_context.hash(new_password)
+  hashed_password = await hash_password(new_password)
   user.user_pw = hashed_password
   
+  # 이전에 발급된 토큰 무효화
+  bump_token_version(db, user.uid)
+  
   db.commit()
   db.refresh(user)
+  invalidate_principal(user.uid)
+  invalidate_token_version(user.uid)
   
   response = JSONResponse(status_code=200, content={
     "status" : 200,
@@ -626,10 +626,10 @@ async def update_password(current_password: str, new_password: str, db: Session
   return response
 
 @users_router.put('/me/sign', summary="011. 현재 로그인된 유저 사인 수정")
-async def update_sign(sign_update_url: UserSignSchema, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def update_sign(sign_update_url: UserSignSchema, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   
   # std_id에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  user = db.get(User, token.uid)
   
   # 사용자가 없을 시 처리
   if not user:
@@ -674,76 +674,40 @@ async def update_sign(sign_update_url: UserSignSchema, db: Session = Depends(get
   return response
 
 
-# 유저 한 명 조회 API
+# 유저 한 명 조회 API (서비스 관리자만 조회 가능, 비밀번호 해시는 제외)
 @users_router.get('/{user_id}', response_model=UserSchema, summary="[TEST용] 아이디를 통한 유저 조회")
-async def read_user(user_id: str, db: Session = Depends(get_db)):
-  # std_id에 해당하는 유저를 조회
-  user = db.query(User).filter(User.user_id == user_id).first()
+async def read_user(user_id: str, db: Session = Depends(get_db), admin: Principal = Depends(require_admin)):
+  # user_id에 해당하는 유저를 즐겨찾기 매장과 함께 조회
+  user = db.query(User).options(*USER_PROFILE_OPTIONS).filter(User.user_id == user_id).first()
 
   if not user:
     raise CustomHTTPException(status_code=404, message="해당 사용자를 찾을 수 없습니다.")
 
-  # 유저의 즐겨찾기 매장 가져오기
-  favorite_store_records = db.query(UserFavoriteStore).filter(UserFavoriteStore.uid == user.uid).all()
-  # Favorite 조회 에러 수정해야 함
-  # Store 정보 추출 및 StoreSchema로 변환
-  favorite_stores = []
-  for favorite in favorite_store_records:
-      store = db.query(Store).filter(Store.sid == favorite.store_id).first()
-      
-      if store:
-        favorite_stores.append(StoreListSchema(sid=store.sid, store_name=store.store_name, store_number=store.store_number, store_location=store.store_location, store_img_url=store.store_img_url, is_open=store.is_open, category=store.category))
-
   # UserSchema로 변환할 때 favorite_stores 필드에 매장 리스트 추가
-  user_data = UserSchema(
-    uid=user.uid,
-    name=user.name,
-    user_id=user.user_id,
-    user_pw=user.user_pw,
-    user_birth=user.user_birth,
-    std_id=user.std_id,
-    email=user.email,
-    major=user.major,
-    gender=user.gender,
-    phone_number=user.phone_number,
-    marketing_term=user.marketing_term,
-    sign_url=user.sign_url,
-    created_at=user.created_at,
-    role=user.role,
-    store_id=user.store_id,
-    is_school_verified=user.is_school_verified,
-    school_selected=user.school_selected,
-    school=user.school,
-    favorite_stores=favorite_stores,  # 즐겨찾기한 매장 리스트 추가
-  )
+  user_data = user_profile(user, status_lookup(db))
 
-  return user_data
+  return JSONResponse(status_code=200, content=user_data.model_dump(mode='json', exclude=USER_EXPORT_EXCLUDE))
 
 @users_router.delete('/me', summary="009. 현재 로그인 된 유저 삭제")
-async def delete_user(pw:str, db: Session = Depends(get_db), token: str = Depends(verify_jwt_token)):
+async def delete_user(pw:str, db: Session = Depends(get_db), token: Principal = Depends(verify_jwt_token)):
   # user_id에 해당하는 유저를 조회
-  user = db.query(User).filter(User.uid == token.uid).first()
+  user = db.get(User, token.uid)
   
   # 해당 유저가 존재하지 않으면 404 에러 반환
   if not user:
     raise CustomHTTPException(status_code=404, message="로그인 된 유저를 찾을 수 없습니다.")
   
-  if pwd_context.verify(pw, user.user_pw):
+  if await verify_password(pw, user.user_pw):
     db.delete(user)
+    bump_token_version(db, user.uid)
+    # 인증된 학교 이메일 삭제 (실패해도 탈퇴는 진행)
     try:
-      payload={
-        "key" : UNIVCERT_API_KEY
-      }
-      
-      requests.post(f"{UNIVCERT_URL}/clear/{user.email}", json=payload)
-    except:
-      response = JSONResponse(status_code=500, content={
-        "status" : 500,
-        "isSuccess" : False,
-        "message" : f"서버오류 - 관리자에게 문의바람",
-        "result": None,
-      })
+      await univcert.clear(user.email)
+    except UpstreamError as e:
+      print(f"인증 이메일 삭제 실패 - {e}")
     db.commit()
+    invalidate_principal(user.uid)
+    invalidate_token_version(user.uid)
   else:
     raise CustomHTTPException(status_code=400, message="비밀번호가 일치하지 않습니다.")
 
@@ -1,45 +1,217 @@
-from apscheduler.schedulers.background import BackgroundScheduler
 from sqlalchemy.orm import sessionmaker
 from server.db import engine
-from server.models import Store
+from server.models import Store, StoreScheduleChange
+from server.util.store_status import status_from_week, next_transition
+from server.util.store_schedule import load_schedules, get_schedules, refresh_store_schedule
+from server.util.upsert import upsert
+from server.util.verification_store import purge_verification_codes
 from datetime import datetime
+import heapq
+import threading
 import time
 import pytz
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 전체 매장을 다시 동기화하는 주기(초)
+FULL_SYNC_INTERVAL = 30 * 60
+# 다른 워커에서 운영시간이 수정된 매장(store_schedule_change)을 확인하는 주기(초)
+CHANGE_POLL_INTERVAL = 10
+
+# 다음 상태 전환 시각 힙 (전환 시각, sid) / sid -> 유효한 전환 시각
+_lock = threading.Lock()
+_heap = []
+_next_at = {}
+# 상태 계산에 실패하여 다음 확인 때 다시 계산할 매장들
+_pending = set()
+
+# 실행 중인 스케쥴러의 종료 이벤트 -> 대기 중인 스케쥴러를 깨우는 이벤트 (리더가 될 때마다 새로 생성)
+_wakeups = {}
+_stop_event = threading.Event()
+
 def get_skt_time():
   kst = pytz.timezone('Asia/Seoul')
   return datetime.now(kst)
 
+def _store_status(schedules, sid, now):
+  week = schedules.get(sid)
+  return status_from_week(week, now) if week else 'closed'
+
+# 매장의 다음 상태 전환 시각을 힙에 등록 (이전에 등록된 시각은 무효화)
+def _schedule_store(schedules, sid, now):
+  week = schedules.get(sid)
+  when = next_transition(week, now) if week else None
+
+  with _lock:
+    if when is None:
+      _next_at.pop(sid, None)
+    else:
+      _next_at[sid] = when
+      heapq.heappush(_heap, (when, sid))
+
+# 상태가 바뀐 매장만 일괄 UPDATE (커밋은 호출한 쪽에서 처리)
+def _write_statuses(db_session, statuses):
+  changes = [{'sid': sid, 'is_open': status} for sid, (status, is_open) in statuses.items() if status != is_open]
+
+  if changes:
+    db_session.bulk_update_mappings(Store, changes)
+
+  return changes
+
+# 전체 매장의 상태를 동기화하고 전환 시각 힙을 새로 구성
 def update_store_statuses():
+  started = time.perf_counter()
+  db_session = SessionLocal()
+  try:
+    now = get_skt_time()
+
+    # 읽기 쪽 상태 계산과 같은 운영시간 캐시를 갱신하여 사용 (자정을 넘기는 운영시간 포함)
+    schedules = load_schedules(db_session)
+    rows = db_session.query(Store.sid, Store.is_open).all()
+
+    with _lock:
+      _heap.clear()
+      _next_at.clear()
+      _pending.clear()
+
+    statuses = {}
+    for sid, is_open in rows:
+      statuses[sid] = (_store_status(schedules, sid, now), is_open)
+      _schedule_store(schedules, sid, now)
+
+    # API 응답의 매장 상태는 요청 시점에 운영시간으로 계산되므로 (server/util/store_schedule.py)
+    # is_open 컬럼은 상태가 바뀐 매장만 동기화
+    changes = _write_statuses(db_session, statuses)
+    db_session.commit()
+
+    elapsed = time.perf_counter() - started
+    print(f"매장 업데이트 {get_skt_time()} - {len(rows)}개 중 {len(changes)}개 변경 ({elapsed:.3f}초)")
+    return len(changes)
+  except Exception as e:
+    db_session.rollback()
+    print(f"업데이트 중 오류 발생 - {get_skt_time()} : {e}")
+  finally:
+    db_session.close()
+
+# 전환 시각이 지난 매장과 운영시간이 수정된 매장만 상태를 다시 계산
+def update_due_stores(now=None):
+  now = now or get_skt_time()
+
+  with _lock:
+    due = set(_pending)
+    _pending.clear()
+    while _heap and _heap[0][0] <= now:
+      when, sid = heapq.heappop(_heap)
+      # 다시 등록되어 무효화된 항목은 무시
+      if _next_at.get(sid) == when:
+        del _next_at[sid]
+        due.add(sid)
+
   db_session = SessionLocal()
   try:
-    stores = db_session.query(Store).all()
-    for store in stores:
-      store.update_is_open(db_session)
+    # 어느 워커에서든 운영시간이 수정된 매장
+    changed = db_session.query(StoreScheduleChange.sid, StoreScheduleChange.version).all()
+    if not due and not changed:
+      return 0
+
+    for sid, _ in changed:
+      refresh_store_schedule(db_session, sid)
+      due.add(sid)
+    schedules = get_schedules(db_session)
+
+    rows = db_session.query(Store.sid, Store.is_open).filter(Store.sid.in_(due)).all()
+
+    statuses = {}
+    for sid, is_open in rows:
+      statuses[sid] = (_store_status(schedules, sid, now), is_open)
+      _schedule_store(schedules, sid, now)
+
+    # 가져간 뒤 다시 수정된 매장은 (version이 달라져서) 남겨두어 다음 확인 때 다시 계산
+    for sid, version in changed:
+      db_session.query(StoreScheduleChange).filter(
+        StoreScheduleChange.sid == sid,
+        StoreScheduleChange.version == version,
+      ).delete(synchronize_session=False)
+
+    changes = _write_statuses(db_session, statuses)
     db_session.commit()
-    print(f"매장 업데이트 {get_skt_time()}")
+    print(f"매장 상태 전환 {now} - {len(due)}개 중 {len(changes)}개 변경")
+    return len(changes)
   except Exception as e:
     db_session.rollback()
-    print(f"업데이트 중 오류 발생 - {get_skt_time} : {e}")
+    # 힙에서 꺼낸 매장들은 다음 확인 때 (CHANGE_POLL_INTERVAL 이내) 다시 계산
+    with _lock:
+      _pending.update(due)
+    print(f"상태 전환 중 오류 발생 - {get_skt_time()} : {e}")
   finally:
     db_session.close()
 
-def start_scheduler():
-  scheduler = BackgroundScheduler()
-  
-  # 10분 마다 update_store_statuses 함수 호출
-  scheduler.add_job(update_store_statuses, 'cron', minute='1,11,21,31,41,51')
-  
-  scheduler.start()
-  
-  # 스케쥴려가 백그라운드에서 계속 반복 실행될 수 있도록 유지하기 위한 코드
+# 기간이 지난 휴대폰 인증 기록 삭제 (전체 동기화 주기마다)
+def purge_verifications():
+  db_session = SessionLocal()
   try:
-    # 루프가 1분 동안 멈춘 후 다시 돌아가면서 스케쥴러의 작업을 계속 유지
-    # 1분 간격으로 스케쥴러가 잘 동작하고 있는지 확인하며, 백그라운드에서 다른 일이 없을 때는 CPU를 낭비하지 않도록 휴식시간(sleep)
-    while True:
-      time.sleep(60)
-  except (KeyboardInterrupt, SystemExit):
-    # 스케쥴러가 실행 중일 때 예외가 발생하면 안전하게 종료하기 위한 shutdown메서드 호출
-    scheduler.shutdown()
\ No newline at end of file
+    deleted = purge_verification_codes(db_session)
+    if deleted:
+      print(f"휴대폰 인증 기록 정리 {get_skt_time()} - {deleted}개 삭제")
+    return deleted
+  except Exception as e:
+    db_session.rollback()
+    print(f"휴대폰 인증 기록 정리 중 오류 발생 - {get_skt_time()} : {e}")
+  finally:
+    db_session.close()
+
+# 운영시간이 수정된 매장을 기록 (update_store에서 호출, 커밋은 호출한 쪽에서 처리하고 커밋 후 notify_scheduler 호출)
+# 리더 워커의 스케쥴러가 CHANGE_POLL_INTERVAL마다 가져가서 전환 시각을 다시 계산
+def mark_store_schedule_changed(db_session, sid: int):
+  upsert(db_session, StoreScheduleChange, {'sid': sid, 'version': 1}, {'version': StoreScheduleChange.__table__.c.version + 1})
+
+# 같은 워커에서 스케쥴러가 실행 중이면 바로 깨움 (다른 워커의 스케쥴러는 다음 확인 때 반영)
+def notify_scheduler():
+  with _lock:
+    wakeups = list(_wakeups.values())
+  for wakeup in wakeups:
+    wakeup.set()
+
+# 다음 전환 시각까지 대기할 시간(초) (수정된 매장 확인 주기를 넘지 않음)
+def _seconds_until_next(now, next_full_sync):
+  with _lock:
+    next_at = _heap[0][0] if _heap else None
+
+  timeout = min(next_full_sync - time.monotonic(), CHANGE_POLL_INTERVAL)
+  if next_at is not None:
+    timeout = min(timeout, (next_at - now).total_seconds())
+  return max(timeout, 0)
+
+# 가장 이른 상태 전환 시각까지 잠들었다가 전환되는 매장만 갱신
+def start_scheduler(stop_event: threading.Event = None):
+  stop_event = stop_event or _stop_event
+  wakeup = threading.Event()
+  next_full_sync = 0
+
+  with _lock:
+    _wakeups[stop_event] = wakeup
+
+  try:
+    while not stop_event.is_set():
+      wakeup.clear()
+      if time.monotonic() >= next_full_sync:
+        update_store_statuses()
+        purge_verifications()
+        next_full_sync = time.monotonic() + FULL_SYNC_INTERVAL
+      else:
+        update_due_stores()
+
+      wakeup.wait(timeout=_seconds_until_next(get_skt_time(), next_full_sync))
+  finally:
+    with _lock:
+      _wakeups.pop(stop_event, None)
+
+# 스케쥴러 종료 (서버 종료 시 호출)
+def stop_scheduler(stop_event: threading.Event = None):
+  stop_event = stop_event or _stop_event
+  stop_event.set()
+
+  with _lock:
+    wakeup = _wakeups.get(stop_event)
+  if wakeup is not None:
+    wakeup.set()
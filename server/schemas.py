@@ -81,6 +81,10 @@ class StoreListSchema(BaseModel):
   store_banner_url: Optional[str] = None
   category: StoreCategorySchema
 
+# 매장 검색 결과 Schema (검색어와 일치한 메뉴 포함)
+class StoreSearchResultSchema(StoreListSchema):
+  matched_menus: List[str] = []
+
 # 매장 검색 Schema
 class StoreSearchSchema(BaseModel):
   # sid:int
@@ -199,6 +203,11 @@ class VerifyId(BaseModel):
 class VerifyPhoneNum(BaseModel):
   phone_number: str
 
+# 휴대폰 인증번호 확인 Schema
+class VerifyPhoneCode(BaseModel):
+  phone_number: str
+  code: str
+
 # 학교인증 Schema
 class VerifySchool(BaseModel):
   major: str
@@ -0,0 +1,89 @@
+# 비밀번호 검증(bcrypt) 처리량 벤치마크
+#
+# 사용법:
+#   python -m server.scripts.bench_password [--requests 64] [--concurrency 32] [--workers 1 2 4]
+#
+# 이벤트 루프에서 바로 검증하는 경우(inline)와 프로세스 풀 크기별 로그인 처리량(logins/s)을 비교함
+# inline은 검증하는 동안 이벤트 루프가 멈추므로 다른 요청의 대기 시간(loop lag)도 함께 출력
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from server.util import password
+
+
+# 이벤트 루프가 얼마나 오래 멈췄는지 측정 (10ms마다 깨어나야 하는 작업의 최대 지연)
+async def _measure_loop_lag(stop: asyncio.Event):
+  max_lag = 0.0
+  while not stop.is_set():
+    started = time.perf_counter()
+    await asyncio.sleep(0.01)
+    max_lag = max(max_lag, time.perf_counter() - started - 0.01)
+  return max_lag
+
+
+async def _run_logins(verify, hashed: str, requests: int, concurrency: int):
+  semaphore = asyncio.Semaphore(concurrency)
+
+  async def login():
+    async with semaphore:
+      if not await verify("password1234", hashed):
+        raise RuntimeError("비밀번호 검증 실패")
+
+  stop = asyncio.Event()
+  lag_task = asyncio.create_task(_measure_loop_lag(stop))
+
+  started = time.perf_counter()
+  await asyncio.gather(*(login() for _ in range(requests)))
+  elapsed = time.perf_counter() - started
+
+  stop.set()
+  return elapsed, await lag_task
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+  return password.pwd_context.verify(plain_password, hashed_password)
+
+
+async def bench(requests: int, concurrency: int, worker_counts):
+  hashed = password.pwd_context.hash("password1234")
+  results = []
+
+  elapsed, lag = await _run_logins(_inline_verify, hashed, requests, concurrency)
+  results.append(("inline", elapsed, lag))
+
+  for workers in worker_counts:
+    password.shutdown_password_pool()
+    password.PASSWORD_WORKERS = workers
+    password.PASSWORD_MAX_PENDING = max(requests, password.PASSWORD_MAX_PENDING)
+
+    # 프로세스 시작 비용은 제외하고 측정
+    await asyncio.gather(*(password.verify_password("password1234", hashed) for _ in range(workers)))
+
+    elapsed, lag = await _run_logins(password.verify_password, hashed, requests, concurrency)
+    results.append((f"pool x{workers}", elapsed, lag))
+
+  password.shutdown_password_pool()
+  return results
+
+
+def main(argv=None):
+  cpu_count = os.cpu_count() or 1
+
+  parser = argparse.ArgumentParser(description="bcrypt 비밀번호 검증 처리량을 측정합니다.")
+  parser.add_argument("--requests", type=int, default=64, help="측정할 로그인 요청 수")
+  parser.add_argument("--concurrency", type=int, default=32, help="동시에 처리 중인 최대 요청 수")
+  parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, max(1, cpu_count // 2), cpu_count}),
+                      help="측정할 프로세스 풀 크기들")
+  args = parser.parse_args(argv)
+
+  print(f"CPU {cpu_count}코어 / 요청 {args.requests}개 / 동시 요청 {args.concurrency}개")
+  for name, elapsed, lag in asyncio.run(bench(args.requests, args.concurrency, args.workers)):
+    print(f"{name:>10} : {args.requests / elapsed:7.1f} logins/s ({elapsed:.2f}초, 최대 loop lag {lag * 1000:.0f}ms)")
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,200 @@
+# 학기 단위 학식 메뉴 일괄 등록 CLI
+#
+# 사용법:
+#   python -m server.scripts.load_haksik_menus menus.csv [menus2.xlsx ...] [--dry-run] [--chunk-size 2000]
+#
+# 시트 컬럼 (첫 행은 헤더):
+#   date, meal, menu 와 함께 cafeteria_id 또는 (school_id, cafeteria) 중 하나
+#   - date : YYYY-MM-DD
+#   - meal : breakfast / lunch
+#   - 같은 (식당, 식사, 날짜) 안에서는 시트에 나온 순서가 메뉴 순서가 됨
+#   - 같은 (식당, 식사, 날짜)의 행은 시트에서 이어져 있어야 함 (시트를 읽는 대로 청크 단위로 반영)
+#
+# 시트에 포함된 (식당, 식사, 날짜)의 메뉴만 시트 내용으로 교체되며, 나머지 날짜의 메뉴는 그대로 유지됨
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import date, datetime
+
+from server.db import SessionLocal
+from server.models import Cafeteria, MealType
+from server.util.haksik_import import HaksikImportError, apply_haksik_changes, has_changes, plan_haksik_changes
+
+
+# CSV/XLSX 파일을 한 행씩 dict로 읽음
+def iter_sheet_rows(path):
+  extension = os.path.splitext(path)[1].lower()
+
+  if extension == ".csv":
+    with open(path, newline="", encoding="utf-8-sig") as f:
+      for row in csv.DictReader(f):
+        yield row
+
+  elif extension in (".xlsx", ".xlsm"):
+    try:
+      from openpyxl import load_workbook
+    except ImportError:
+      raise HaksikImportError("XLSX 파일을 읽으려면 openpyxl을 설치해야 합니다.")
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+      for sheet in workbook.worksheets:
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+          continue
+        header = [str(column).strip() if column is not None else "" for column in header]
+        for values in rows:
+          if values and any(value is not None for value in values):
+            yield dict(zip(header, values))
+    finally:
+      workbook.close()
+
+  else:
+    raise HaksikImportError(f"지원하지 않는 파일 형식입니다: {path}")
+
+
+def parse_date(value) -> date:
+  if isinstance(value, datetime):
+    return value.date()
+  if isinstance(value, date):
+    return value
+  return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+
+
+# 시트 행들을 (cafeteria_id, meal_id, menu_date) -> [menu, ...] 로 묶어 메뉴 행 수 기준 청크로 나눠서 돌려줌
+# 시트 전체를 메모리에 올리지 않도록 같은 (식당, 식사, 날짜)의 행은 시트에서 이어져 있어야 함
+def read_chunks(db, paths, chunk_size):
+  meal_ids = {meal.type: meal.id for meal in db.query(MealType).all()}
+  cafeterias = db.query(Cafeteria.id, Cafeteria.school_id, Cafeteria.name).all()
+  cafeteria_ids = {cafeteria.id for cafeteria in cafeterias}
+  cafeteria_names = {(cafeteria.school_id, cafeteria.name): cafeteria.id for cafeteria in cafeterias}
+
+  chunk = {}
+  size = 0
+  # 이미 반영한 청크의 키 (다시 나오면 앞서 반영한 메뉴를 덮어쓰게 됨)
+  flushed = set()
+
+  for path in paths:
+    for line, row in enumerate(iter_sheet_rows(path), start=2):
+      try:
+        if row.get("cafeteria_id") not in (None, ""):
+          cafeteria_id = int(row["cafeteria_id"])
+        else:
+          cafeteria_id = cafeteria_names.get((int(row["school_id"]), str(row["cafeteria"]).strip()))
+
+        if cafeteria_id not in cafeteria_ids:
+          raise HaksikImportError("존재하지 않는 식당입니다.")
+
+        meal = str(row["meal"]).strip()
+        if meal not in meal_ids:
+          raise HaksikImportError(f"잘못된 식사 종류: {meal}")
+
+        menu_date = parse_date(row["date"])
+      except (KeyError, TypeError, ValueError) as e:
+        raise HaksikImportError(f"{path}:{line} 행을 읽을 수 없습니다 - {e}")
+
+      key = (cafeteria_id, meal_ids[meal], menu_date)
+      if key in flushed:
+        raise HaksikImportError(f"{path}:{line} 같은 식당/식사/날짜의 행이 이어져 있지 않습니다 - {meal} {menu_date}")
+
+      if key not in chunk:
+        if size >= chunk_size:
+          yield chunk, size
+          flushed.update(chunk)
+          chunk = {}
+          size = 0
+        chunk[key] = []
+
+      menu = row.get("menu")
+      chunk[key].append(None if menu is None else str(menu).strip())
+      size += 1
+
+  if chunk:
+    yield chunk, size
+
+
+# 청크의 변경 내역을 한 줄씩 출력 (--dry-run)
+def print_changes(plan, meal_names):
+  for (cafeteria_id, meal_id, menu_date), position, old_name, new_name in plan['changes']:
+    prefix = f"식당 {cafeteria_id} {menu_date} {meal_names.get(meal_id, meal_id)} #{position + 1}"
+    if old_name is None:
+      print(f"{prefix} + {new_name}")
+    elif new_name is None:
+      print(f"{prefix} - {old_name}")
+    else:
+      print(f"{prefix} : {old_name} -> {new_name}")
+
+
+def merge_summary(total, summary):
+  for cafeteria_id, counts in summary.items():
+    merged = total.setdefault(cafeteria_id, {'updated': 0, 'inserted': 0, 'deleted': 0, 'unchanged': 0})
+    for name, count in counts.items():
+      merged[name] += count
+
+
+def load_haksik_menus(paths, chunk_size=2000, dry_run=False):
+  db = SessionLocal()
+  started = time.perf_counter()
+  total = {}
+  row_count = 0
+
+  try:
+    meal_names = {meal.id: meal.type for meal in db.query(MealType).all()}
+
+    # 시트를 읽는 대로 청크마다 기존 메뉴를 한 번에 조회하여 비교하고, 바뀐 행만 하나의 트랜잭션으로 반영
+    for chunk, size in read_chunks(db, paths, chunk_size):
+      row_count += size
+      plan = plan_haksik_changes(db, chunk)
+      merge_summary(total, plan['summary'])
+
+      if dry_run:
+        print_changes(plan, meal_names)
+
+      if dry_run or not has_changes(plan):
+        db.rollback()
+        continue
+
+      try:
+        apply_haksik_changes(db, plan)
+        db.commit()
+      except Exception:
+        db.rollback()
+        raise
+  finally:
+    db.close()
+
+  elapsed = time.perf_counter() - started
+  return total, row_count, elapsed
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description="학식 메뉴 시트(CSV/XLSX)를 일괄 등록합니다.")
+  parser.add_argument("paths", nargs="+", help="CSV 또는 XLSX 파일 경로")
+  parser.add_argument("--chunk-size", type=int, default=2000, help="한 트랜잭션에서 처리할 메뉴 행 수")
+  parser.add_argument("--dry-run", action="store_true", help="DB에 반영하지 않고 변경 내역만 출력")
+  args = parser.parse_args(argv)
+
+  try:
+    total, row_count, elapsed = load_haksik_menus(args.paths, args.chunk_size, args.dry_run)
+  except HaksikImportError as e:
+    print(f"학식 메뉴 등록 실패 - {e}", file=sys.stderr)
+    return 1
+
+  for cafeteria_id in sorted(total):
+    counts = total[cafeteria_id]
+    print(
+      f"식당 {cafeteria_id} : 수정 {counts['updated']} / 추가 {counts['inserted']} / "
+      f"삭제 {counts['deleted']} / 변경 없음 {counts['unchanged']}"
+    )
+
+  rate = row_count / elapsed if elapsed > 0 else float(row_count)
+  mode = "[DRY RUN] " if args.dry_run else ""
+  print(f"{mode}{row_count}개 행 처리 - {elapsed:.2f}초 ({rate:,.0f} rows/s)")
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,126 @@
+# 외부 API(InfoBank 알림톡, Univcert 학교 이메일 인증) 로컬 스텁 서버
+#
+# 사용법:
+#   python -m server.scripts.stub_upstreams [--port 9100] [--delay 0] [--fail-rate 0]
+#
+# 서버 실행 시 환경변수를 스텁 주소로 지정:
+#   INFO_BANK_URL=http://127.0.0.1:9100/infobank
+#   UNIVCERT_URL=http://127.0.0.1:9100/univcert
+#
+# - 모든 인증 코드는 --code 값(기본 123456)으로 확인됨
+# - --delay 로 느린 외부 API, --fail-rate 로 간헐적인 실패(HTTP 500)를 재현할 수 있음
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(delay: float = 0.0, fail_rate: float = 0.0, code: str = "123456", token_ttl: int = 3600) -> FastAPI:
+  app = FastAPI()
+  infobank = APIRouter(prefix="/infobank")
+  univcert = APIRouter(prefix="/univcert")
+
+  # 이메일 -> 인증 여부
+  emails = {}
+  # 발급한 토큰 -> 만료 시각
+  tokens = {}
+  stats = {'token': 0, 'alimtalk': 0, 'univcert': 0}
+
+  @app.middleware("http")
+  async def simulate_upstream(request: Request, call_next):
+    if delay:
+      await asyncio.sleep(delay)
+    if fail_rate and random.random() < fail_rate:
+      return JSONResponse(status_code=500, content={"result": "Fail", "success": False, "message": "stub failure"})
+    return await call_next(request)
+
+  @infobank.post("/v1/auth/token")
+  async def issue_token(request: Request):
+    stats['token'] += 1
+    if not request.headers.get("X-IB-Client-Id"):
+      return JSONResponse(status_code=401, content={"result": "Unauthorized"})
+
+    token = uuid.uuid4().hex
+    tokens[token] = time.time() + token_ttl
+    expired = time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(tokens[token]))
+    return {"result": "Success", "data": {"token": token, "schema": "Bearer", "expired": expired}}
+
+  @infobank.post("/v1/send/alimtalk")
+  async def send_alimtalk(request: Request):
+    stats['alimtalk'] += 1
+    schema, _, token = request.headers.get("Authorization", "").partition(" ")
+    if schema != "Bearer" or tokens.get(token, 0) < time.time():
+      return JSONResponse(status_code=401, content={"result": "Unauthorized"})
+
+    body = await request.json()
+    print(f"[알림톡] {body.get('to')} : {body.get('text')}")
+    return {"result": "Success", "msgKey": uuid.uuid4().hex}
+
+  @univcert.post("/certify")
+  async def certify(request: Request):
+    stats['univcert'] += 1
+    body = await request.json()
+    emails.setdefault(body.get("email"), False)
+    print(f"[Univcert] {body.get('email')} 인증 코드 : {code}")
+    return {"success": True}
+
+  @univcert.post("/certifycode")
+  async def certify_code(request: Request):
+    stats['univcert'] += 1
+    body = await request.json()
+    email = body.get("email")
+    if email not in emails or str(body.get("code")) != code:
+      return {"success": False, "message": "일치하지 않는 인증코드입니다."}
+    emails[email] = True
+    return {"success": True, "univName": body.get("univName"), "certified_email": email}
+
+  @univcert.post("/certifiedlist")
+  async def certified_list():
+    stats['univcert'] += 1
+    return {"success": True, "data": [{"email": email} for email, verified in emails.items() if verified]}
+
+  @univcert.post("/clear")
+  async def clear_all():
+    stats['univcert'] += 1
+    emails.clear()
+    return {"success": True}
+
+  @univcert.post("/clear/{email}")
+  async def clear_email(email: str):
+    stats['univcert'] += 1
+    emails.pop(email, None)
+    return {"success": True}
+
+  # 스텁이 받은 요청 수 확인용
+  @app.get("/stats")
+  async def get_stats():
+    return stats
+
+  app.include_router(infobank)
+  app.include_router(univcert)
+  return app
+
+
+def main(argv=None):
+  import uvicorn
+
+  parser = argparse.ArgumentParser(description="InfoBank / Univcert 로컬 스텁 서버를 실행합니다.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=9100)
+  parser.add_argument("--delay", type=float, default=0.0, help="모든 응답에 추가할 지연(초)")
+  parser.add_argument("--fail-rate", type=float, default=0.0, help="HTTP 500으로 실패시킬 요청 비율 (0~1)")
+  parser.add_argument("--code", default="123456", help="Univcert 인증 코드")
+  parser.add_argument("--token-ttl", type=int, default=3600, help="InfoBank 토큰 유효 시간(초)")
+  args = parser.parse_args(argv)
+
+  uvicorn.run(create_app(args.delay, args.fail_rate, args.code, args.token_ttl), host=args.host, port=args.port)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from server.util.time import get_skt_time
 from fastapi.security import APIKeyHeader
 from server.db import get_db
-from server.models import User
+from server.util.principal import Principal, decode_token, load_principal
+from server.util.token_version import is_token_current
 from server.util.custom_exception import CustomHTTPException
 
 from datetime import timedelta
@@ -20,37 +21,63 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 
 
 # 토큰 생성 함수
-def create_jwt_token(user):
+# role / sid(운영 매장) / ver(토큰 버전) claims로 매장 사장님 권한은 DB 조회 없이 확인
+def create_jwt_token(user, version: int = 0):
   payload = {
     "uid": user.uid,
     "std_id": user.std_id,
+    "role": user.role,
+    "sid": user.store_id,
+    "ver": version,
     "exp": get_skt_time() + timedelta(days=1)  # 토큰 유효 기간 설정 (1시간)
   }
   
   token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
   return token
 
-# 토큰 검증 함수
-def verify_jwt_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+# 토큰 서명/만료/버전 검증 후 payload 반환
+def decode_jwt_token(token: str, db: Session) -> dict:
   try:
-    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    user_id: str = payload.get("uid")
-    
-    if user_id is None:
-      raise CustomHTTPException(status_code=403, message="토큰이 유효하지 않습니다.")
-    
-    
-    # 유저 정보 조회
-    user = db.query(User).filter(User.uid == user_id).first()
-    
-    if user is None:
-      raise CustomHTTPException(status_code=400, message="유저를 찾을 수 없습니다.")
-    
-    return user
-
+    payload = decode_token(token, SECRET_KEY, ALGORITHM)
   except jwt.ExpiredSignatureError:
     raise CustomHTTPException(status_code=403, message="토큰이 만료되었습니다.")
   except jwt.InvalidTokenError:
     raise CustomHTTPException(status_code=403, message="토큰이 유효하지 않습니다.")
+  
+  if payload.get("uid") is None:
+    raise CustomHTTPException(status_code=403, message="토큰이 유효하지 않습니다.")
+  
+  try:
+    is_current = is_token_current(db, payload)
   except Exception as e:
-    raise CustomHTTPException(status_code=500, message=f"서버 오류가 발생하였습니다. 관리자에게 문의해주세요 : {str(e)}")
\ No newline at end of file
+    raise CustomHTTPException(status_code=500, message=f"서버 오류가 발생하였습니다. 관리자에게 문의해주세요 : {str(e)}")
+  
+  # 비밀번호 변경, 탈퇴 등으로 무효화된 토큰
+  if not is_current:
+    raise CustomHTTPException(status_code=403, message="토큰이 만료되었습니다.")
+  
+  return payload
+
+# 토큰 검증 함수 (검증된 토큰과 유저 정보는 캐시하여 매 요청마다 DB를 조회하지 않음)
+def verify_jwt_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+  payload = decode_jwt_token(token, db)
+  
+  try:
+    # 유저 정보 조회
+    user = load_principal(db, payload["uid"])
+  except Exception as e:
+    raise CustomHTTPException(status_code=500, message=f"서버 오류가 발생하였습니다. 관리자에게 문의해주세요 : {str(e)}")
+  
+  if user is None:
+    raise CustomHTTPException(status_code=400, message="유저를 찾을 수 없습니다.")
+  
+  return user
+
+# 서비스 관리자 권한 확인 (role : 4, 유저 목록 조회 등 관리용 API)
+ADMIN_ROLE = 4
+
+def require_admin(user: Principal = Depends(verify_jwt_token)) -> Principal:
+  if user.role != ADMIN_ROLE:
+    raise CustomHTTPException(status_code=403, message="관리자 권한이 없습니다.")
+
+  return user
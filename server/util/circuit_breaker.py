@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+
+# 외부 API별 서킷 브레이커
+# closed : 정상 호출 (연속 실패가 failure_threshold에 도달하면 open)
+# open : recovery_timeout 동안 호출하지 않고 바로 거절
+# half_open : recovery_timeout이 지나면 half_open_max_calls개의 요청만 보내서 확인 (성공하면 closed, 실패하면 다시 open)
+class CircuitBreaker:
+  def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30, half_open_max_calls: int = 1):
+    self.name = name
+    self.failure_threshold = failure_threshold
+    self.recovery_timeout = recovery_timeout
+    self.half_open_max_calls = half_open_max_calls
+
+    self.state = 'closed'
+    self.failures = 0          # 연속 실패 횟수
+    self.opened_at = None      # open 된 시각 (monotonic)
+    self.half_open_calls = 0   # half_open 상태에서 진행 중인 확인 요청 수
+    self.trips = 0             # open 된 횟수
+    self.rejected = 0          # open 상태에서 거절한 요청 수
+    self.last_error = None
+    self.last_failure_at = None
+
+  # 다시 호출할 수 있을 때까지 남은 시간(초)
+  def retry_after(self) -> float:
+    if self.state != 'open':
+      return 0.0
+    return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+  # 요청을 보내도 되는지 확인 (True를 받은 요청은 결과를 record_success / record_failure로 알려야 함)
+  def allow(self) -> bool:
+    if self.state == 'open' and self.retry_after() <= 0:
+      self.state = 'half_open'
+      self.half_open_calls = 0
+
+    if self.state == 'closed':
+      return True
+
+    if self.state == 'half_open' and self.half_open_calls < self.half_open_max_calls:
+      self.half_open_calls += 1
+      return True
+
+    self.rejected += 1
+    return False
+
+  def record_success(self):
+    self.failures = 0
+    if self.state == 'half_open':
+      print(f"{self.name} 서킷 브레이커 closed")
+    self.state = 'closed'
+
+  def record_failure(self, error: str):
+    self.failures += 1
+    self.last_error = error
+    self.last_failure_at = time.time()
+
+    if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+      self.state = 'open'
+      self.opened_at = time.monotonic()
+      self.trips += 1
+      print(f"{self.name} 서킷 브레이커 open ({self.trips}회) - {error}")
+
+  # 허용받은 요청을 결과 없이 끝냄 (half_open 확인 요청 자리를 돌려놓음)
+  def record_cancel(self):
+    if self.state == 'half_open' and self.half_open_calls > 0:
+      self.half_open_calls -= 1
+
+  def snapshot(self) -> dict:
+    return {
+      'state': self.state,
+      'failures': self.failures,
+      'trips': self.trips,
+      'rejected': self.rejected,
+      'retry_after': round(self.retry_after(), 1),
+      'last_error': self.last_error,
+      'last_failure_at': self.last_failure_at,
+    }
+
+
+# 외부 API별 동시 요청 수 제한 (max_wait초 안에 자리가 나지 않으면 거절, None이면 자리가 날 때까지 대기)
+class Bulkhead:
+  def __init__(self, max_concurrency: int, max_wait: float = None):
+    self.max_concurrency = max_concurrency
+    self.max_wait = max_wait
+    self.semaphore = asyncio.Semaphore(max_concurrency)
+    self.in_flight = 0
+    self.rejected = 0
+
+  async def acquire(self) -> bool:
+    try:
+      if self.max_wait is None:
+        await self.semaphore.acquire()
+      else:
+        await asyncio.wait_for(self.semaphore.acquire(), timeout=self.max_wait)
+    except asyncio.TimeoutError:
+      self.rejected += 1
+      return False
+
+    self.in_flight += 1
+    return True
+
+  def release(self):
+    self.in_flight -= 1
+    self.semaphore.release()
+
+  def snapshot(self) -> dict:
+    return {
+      'max_concurrency': self.max_concurrency,
+      'in_flight': self.in_flight,
+      'rejected': self.rejected,
+    }
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from server.models import Cafeteria, CafeteriaMenu, DayOfWeek, HaksikMenu, MealType
+
+
+class HaksikImportError(ValueError):
+  pass
+
+
+# {cafeteria_id: {"menu": {meal_type: {day: [menu, ...]}}}} 형태의 요청을
+# week_start 주의 날짜 기준 (cafeteria_id, meal_id, menu_date) -> [menu, ...] 로 변환
+def flatten_haksik_payload(db: Session, data: dict, week_start):
+  meal_ids = {meal.type: meal.id for meal in db.query(MealType).all()}
+  day_ids = {day.name: day.id for day in db.query(DayOfWeek).all()}
+
+  groups = {}
+  cafeteria_ids = set()
+  for cafeteria_key, cafeteria_data in data.items():
+    try:
+      cafeteria_id = int(cafeteria_key)
+    except (TypeError, ValueError):
+      raise HaksikImportError(f"잘못된 식당 id: {cafeteria_key}")
+    cafeteria_ids.add(cafeteria_id)
+
+    if not isinstance(cafeteria_data, dict) or not isinstance(cafeteria_data.get("menu"), dict):
+      raise HaksikImportError(f"{cafeteria_id}번 식당의 menu 형식이 올바르지 않습니다.")
+
+    for meal_type, meal_data in cafeteria_data["menu"].items():
+      if meal_type not in meal_ids:
+        raise HaksikImportError(f"잘못된 식사 종류: {meal_type}")
+
+      if not isinstance(meal_data, dict):
+        raise HaksikImportError(f"{cafeteria_id}번 식당 {meal_type}의 요일별 메뉴 형식이 올바르지 않습니다.")
+
+      for day, menu_list in meal_data.items():
+        if day not in day_ids:
+          raise HaksikImportError(f"잘못된 요일: {day}")
+
+        if not isinstance(menu_list, list):
+          raise HaksikImportError(f"{cafeteria_id}번 식당 {meal_type} {day}의 메뉴 목록 형식이 올바르지 않습니다.")
+
+        menu_date = week_start + timedelta(days=day_ids[day] - 1)
+        groups[(cafeteria_id, meal_ids[meal_type], menu_date)] = [
+          None if name is None else str(name) for name in menu_list
+        ]
+
+  if cafeteria_ids:
+    found = {row.id for row in db.query(Cafeteria.id).filter(Cafeteria.id.in_(cafeteria_ids))}
+    missing = cafeteria_ids - found
+    if missing:
+      raise HaksikImportError(f"존재하지 않는 식당: {sorted(missing)}")
+
+  return groups
+
+
+# 저장된 메뉴와 비교하여 바뀐 행만 골라냄
+# 같은 (식당, 식사, 날짜) 안에서는 cafeteria_menu.id 순서가 메뉴의 위치가 됨
+def plan_haksik_changes(db: Session, groups: dict):
+  stored = defaultdict(list)
+  cafeteria_ids = {key[0] for key in groups}
+  menu_dates = {key[2] for key in groups}
+
+  if cafeteria_ids:
+    rows = db.query(
+      CafeteriaMenu.id,
+      CafeteriaMenu.cafeteria_id,
+      CafeteriaMenu.meal_id,
+      CafeteriaMenu.menu_date,
+      HaksikMenu.id,
+      HaksikMenu.name,
+    ).join(HaksikMenu, CafeteriaMenu.menu_id == HaksikMenu.id).filter(
+      CafeteriaMenu.cafeteria_id.in_(cafeteria_ids),
+      CafeteriaMenu.menu_date.in_(menu_dates),
+    ).order_by(CafeteriaMenu.id).all()
+
+    for cafeteria_menu_id, cafeteria_id, meal_id, menu_date, menu_id, name in rows:
+      stored[(cafeteria_id, meal_id, menu_date)].append((cafeteria_menu_id, menu_id, name))
+
+  # changes : (키, 위치, 기존 메뉴, 새 메뉴) 목록 (추가는 기존 메뉴가, 삭제는 새 메뉴가 None)
+  plan = {'updates': [], 'inserts': [], 'deletes': [], 'changes': [], 'summary': {}}
+
+  for key, names in groups.items():
+    cafeteria_id = key[0]
+    summary = plan['summary'].setdefault(cafeteria_id, {'updated': 0, 'inserted': 0, 'deleted': 0, 'unchanged': 0})
+    current = stored.get(key, [])
+
+    for position, name in enumerate(names):
+      if position < len(current):
+        _, menu_id, stored_name = current[position]
+        if stored_name == name:
+          summary['unchanged'] += 1
+        else:
+          plan['updates'].append({'id': menu_id, 'name': name})
+          plan['changes'].append((key, position, stored_name, name))
+          summary['updated'] += 1
+      else:
+        plan['inserts'].append((key, name))
+        plan['changes'].append((key, position, None, name))
+        summary['inserted'] += 1
+
+    for position, (cafeteria_menu_id, menu_id, stored_name) in enumerate(current[len(names):], len(names)):
+      plan['deletes'].append((cafeteria_menu_id, menu_id))
+      plan['changes'].append((key, position, stored_name, None))
+      summary['deleted'] += 1
+
+  return plan
+
+
+def has_changes(plan) -> bool:
+  return bool(plan['updates'] or plan['inserts'] or plan['deletes'])
+
+
+# haksik_menu를 한 번의 executemany로 INSERT하고 입력 순서대로 id를 돌려줌
+def _insert_haksik_menus(db: Session, names: list) -> list:
+  dialect = db.get_bind().dialect
+  if dialect.insert_executemany_returning_sort_by_parameter_order:
+    result = db.execute(
+      insert(HaksikMenu).returning(HaksikMenu.id, sort_by_parameter_order=True),
+      [{'name': name} for name in names],
+    )
+    return [row.id for row in result]
+
+  # RETURNING이 없는 MySQL은 return_defaults를 쓰면 한 행씩 INSERT하므로
+  # 마지막 id를 잠근 채 이어지는 id를 직접 정해서 multi-row INSERT
+  last_id = db.query(func.coalesce(func.max(HaksikMenu.id), 0)).with_for_update().scalar()
+  menu_ids = list(range(last_id + 1, last_id + 1 + len(names)))
+  db.execute(insert(HaksikMenu), [{'id': menu_id, 'name': name} for menu_id, name in zip(menu_ids, names)])
+  return menu_ids
+
+
+# 계획된 변경을 일괄 반영 (commit은 호출한 쪽에서 한 번만 수행)
+def apply_haksik_changes(db: Session, plan):
+  if plan['updates']:
+    db.bulk_update_mappings(HaksikMenu, plan['updates'])
+
+  if plan['inserts']:
+    # haksik_menu를 먼저 일괄 INSERT하여 id를 받은 뒤 cafeteria_menu를 일괄 INSERT
+    menu_ids = _insert_haksik_menus(db, [name for _, name in plan['inserts']])
+
+    db.bulk_insert_mappings(CafeteriaMenu, [
+      {
+        'cafeteria_id': cafeteria_id,
+        'meal_id': meal_id,
+        'day_id': menu_date.weekday() + 1,
+        'menu_date': menu_date,
+        'menu_id': menu_id,
+      }
+      for ((cafeteria_id, meal_id, menu_date), _), menu_id in zip(plan['inserts'], menu_ids)
+    ])
+
+  if plan['deletes']:
+    cafeteria_menu_ids = [cafeteria_menu_id for cafeteria_menu_id, _ in plan['deletes']]
+    menu_ids = [menu_id for _, menu_id in plan['deletes']]
+    db.query(CafeteriaMenu).filter(CafeteriaMenu.id.in_(cafeteria_menu_ids)).delete(synchronize_session=False)
+    db.query(HaksikMenu).filter(HaksikMenu.id.in_(menu_ids)).delete(synchronize_session=False)
+
+  db.flush()
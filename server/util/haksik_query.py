@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import date, time, timedelta
+
+from sqlalchemy.orm import Session
+
+from server.models import CafeteriaMenu, HaksikMenu, MealType
+from server.util.time import get_skt_time
+
+
+DAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+MEAL_TYPES = ("breakfast", "lunch")
+
+# 이 시각 이전에는 조식, 이후에는 중식을 현재 식사로 판단
+BREAKFAST_END = time(10, 0)
+
+
+def today_kst() -> date:
+  return get_skt_time().date()
+
+
+# 해당 날짜가 속한 주의 월요일
+def week_start_of(day: date) -> date:
+  return day - timedelta(days=day.weekday())
+
+
+# 날짜에 해당하는 day_of_week id (MON = 1)
+def day_id_of(day: date) -> int:
+  return day.weekday() + 1
+
+
+# 현재 KST 시각 기준 식사 종류
+def current_meal_type(now_time: time) -> str:
+  return "breakfast" if now_time < BREAKFAST_END else "lunch"
+
+
+# 필요한 컬럼만 조회 (cafeteria_id, meal_type, day_id, menu_date, menu_name)
+def query_haksik_rows(db: Session, start: date = None, end: date = None, cafeteria_id: int = None, meal: str = None, template: bool = False):
+  query = db.query(
+    CafeteriaMenu.cafeteria_id,
+    MealType.type,
+    CafeteriaMenu.day_id,
+    CafeteriaMenu.menu_date,
+    HaksikMenu.name,
+  ).join(MealType, CafeteriaMenu.meal_id == MealType.id).join(HaksikMenu, CafeteriaMenu.menu_id == HaksikMenu.id)
+
+  if cafeteria_id is not None:
+    query = query.filter(CafeteriaMenu.cafeteria_id == cafeteria_id)
+
+  if meal is not None:
+    query = query.filter(MealType.type == meal)
+
+  if template:
+    # 날짜가 지정되지 않은 기본 주간 메뉴
+    query = query.filter(CafeteriaMenu.menu_date.is_(None))
+  elif start == end:
+    query = query.filter(CafeteriaMenu.menu_date == start)
+  else:
+    query = query.filter(CafeteriaMenu.menu_date >= start, CafeteriaMenu.menu_date <= end)
+
+  return query.order_by(CafeteriaMenu.id).all()
+
+
+# cafeteria -> meal -> day 구조로 학식 데이터를 그룹화
+def group_haksik_rows(rows):
+  haksik_data = defaultdict(lambda: {"menu": {"breakfast": defaultdict(list), "lunch": defaultdict(list)}})
+
+  for cafeteria_id, meal_type, day_id, menu_date, menu_name in rows:
+    day_name = DAY_NAMES[menu_date.weekday()] if menu_date else DAY_NAMES[day_id - 1]
+    haksik_data[int(cafeteria_id)]["menu"][meal_type][day_name].append(menu_name)
+
+  return dict(haksik_data)
+
+
+# 해당 주에 날짜가 지정된 메뉴가 등록된 식당 id
+def published_cafeteria_ids(db: Session, week_start: date, cafeteria_id: int = None):
+  query = db.query(CafeteriaMenu.cafeteria_id).distinct().filter(
+    CafeteriaMenu.menu_date >= week_start,
+    CafeteriaMenu.menu_date <= week_start + timedelta(days=6),
+  )
+
+  if cafeteria_id is not None:
+    query = query.filter(CafeteriaMenu.cafeteria_id == cafeteria_id)
+
+  return {row[0] for row in query.all()}
+
+
+# 날짜 범위의 메뉴 조회
+# 이번 주 메뉴가 아직 등록되지 않은 식당은 기본 주간 메뉴로 대체
+def load_haksik_rows(db: Session, start: date, end: date, cafeteria_id: int = None, meal: str = None):
+  rows = query_haksik_rows(db, start, end, cafeteria_id, meal)
+  week_start = week_start_of(start)
+
+  if week_start != week_start_of(today_kst()):
+    return rows
+
+  published = published_cafeteria_ids(db, week_start, cafeteria_id)
+  fallback = [
+    row for row in query_haksik_rows(db, cafeteria_id=cafeteria_id, meal=meal, template=True)
+    if row[0] not in published and (start != end or row[2] == day_id_of(start))
+  ]
+
+  return rows + fallback
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from server.util.json_body import encode_json
+from server.util.haksik_query import group_haksik_rows, load_haksik_rows, today_kst, week_start_of
+from server.util.ttl_cache import TTLCache
+
+
+# 다른 워커에서 수정된 학식이 반영될 수 있도록 스냅샷을 다시 만드는 최대 주기(초)
+SNAPSHOT_MAX_AGE = 600
+
+# 주 시작일 -> 직렬화된 스냅샷 (이번 주 하나만 유지)
+_snapshots = TTLCache(1)
+
+
+# 해당 주의 cafeteria -> meal -> day 구조 학식 데이터
+def build_haksik_data(db: Session, week_start):
+  rows = load_haksik_rows(db, week_start, week_start + timedelta(days=6))
+  return group_haksik_rows(rows)
+
+
+# 이번 주 스냅샷을 새로 만들어 메모리에 저장
+def rebuild_snapshot(db: Session) -> bytes:
+  week_start = week_start_of(today_kst())
+  body = encode_json({'success' : True, 'body' : build_haksik_data(db, week_start)})
+  _snapshots.set(week_start, body, SNAPSHOT_MAX_AGE)
+  return body
+
+
+# 메모리에 저장된 이번 주 스냅샷 반환 (없거나, 오래되었거나, 주가 바뀐 경우에만 DB 조회)
+def get_snapshot(db: Session) -> bytes:
+  body = _snapshots.get(week_start_of(today_kst()))
+  return body if body is not None else rebuild_snapshot(db)
+
+
+def invalidate_snapshot():
+  _snapshots.clear()
@@ -0,0 +1,64 @@
+# 한글 음절 분해 유틸
+# '스타벅스' -> 자모 'ㅅㅡㅌㅏㅂㅓㄱㅅㅡ', 초성 'ㅅㅌㅂㅅ'
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+             "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 입력 중인 글자도 비교할 수 있도록 겹모음/겹받침을 낱자로 분리
+COMPOUND_JAMO = {
+  "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+  "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+  "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+CONSONANTS = set(CHOSEONG) | {jong for jong in JONGSEONG if jong}
+
+
+def _is_syllable(char: str) -> bool:
+  return HANGUL_BASE <= ord(char) <= HANGUL_END
+
+
+# 검색 비교용 정규화 (공백 제거, 소문자)
+def normalize(text: str) -> str:
+  return "".join(text.split()).lower()
+
+
+# 자모 단위로 분해
+def decompose(text: str) -> str:
+  result = []
+
+  for char in normalize(text):
+    if _is_syllable(char):
+      index = ord(char) - HANGUL_BASE
+      cho, rest = divmod(index, 21 * 28)
+      jung, jong = divmod(rest, 28)
+      for jamo in (CHOSEONG[cho], JUNGSEONG[jung], JONGSEONG[jong]):
+        result.append(COMPOUND_JAMO.get(jamo, jamo))
+    else:
+      result.append(COMPOUND_JAMO.get(char, char))
+
+  return "".join(result)
+
+
+# 초성만 추출 (한글이 아닌 글자는 그대로 유지)
+def choseong(text: str) -> str:
+  result = []
+
+  for char in normalize(text):
+    if _is_syllable(char):
+      result.append(CHOSEONG[(ord(char) - HANGUL_BASE) // (21 * 28)])
+    else:
+      result.append(char)
+
+  return "".join(result)
+
+
+# 'ㅅㅌㅂ' 처럼 초성(자음)만으로 이루어진 검색어인지 확인
+def is_choseong_query(text: str) -> bool:
+  text = normalize(text)
+  return bool(text) and all(char in CONSONANTS for char in text)
@@ -0,0 +1,164 @@
+import math
+import os
+
+import httpx
+
+from server.util.config import INFO_BANK_URL, UNIVCERT_URL
+from server.util.circuit_breaker import CircuitBreaker, Bulkhead
+
+
+# 외부 API 호출 실패 (연결 실패, 타임아웃, 잘못된 응답)
+class UpstreamError(Exception):
+  def __init__(self, upstream: str, message: str):
+    super().__init__(f"{upstream}: {message}")
+    self.upstream = upstream
+    self.message = message
+
+
+# 서킷 브레이커가 열려 있거나 동시 요청 수가 가득 차서 요청을 보내지 않음 (retry_after초 후 다시 시도)
+class UpstreamUnavailable(UpstreamError):
+  def __init__(self, upstream: str, message: str, retry_after: float):
+    super().__init__(upstream, message)
+    self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+# 외부 API별 설정 (연결 풀 크기, 타임아웃, 동시 요청 수, 서킷 브레이커)
+# - max_wait : 동시 요청 수가 가득 찼을 때 기다리는 시간(초) (None이면 자리가 날 때까지 대기)
+# - breaker : 서킷 브레이커 설정 (None이면 사용하지 않음)
+UPSTREAMS = {
+  'infobank': {
+    'base_url': INFO_BANK_URL,
+    'timeout': httpx.Timeout(float(os.getenv('INFO_BANK_TIMEOUT', 5)), connect=2.0),
+    'max_connections': 20,
+    'max_concurrency': 20,
+    'max_wait': None,
+    'breaker': None,
+  },
+  'univcert': {
+    'base_url': UNIVCERT_URL,
+    'timeout': httpx.Timeout(float(os.getenv('UNIVCERT_TIMEOUT', 5)), connect=2.0),
+    'max_connections': 10,
+    'max_concurrency': 10,
+    'max_wait': 1.0,
+    'breaker': {'failure_threshold': 5, 'recovery_timeout': 30, 'half_open_max_calls': 1},
+  },
+}
+
+# 사용하지 않는 keep-alive 연결을 유지하는 시간(초)
+KEEPALIVE_EXPIRY = 30
+
+
+class UpstreamClient:
+  def __init__(self, name: str, base_url: str, timeout: httpx.Timeout, max_connections: int, max_concurrency: int,
+               max_wait: float = None, breaker: dict = None):
+    self.name = name
+    self.client = httpx.AsyncClient(
+      base_url=base_url or "",
+      timeout=timeout,
+      limits=httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+      ),
+    )
+    self.bulkhead = Bulkhead(max_concurrency, max_wait)
+    self.breaker = CircuitBreaker(name, **breaker) if breaker else None
+
+  # 요청 후 응답 반환
+  # 연결 실패, 타임아웃이면 UpstreamError / 서킷 브레이커가 열려 있거나 동시 요청 수가 가득 차면 UpstreamUnavailable
+  async def request(self, method: str, path: str, headers: dict = None, **kwargs) -> httpx.Response:
+    # 값이 없는 헤더(설정되지 않은 환경변수 등)는 제외
+    if headers:
+      kwargs['headers'] = {key: value for key, value in headers.items() if value is not None}
+
+    if self.breaker is not None and not self.breaker.allow():
+      raise UpstreamUnavailable(self.name, "서킷 브레이커 open", self.breaker.retry_after())
+
+    try:
+      acquired = await self.bulkhead.acquire()
+    except BaseException:
+      # 자리를 기다리다 취소되어도 half_open 확인 요청 자리를 돌려놓아야 브레이커가 계속 거절하지 않음
+      if self.breaker is not None:
+        self.breaker.record_cancel()
+      raise
+
+    if not acquired:
+      if self.breaker is not None:
+        self.breaker.record_cancel()
+      raise UpstreamUnavailable(self.name, "동시 요청 수 초과", 1)
+
+    try:
+      response = await self.client.request(method, path, **kwargs)
+    except httpx.TimeoutException:
+      self._record_failure("응답 시간 초과")
+      raise UpstreamError(self.name, "응답 시간 초과")
+    except httpx.HTTPError as e:
+      self._record_failure(f"요청 실패 ({e.__class__.__name__})")
+      raise UpstreamError(self.name, f"요청 실패 ({e.__class__.__name__})")
+    except BaseException:
+      # 요청이 취소된 경우 결과를 알 수 없으므로 실패로 기록하지 않음
+      if self.breaker is not None:
+        self.breaker.record_cancel()
+      raise
+    finally:
+      self.bulkhead.release()
+
+    # 5xx 응답은 외부 API 장애로 보고 실패로 기록
+    if response.status_code >= 500:
+      self._record_failure(f"HTTP {response.status_code}")
+    elif self.breaker is not None:
+      self.breaker.record_success()
+    return response
+
+  def _record_failure(self, error: str):
+    if self.breaker is not None:
+      self.breaker.record_failure(error)
+
+  # 응답 JSON 파싱 (잘못된 응답이면 UpstreamError)
+  def parse_json(self, response: httpx.Response) -> dict:
+    try:
+      return response.json()
+    except ValueError:
+      raise UpstreamError(self.name, f"잘못된 응답 (HTTP {response.status_code})")
+
+  # 요청 후 JSON 응답 반환
+  async def request_json(self, method: str, path: str, **kwargs) -> dict:
+    return self.parse_json(await self.request(method, path, **kwargs))
+
+  async def post_json(self, path: str, **kwargs) -> dict:
+    return await self.request_json("POST", path, **kwargs)
+
+  async def close(self):
+    await self.client.aclose()
+
+
+_clients = {}
+
+
+# 외부 API별로 하나의 클라이언트(연결 풀)를 공유
+def get_client(name: str) -> UpstreamClient:
+  client = _clients.get(name)
+  if client is None:
+    client = UpstreamClient(name, **UPSTREAMS[name])
+    _clients[name] = client
+  return client
+
+
+# 외부 API별 서킷 브레이커, 동시 요청 수 상태 (장애 확인용)
+def upstream_states() -> dict:
+  states = {}
+  for name in UPSTREAMS:
+    client = _clients.get(name)
+    states[name] = {
+      'breaker': client.breaker.snapshot() if client is not None and client.breaker is not None else None,
+      'bulkhead': client.bulkhead.snapshot() if client is not None else None,
+    }
+  return states
+
+
+# 서버 종료 시 호출
+async def close_clients():
+  clients = list(_clients.values())
+  _clients.clear()
+  for client in clients:
+    await client.close()
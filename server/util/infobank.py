@@ -0,0 +1,135 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from server.util.config import INFO_BANK_TEMPLATE_CODE, INFO_BANK_SENDER_KEY, INFO_BANK_IB_ID, INFO_BANK_IB_PW
+from server.util.http_client import UpstreamError, get_client
+
+
+# 만료 시각을 알 수 없는 토큰을 사용하는 시간(초)
+DEFAULT_TOKEN_TTL = 600
+# 만료 시각보다 이만큼 일찍 토큰을 만료된 것으로 처리(초)
+TOKEN_EXPIRY_MARGIN = 30
+# 만료 시각이 이만큼 남으면 요청은 기존 토큰으로 처리하고 백그라운드에서 새로 발급(초)
+TOKEN_REFRESH_MARGIN = 300
+
+
+# 토큰 응답의 만료 시각 ('expired') -> 남은 시간(초)
+def _token_ttl(expired) -> float:
+  if not expired:
+    return DEFAULT_TOKEN_TTL
+
+  for parse in (datetime.fromisoformat, lambda value: datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")):
+    try:
+      expires_at = parse(str(expired))
+      break
+    except ValueError:
+      continue
+  else:
+    return DEFAULT_TOKEN_TTL
+
+  if expires_at.tzinfo is None:
+    return DEFAULT_TOKEN_TTL
+  return expires_at.timestamp() - time.time()
+
+
+# 비즈고 토큰 발급 -> (schema, token, 남은 시간(초))
+async def fetch_token():
+  token_headers = {
+    'X-IB-Client-Id' : INFO_BANK_IB_ID,
+    'X-IB-Client-Passwd' : INFO_BANK_IB_PW,
+    'Accept' : 'application/json'
+  }
+
+  token_response = await get_client('infobank').post_json("/v1/auth/token", headers=token_headers)
+
+  if token_response.get('result') != 'Success':
+    raise UpstreamError('infobank', f"토큰 발급 실패 ({token_response.get('result')})")
+
+  data = token_response.get('data') or {}
+  return data.get('schema'), data.get('token'), _token_ttl(data.get('expired'))
+
+
+# 비즈고 토큰을 만료 직전까지 캐시하고, 동시에 들어온 요청들은 하나의 발급 요청을 공유
+class InfoBankTokenManager:
+  def __init__(self):
+    self._token = None  # (schema, token, 만료 시각, 미리 발급 시작 시각) (monotonic)
+    self._lock = asyncio.Lock()
+    self._refresh_task = None
+
+  def _is_valid(self, cached) -> bool:
+    return cached is not None and time.monotonic() < cached[2] - TOKEN_EXPIRY_MARGIN
+
+  async def get(self):
+    cached = self._token
+
+    if not self._is_valid(cached):
+      cached = await self._refresh(cached)
+    elif time.monotonic() >= cached[3]:
+      self._refresh_in_background(cached)
+
+    return cached[0], cached[1]
+
+  # seen: 호출한 쪽이 확인한 토큰 (기다리는 동안 다른 요청이 새로 발급받았으면 그대로 사용)
+  async def _refresh(self, seen):
+    async with self._lock:
+      if self._token is not seen and self._is_valid(self._token):
+        return self._token
+
+      schema, token, ttl = await fetch_token()
+      now = time.monotonic()
+      # 유효 시간이 짧은 토큰은 절반이 지나면 미리 발급
+      self._token = (schema, token, now + ttl, now + ttl - min(TOKEN_REFRESH_MARGIN, ttl / 2))
+      return self._token
+
+  def _refresh_in_background(self, seen):
+    if self._refresh_task is not None and not self._refresh_task.done():
+      return
+
+    async def refresh():
+      try:
+        await self._refresh(seen)
+      except UpstreamError as e:
+        print(f"비즈고 토큰 미리 발급 실패 - {e}")
+
+    self._refresh_task = asyncio.create_task(refresh())
+
+  # 거절된 토큰 무효화 (그 사이 새로 발급받은 토큰은 유지)
+  def invalidate(self, token: str):
+    if self._token is not None and self._token[1] == token:
+      self._token = None
+
+
+token_manager = InfoBankTokenManager()
+
+
+# 카카오 비즈메세지 알림톡 전송 (토큰이 거절되면 새로 발급받아 한 번 더 시도)
+async def send_alimtalk(to: str, text: str) -> dict:
+  # 카카오 비즈메세지 알림톡 요청 바디
+  alim_payload = json.dumps({
+    "senderKey" : INFO_BANK_SENDER_KEY,
+    "msgType" : "AT",
+    "to" : to,
+    "templateCode" : INFO_BANK_TEMPLATE_CODE,
+    "text" : text,
+  })
+
+  client = get_client('infobank')
+  for _ in range(2):
+    schema, token = await token_manager.get()
+
+    # 카카오 비즈메세지 알림톡 요청 헤더
+    alim_headers = {
+      "Authorization" : f"{schema} {token}",
+      "Content-Type" : "application/json",
+      "Accept" : "application/json"
+    }
+
+    response = await client.request("POST", "/v1/send/alimtalk", headers=alim_headers, content=alim_payload)
+    if response.status_code != 401:
+      return client.parse_json(response)
+
+    token_manager.invalidate(token)
+
+  raise UpstreamError('infobank', "토큰 인증 실패")
@@ -0,0 +1,12 @@
+import json
+
+
+# JSONResponse와 동일한 방식으로 직렬화
+def encode_json(content) -> bytes:
+  return json.dumps(
+    content,
+    ensure_ascii=False,
+    allow_nan=False,
+    indent=None,
+    separators=(",", ":"),
+  ).encode("utf-8")
@@ -0,0 +1,148 @@
+import os
+import threading
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+try:
+  import fcntl
+except ImportError:  # Windows 등 fcntl이 없는 환경
+  fcntl = None
+
+
+# 여러 워커 중 하나만 백그라운드 작업을 실행하도록 잡는 잠금 이름
+LEADER_LOCK_NAME = os.getenv('LEADER_LOCK_NAME', 'haksikmoji_background_jobs')
+# MySQL이 아닌 환경(로컬/SQLite)에서 사용하는 잠금 파일
+LEADER_LOCK_FILE = os.getenv('LEADER_LOCK_FILE', '/tmp/haksikmoji_background_jobs.lock')
+
+# 리더가 아닌 워커가 잠금을 다시 시도하는 주기(초)
+RETRY_INTERVAL = 10
+# 리더가 잠금을 아직 가지고 있는지 확인하는 주기(초)
+PING_INTERVAL = 10
+# 리더를 잃었을 때 실행 중인 작업이 끝나기를 기다리는 최대 시간(초)
+JOB_STOP_TIMEOUT = 30
+
+
+# MySQL GET_LOCK 기반 잠금 (잠금을 잡은 커넥션이 끊기면 서버가 자동으로 해제)
+class MySQLLeaderLock:
+  def __init__(self, engine: Engine, name: str = LEADER_LOCK_NAME):
+    self.engine = engine
+    self.name = name
+    self.connection = None
+
+  def acquire(self) -> bool:
+    try:
+      self.connection = self.engine.connect()
+      acquired = self.connection.execute(text("SELECT GET_LOCK(:name, 0)"), {'name': self.name}).scalar()
+    except Exception as e:
+      print(f"리더 잠금 획득 중 오류 발생 : {e}")
+      self._close()
+      return False
+
+    if acquired != 1:
+      self._close()
+      return False
+    return True
+
+  def is_held(self) -> bool:
+    try:
+      return self.connection.execute(
+        text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {'name': self.name}
+      ).scalar() == 1
+    except Exception as e:
+      print(f"리더 잠금 확인 중 오류 발생 : {e}")
+      return False
+
+  def release(self):
+    try:
+      self.connection.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': self.name})
+    except Exception:
+      pass
+    self._close()
+
+  def _close(self):
+    if self.connection is None:
+      return
+    try:
+      # 잠금 상태가 남은 커넥션이 풀에 반환되지 않도록 폐기
+      self.connection.invalidate()
+      self.connection.close()
+    except Exception:
+      pass
+    self.connection = None
+
+
+# 파일 잠금 기반 잠금 (같은 서버의 워커들 사이에서만 유효, 프로세스가 죽으면 OS가 해제)
+class FileLeaderLock:
+  def __init__(self, path: str = LEADER_LOCK_FILE):
+    self.path = path
+    self.file = None
+
+  def acquire(self) -> bool:
+    if fcntl is None:
+      # 파일 잠금을 쓸 수 없는 환경은 단일 프로세스 실행으로 보고 항상 리더
+      return True
+
+    lock_file = open(self.path, 'a')
+    try:
+      fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+      lock_file.close()
+      return False
+
+    self.file = lock_file
+    return True
+
+  def is_held(self) -> bool:
+    return fcntl is None or self.file is not None
+
+  def release(self):
+    if self.file is None:
+      return
+    try:
+      fcntl.flock(self.file, fcntl.LOCK_UN)
+    finally:
+      self.file.close()
+      self.file = None
+
+
+def create_leader_lock(engine: Engine):
+  if engine.dialect.name in ('mysql', 'mariadb'):
+    return MySQLLeaderLock(engine)
+  return FileLeaderLock()
+
+
+# 리더로 선출된 워커에서만 start_job(job_stop_event)을 실행
+# 리더를 잃으면 stop_job(job_stop_event)으로 작업을 멈추고, 리더가 아닌 워커는 주기적으로 다시 시도 (리더 장애 시 승계)
+def run_as_leader(engine: Engine, start_job, stop_job, stop_event: threading.Event):
+  while not stop_event.is_set():
+    lock = create_leader_lock(engine)
+    if not lock.acquire():
+      stop_event.wait(RETRY_INTERVAL)
+      continue
+
+    print(f"백그라운드 작업 리더로 선출 (pid {os.getpid()})")
+    job_stop_event = threading.Event()
+    job_thread = threading.Thread(target=start_job, args=(job_stop_event,), daemon=True)
+    job_thread.start()
+
+    try:
+      while not stop_event.wait(PING_INTERVAL):
+        if not lock.is_held():
+          print(f"백그라운드 작업 리더 잠금을 잃음 (pid {os.getpid()})")
+          break
+        if not job_thread.is_alive():
+          # 작업이 비정상 종료되면 잠금을 내려놓아 다른 워커가 이어받도록 함
+          print(f"백그라운드 작업이 종료됨 (pid {os.getpid()})")
+          break
+    finally:
+      stop_job(job_stop_event)
+      job_thread.join(JOB_STOP_TIMEOUT)
+      # 이전 작업이 끝나기 전에는 잠금을 내려놓지 않아 새 작업이 함께 실행되지 않도록 함 (서버 종료 시에는 기다리지 않음)
+      while job_thread.is_alive() and not stop_event.is_set():
+        print(f"백그라운드 작업 종료 대기 중 (pid {os.getpid()})")
+        job_thread.join(JOB_STOP_TIMEOUT)
+      lock.release()
+
+    if not stop_event.is_set():
+      stop_event.wait(RETRY_INTERVAL)
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from server.db import SessionLocal
+from server.models import MessageOutbox
+from server.util import infobank
+from server.util.http_client import UpstreamError
+from server.util.time import get_skt_time
+
+
+# 한 번에 가져와서 전송할 메세지 수
+BATCH_SIZE = 50
+# 보낼 메세지가 없을 때 다시 확인하는 주기(초) (같은 워커에서 추가된 메세지는 바로 깨움)
+POLL_INTERVAL = 2
+# 최대 전송 시도 횟수 (넘으면 failed)
+MAX_ATTEMPTS = 6
+# 재시도 대기 시간 = BACKOFF_BASE * 2^(시도 횟수 - 1) (최대 BACKOFF_MAX)
+BACKOFF_BASE = 5
+BACKOFF_MAX = 600
+# 가져간 뒤 이 시간(초) 동안 결과가 기록되지 않은 메세지는 (워커 종료 등) 시도 횟수를 늘려 다시 전송 대기로 되돌림
+STALE_CLAIM_SECONDS = 300
+# 전송 완료/실패한 메세지를 보관하는 기간(일)과 오래된 메세지를 삭제하는 주기(초)
+RETENTION_DAYS = 7
+PURGE_INTERVAL = 60 * 60
+
+
+# 초당 전송 수 제한 (토큰 버킷)
+class RateLimiter:
+  def __init__(self, rate: float, burst: int):
+    self.rate = rate
+    self.burst = burst
+    self._tokens = float(burst)
+    self._updated_at = time.monotonic()
+    self._lock = asyncio.Lock()
+
+  async def acquire(self):
+    async with self._lock:
+      while True:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        if self._tokens >= 1:
+          self._tokens -= 1
+          return
+        await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def _send_alimtalk(recipient: str, payload: dict):
+  response = await infobank.send_alimtalk(recipient, payload['text'])
+  if response.get('result') != 'Success':
+    raise UpstreamError('infobank', f"알림톡 전송 실패 ({response.get('result')})")
+
+
+# 채널별 전송 함수와 워커당 초당 전송 수 제한
+INFO_BANK_RATE_LIMIT = float(os.getenv('INFO_BANK_RATE_LIMIT', 20))
+
+CHANNELS = {
+  'alimtalk': {'send': _send_alimtalk, 'limiter': RateLimiter(INFO_BANK_RATE_LIMIT, burst=max(1, int(INFO_BANK_RATE_LIMIT)))},
+}
+
+_wakeup = None
+_stop = None
+_task = None
+
+
+# 보낼 메세지 추가 (커밋은 호출한 쪽에서 처리, 커밋 후 notify_dispatcher 호출)
+def enqueue_message(db: Session, channel: str, recipient: str, payload: dict) -> MessageOutbox:
+  if channel not in CHANNELS:
+    raise ValueError(f"지원하지 않는 채널 : {channel}")
+
+  message = MessageOutbox(
+    channel=channel,
+    recipient=recipient,
+    payload=json.dumps(payload, ensure_ascii=False),
+    status='pending',
+    attempts=0,
+    next_attempt_at=get_skt_time(),
+    created_at=get_skt_time(),
+  )
+  db.add(message)
+  return message
+
+
+# 같은 워커의 dispatcher를 바로 깨움
+def notify_dispatcher():
+  if _wakeup is not None:
+    _wakeup.set()
+
+
+# 전송할 메세지를 가져감 (다른 워커와 겹치지 않도록 claim_token 조건부 UPDATE)
+def claim_messages(limit: int = BATCH_SIZE):
+  db = SessionLocal()
+  try:
+    now = get_skt_time()
+
+    # 오래전에 가져갔지만 결과가 기록되지 않은 메세지를 다시 전송 대기로 되돌림
+    # 전송 중 워커를 계속 죽이는 메세지가 무한히 재시도되지 않도록 한 번의 시도로 계산
+    stale = db.query(MessageOutbox).filter(
+      MessageOutbox.status == 'sending',
+      MessageOutbox.claimed_at < now - timedelta(seconds=STALE_CLAIM_SECONDS),
+    )
+    stale.filter(MessageOutbox.attempts + 1 >= MAX_ATTEMPTS).update({
+      MessageOutbox.status: 'failed',
+      MessageOutbox.attempts: MessageOutbox.attempts + 1,
+      MessageOutbox.payload: '',
+      MessageOutbox.claim_token: None,
+      MessageOutbox.last_error: '전송 결과가 기록되지 않음',
+    }, synchronize_session=False)
+    stale.update({
+      MessageOutbox.status: 'pending',
+      MessageOutbox.attempts: MessageOutbox.attempts + 1,
+      MessageOutbox.claim_token: None,
+    }, synchronize_session=False)
+
+    ids = [row[0] for row in db.query(MessageOutbox.id).filter(
+      MessageOutbox.status == 'pending',
+      MessageOutbox.next_attempt_at <= now,
+    ).order_by(MessageOutbox.next_attempt_at, MessageOutbox.id).limit(limit).all()]
+
+    if not ids:
+      db.commit()
+      return []
+
+    # 그 사이 다른 워커가 가져간 메세지는 status 조건에서 제외됨
+    claim_token = uuid.uuid4().hex
+    db.query(MessageOutbox).filter(
+      MessageOutbox.id.in_(ids),
+      MessageOutbox.status == 'pending',
+    ).update({
+      MessageOutbox.status: 'sending',
+      MessageOutbox.claim_token: claim_token,
+      MessageOutbox.claimed_at: now,
+    }, synchronize_session=False)
+    db.commit()
+
+    return db.query(
+      MessageOutbox.id,
+      MessageOutbox.channel,
+      MessageOutbox.recipient,
+      MessageOutbox.payload,
+      MessageOutbox.attempts,
+      MessageOutbox.claim_token,
+    ).filter(MessageOutbox.claim_token == claim_token).all()
+  except Exception:
+    db.rollback()
+    raise
+  finally:
+    db.close()
+
+
+def _backoff_seconds(attempts: int) -> float:
+  delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+  return delay * random.uniform(0.8, 1.2)
+
+
+# 전송 결과 기록 (results : [(id, claim_token, 시도 횟수, 오류 메세지 또는 None)])
+# 전송 완료/실패한 메세지는 인증번호 등이 남지 않도록 payload를 비움
+def finish_messages(results):
+  db = SessionLocal()
+  try:
+    now = get_skt_time()
+
+    for message_id, claim_token, attempts, error in results:
+      if error is None:
+        values = {MessageOutbox.status: 'sent', MessageOutbox.sent_at: now, MessageOutbox.last_error: None, MessageOutbox.payload: ''}
+      elif attempts >= MAX_ATTEMPTS:
+        values = {MessageOutbox.status: 'failed', MessageOutbox.last_error: error[:500], MessageOutbox.payload: ''}
+      else:
+        values = {
+          MessageOutbox.status: 'pending',
+          MessageOutbox.next_attempt_at: now + timedelta(seconds=_backoff_seconds(attempts)),
+          MessageOutbox.last_error: error[:500],
+        }
+      values.update({MessageOutbox.attempts: attempts, MessageOutbox.claim_token: None})
+
+      # 다시 전송 대기로 되돌려져 다른 워커가 가져간 메세지는 덮어쓰지 않음
+      db.query(MessageOutbox).filter(
+        MessageOutbox.id == message_id,
+        MessageOutbox.claim_token == claim_token,
+      ).update(values, synchronize_session=False)
+
+    db.commit()
+  except Exception:
+    db.rollback()
+    raise
+  finally:
+    db.close()
+
+
+# 보관 기간이 지난 전송 완료/실패 메세지 삭제
+def purge_messages():
+  db = SessionLocal()
+  try:
+    deleted = db.query(MessageOutbox).filter(
+      MessageOutbox.status.in_(('sent', 'failed')),
+      MessageOutbox.created_at < get_skt_time() - timedelta(days=RETENTION_DAYS),
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+  except Exception:
+    db.rollback()
+    raise
+  finally:
+    db.close()
+
+
+async def _deliver(message):
+  message_id, channel, recipient, payload, attempts, claim_token = message
+  attempts += 1
+
+  try:
+    handler = CHANNELS[channel]
+    await handler['limiter'].acquire()
+    await handler['send'](recipient, json.loads(payload))
+    return message_id, claim_token, attempts, None
+  except Exception as e:
+    print(f"메세지 전송 실패 - {message_id} ({attempts}회) : {e}")
+    return message_id, claim_token, attempts, str(e) or e.__class__.__name__
+
+
+# 전송할 메세지를 묶음으로 가져와서 보내고, 없으면 POLL_INTERVAL마다 다시 확인 (PURGE_INTERVAL마다 오래된 메세지 삭제)
+async def run_dispatcher():
+  next_purge = 0
+
+  while not _stop.is_set():
+    _wakeup.clear()
+
+    if time.monotonic() >= next_purge:
+      next_purge = time.monotonic() + PURGE_INTERVAL
+      try:
+        await asyncio.to_thread(purge_messages)
+      except Exception as e:
+        print(f"오래된 메세지 삭제 중 오류 발생 - {get_skt_time()} : {e}")
+
+    try:
+      messages = await asyncio.to_thread(claim_messages, BATCH_SIZE)
+      if messages:
+        results = await asyncio.gather(*(_deliver(message) for message in messages))
+        await asyncio.to_thread(finish_messages, results)
+    except Exception as e:
+      print(f"메세지 dispatcher 오류 발생 - {get_skt_time()} : {e}")
+      messages = []
+
+    # 가득 찬 묶음을 가져왔으면 남은 메세지가 있을 수 있으므로 바로 다시 확인
+    if len(messages) < BATCH_SIZE:
+      try:
+        await asyncio.wait_for(_wakeup.wait(), timeout=POLL_INTERVAL)
+      except asyncio.TimeoutError:
+        pass
+
+
+# 서버 시작 시 호출 (워커마다 하나씩 실행)
+def start_dispatcher():
+  global _wakeup, _stop, _task
+
+  _wakeup = asyncio.Event()
+  _stop = asyncio.Event()
+  _task = asyncio.create_task(run_dispatcher())
+
+
+# 서버 종료 시 호출 (전송 중인 묶음의 결과 기록까지 기다림)
+async def stop_dispatcher():
+  if _task is None:
+    return
+
+  _stop.set()
+  _wakeup.set()
+  await _task
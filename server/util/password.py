@@ -0,0 +1,96 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+from server.util.custom_exception import CustomHTTPException
+
+
+# 비밀번호 해싱
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# bcrypt 연산을 처리하는 프로세스 수와 대기할 수 있는 최대 요청 수
+PASSWORD_WORKERS = int(os.getenv('PASSWORD_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_MAX_PENDING = int(os.getenv('PASSWORD_MAX_PENDING', PASSWORD_WORKERS * 16))
+
+_lock = threading.Lock()
+_pool = None
+_pending = 0
+
+
+# 프로세스 풀에서 실행되는 함수들 (pickle 가능하도록 모듈 최상위에 정의)
+def _verify(plain_password: str, hashed_password: str) -> bool:
+  return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(plain_password: str) -> str:
+  return pwd_context.hash(plain_password)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+  global _pool
+
+  with _lock:
+    if _pool is None:
+      # 스케쥴러/리더 스레드와 HTTP 클라이언트가 이미 떠 있는 프로세스를 fork하지 않도록 forkserver로 생성
+      _pool = ProcessPoolExecutor(max_workers=PASSWORD_WORKERS, mp_context=multiprocessing.get_context('forkserver'))
+    return _pool
+
+
+# 자식 프로세스가 죽어서 깨진 풀 제거 (다음 요청에서 새로 생성, 그 사이 다른 요청이 새로 만든 풀은 유지)
+def _drop_pool(pool: ProcessPoolExecutor):
+  global _pool
+
+  with _lock:
+    if _pool is not pool:
+      return
+    _pool = None
+
+  pool.shutdown(wait=False, cancel_futures=True)
+
+
+# 이벤트 루프를 막지 않도록 프로세스 풀에서 실행 (대기 중인 요청이 너무 많으면 503)
+async def _run(func, *args):
+  global _pending
+
+  with _lock:
+    if _pending >= PASSWORD_MAX_PENDING:
+      raise CustomHTTPException(status_code=503, message="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+    _pending += 1
+
+  try:
+    # 풀이 깨졌으면 새 풀로 한 번 더 시도
+    for retry in (True, False):
+      pool = _get_pool()
+      try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+      except BrokenProcessPool:
+        _drop_pool(pool)
+        if not retry:
+          raise
+  finally:
+    with _lock:
+      _pending -= 1
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+  return await _run(_verify, plain_password, hashed_password)
+
+
+async def hash_password(plain_password: str) -> str:
+  return await _run(_hash, plain_password)
+
+
+# 서버 종료 시 호출
+def shutdown_password_pool():
+  global _pool
+
+  with _lock:
+    pool, _pool = _pool, None
+
+  if pool is not None:
+    pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,78 @@
+import time
+from typing import NamedTuple, Optional
+
+import jwt
+from sqlalchemy.orm import Session
+
+from server.models import User
+from server.util.ttl_cache import TTLCache
+
+
+# 캐시한 유저 정보를 다시 조회하는 최대 주기(초) (다른 워커에서 변경된 정보 반영용)
+PRINCIPAL_TTL = 60
+PRINCIPAL_MAX_SIZE = 10000
+
+# 검증이 끝난 토큰을 다시 검증하지 않는 최대 시간(초) (토큰 만료 시각이 더 이르면 만료 시각까지)
+TOKEN_TTL = 300
+TOKEN_MAX_SIZE = 10000
+
+
+# 인증된 요청에서 사용하는 유저 정보 (verify_jwt_token의 반환값)
+class Principal(NamedTuple):
+  uid: int
+  user_id: str
+  name: str
+  std_id: Optional[str]
+  email: str
+  role: int
+  store_id: Optional[int]
+  school_id: Optional[int]
+  is_school_selected: Optional[int]
+  is_school_verified: bool
+
+
+_principals = TTLCache(PRINCIPAL_MAX_SIZE)
+_tokens = TTLCache(TOKEN_MAX_SIZE)
+
+
+# 토큰 서명/만료 검증 후 payload 반환 (검증된 토큰은 캐시)
+# 실패하면 jwt.ExpiredSignatureError / jwt.InvalidTokenError 발생
+def decode_token(token: str, secret_key: str, algorithm: str) -> dict:
+  payload = _tokens.get(token)
+
+  if payload is None:
+    payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+
+    ttl = TOKEN_TTL
+    if payload.get('exp') is not None:
+      ttl = min(ttl, payload['exp'] - time.time())
+    if ttl > 0:
+      _tokens.set(token, payload, ttl)
+  elif payload.get('exp') is not None and payload['exp'] <= time.time():
+    _tokens.pop(token)
+    raise jwt.ExpiredSignatureError("Signature has expired")
+
+  return payload
+
+
+# uid에 해당하는 유저 정보 반환 (없는 유저면 None)
+def load_principal(db: Session, uid: int) -> Optional[Principal]:
+  principal = _principals.get(uid)
+  if principal is not None:
+    return principal
+
+  row = db.query(*(getattr(User, field) for field in Principal._fields)).filter(User.uid == uid).first()
+  if row is None:
+    return None
+
+  principal = Principal(*row)
+  _principals.set(uid, principal, PRINCIPAL_TTL)
+  return principal
+
+
+# 유저 정보가 바뀌거나 삭제되면 호출 (비밀번호 변경, 탈퇴, 이메일/학교/권한/매장 변경)
+def invalidate_principal(uid: int = None):
+  if uid is None:
+    _principals.clear()
+  else:
+    _principals.pop(uid)
@@ -0,0 +1,106 @@
+from bisect import bisect_right
+
+from sqlalchemy.orm import Session, joinedload
+
+from server.models import School, Store
+from server.schemas import StoreListSchema
+from server.util.json_body import encode_json
+from server.util.store_schedule import status_lookup
+from server.util.store_status import STORE_STATUSES
+from server.util.ttl_cache import TTLCache
+
+
+# 목록 API에서 사용하는 카테고리 그룹 (category.id 기준)
+CATEGORY_GROUPS = {
+  'food': (1,),                   # 음식점
+  'cafe': (2,),                   # 카페
+  'convenience': (3,),            # 편의점
+  'facilities': (4, 5, 6, 7, 8),  # 편의시설
+}
+
+# 다른 워커에서 수정된 매장 정보가 반영될 수 있도록 카탈로그를 다시 만드는 최대 주기(초)
+CATALOG_MAX_AGE = 600
+# 카탈로그를 유지하는 최대 학교 수
+CATALOG_MAX_SCHOOLS = 100
+
+# school_id -> {'all' / 'food' / ... / category.id: ([sid, ...], [{상태: bytes}, ...])}
+_catalogs = TTLCache(CATALOG_MAX_SCHOOLS)
+
+
+# 매장 목록 응답에 들어가는 형태로 변환
+def store_list_entry(store: Store) -> dict:
+  return StoreListSchema(
+    sid=store.sid,
+    store_name=store.store_name,
+    store_number=store.store_number,
+    store_location=store.store_location,
+    is_open=store.is_open,
+    store_thumb_url=store.store_thumb_url,
+    store_banner_url=store.store_banner_url,
+    category=store.category,
+  ).model_dump(mode='json')
+
+
+# 학교의 매장들을 한 번에 조회하여 카테고리 그룹별 목록을 생성
+# 매장 상태는 요청 시점에 계산되므로 매장마다 상태별로 미리 직렬화해 둠
+def build_catalog(db: Session, school_id: int):
+  stores = db.query(Store).options(joinedload(Store.category)).filter(
+    Store.school_id == school_id
+  ).order_by(Store.sid).all()
+
+  entries = []
+  for store in stores:
+    entry = store_list_entry(store)
+    variants = {status: encode_json({**entry, 'is_open': status}) for status in STORE_STATUSES}
+    entries.append((store.category_id, store.sid, variants))
+
+  # 카테고리 그룹 이름과 카테고리 id 모두로 조회할 수 있도록 구성 (sid 순서)
+  keys = {'all': lambda category_id: True}
+  for group, category_ids in CATEGORY_GROUPS.items():
+    keys[group] = lambda category_id, category_ids=category_ids: category_id in category_ids
+  for category_id in {category_id for category_id, _, _ in entries}:
+    keys[category_id] = lambda value, category_id=category_id: value == category_id
+
+  groups = {}
+  for key, matches in keys.items():
+    items = [(sid, variants) for category_id, sid, variants in entries if matches(category_id)]
+    groups[key] = ([sid for sid, _ in items], [variants for _, variants in items])
+
+  _catalogs.set(school_id, groups, CATALOG_MAX_AGE)
+  return groups
+
+
+# 카테고리 그룹('all', 'food', 'cafe', 'convenience', 'facilities' 또는 카테고리 id)의 직렬화된 매장 목록 한 페이지 반환
+# sid가 after보다 큰 매장을 limit개까지 담고, 다음 페이지가 있으면 마지막 sid를 다음 커서로 함께 반환
+def get_catalog_page(db: Session, school_id: int, group='all', after: int = None, limit: int = None):
+  groups = _catalogs.get(school_id)
+
+  if groups is None:
+    # 요청으로 받은 school_id마다 카탈로그가 쌓이지 않도록 등록된 학교만 생성
+    if db.query(School.id).filter(School.id == school_id).first() is None:
+      return b"[]", None
+    groups = build_catalog(db, school_id)
+
+  sids, variants = groups.get(group, ([], []))
+  start = bisect_right(sids, after) if after is not None else 0
+  end = len(sids) if limit is None else min(start + limit, len(sids))
+  next_cursor = sids[end - 1] if end < len(sids) else None
+
+  status_of = status_lookup(db)
+  body = b"[" + b",".join(variants[index][status_of(sids[index])] for index in range(start, end)) + b"]"
+  return body, next_cursor
+
+
+# 이미 만들어진 카탈로그를 다시 생성 (school_id가 없으면 전체 학교)
+def refresh_catalog(db: Session, school_id: int = None):
+  school_ids = [school_id] if school_id is not None else _catalogs.keys()
+
+  for target in school_ids:
+    build_catalog(db, target)
+
+
+def invalidate_catalog(school_id: int = None):
+  if school_id is None:
+    _catalogs.clear()
+  else:
+    _catalogs.pop(school_id)
@@ -0,0 +1,115 @@
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from server.models import Store, StoreHours, MenuCategory, Menu
+from server.schemas import StoreDetailSchema, StoreCategorySchema
+from server.util.json_body import encode_json
+from server.util.store_schedule import status_lookup
+from server.util.store_status import STORE_STATUSES
+from server.util.ttl_cache import TTLCache
+
+
+# 다른 워커에서 수정된 매장 정보가 반영될 수 있도록 상세 정보를 다시 만드는 최대 주기(초)
+DETAIL_MAX_AGE = 600
+DETAIL_MAX_SIZE = 10000
+
+# store_id -> {상태: bytes}
+_details = TTLCache(DETAIL_MAX_SIZE)
+
+
+def _format_time(value):
+  return value.strftime('%H:%M') if value else None
+
+
+# 매장 상세 정보를 정해진 수의 쿼리로 한 번에 조회
+# (매장+카테고리 / 운영시간+요일 / 메뉴 카테고리 / 메뉴 / 메뉴 옵션 / 공지사항)
+def load_store(db: Session, store_id: int):
+  return db.query(Store).options(
+    joinedload(Store.category),
+    selectinload(Store.store_hours).joinedload(StoreHours.day_of_week),
+    selectinload(Store.menu_categories).selectinload(MenuCategory.menus).selectinload(Menu.options),
+    selectinload(Store.store_notice),
+  ).filter(Store.sid == store_id).first()
+
+
+# 매장 상세 응답 형태로 변환
+def build_store_detail(store: Store) -> dict:
+  store_hours_dict = {}
+  for store_hour in store.store_hours:
+    store_hours_dict[store_hour.day_of_week.name] = {
+      'running_time' : {
+        'opening_time' : _format_time(store_hour.opening_time),
+        'closing_time' : _format_time(store_hour.closing_time),
+      },
+      'break_time' : {
+        'break_start_time' : _format_time(store_hour.break_start_time),
+        'break_exit_time' : _format_time(store_hour.break_exit_time),
+      }
+    }
+
+  categories = []
+  for category in store.menu_categories:
+    menus = []
+    for menu in category.menus:
+      menus.append({
+        'menu_name': menu.menu_name,
+        'menu_image_url': menu.menu_image_url,
+        'options': [{'option_name': option.option_name, 'price': option.price} for option in menu.options],
+      })
+
+    categories.append({
+      'category_name': category.category_name,
+      'menus': menus
+    })
+
+  sorted_notices = sorted(store.store_notice, key=lambda notice: (notice.is_pinned, notice.created_at), reverse=True)
+
+  result_store = {
+    'sid': store.sid,
+    'store_name': store.store_name,
+    'store_number': store.store_number,
+    'store_location': store.store_location,
+    'is_open': store.is_open,
+    'store_thumb_url': store.store_thumb_url,
+    'store_banner_url': store.store_banner_url,
+    'category': StoreCategorySchema.model_validate(store.category),
+    'store_hours': store_hours_dict,
+    'store_notice': [
+      {
+        'id': notice.id,
+        'title': notice.title,
+        'content': notice.content,
+        'is_pinned': notice.is_pinned,
+        'created_at': notice.created_at,
+        'updated_at': notice.updated_at,
+      }
+      for notice in sorted_notices
+    ],
+    'menu': categories
+  }
+
+  return StoreDetailSchema(**result_store).model_dump(mode='json')
+
+
+# 요청 시점의 매장 상태가 반영된 직렬화된 매장 상세 정보 반환 (없는 매장이면 None)
+def get_store_detail_body(db: Session, store_id: int):
+  bodies = _details.get_or_build(store_id, lambda: _build_bodies(db, store_id), DETAIL_MAX_AGE)
+  if bodies is None:
+    return None
+
+  return bodies[status_lookup(db)(store_id)]
+
+
+def _build_bodies(db: Session, store_id: int):
+  store = load_store(db, store_id)
+  if store is None:
+    return None
+
+  detail = build_store_detail(store)
+  return {status: encode_json({**detail, 'is_open': status}) for status in STORE_STATUSES}
+
+
+def invalidate_store_detail(store_id: int = None):
+  if store_id is None:
+    _details.clear()
+  else:
+    _details.pop(store_id)
@@ -0,0 +1,220 @@
+import threading
+from collections import defaultdict
+
+from sqlalchemy.orm import Session, joinedload
+
+from server.models import School, Store, Menu, MenuOption
+from server.util.store_catalog import store_list_entry
+from server.util.store_schedule import apply_current_status
+from server.util import hangul
+from server.util.ttl_cache import TTLCache
+
+
+# 다른 워커에서 수정된 매장/메뉴가 반영될 수 있도록 색인을 다시 만드는 최대 주기(초)
+INDEX_MAX_AGE = 600
+# 색인을 유지하는 최대 학교 수
+INDEX_MAX_SCHOOLS = 100
+
+# 필드별 가중치 (매장명 > 카테고리 > 메뉴명 > 메뉴 옵션명)
+FIELD_WEIGHTS = {'store_name': 4.0, 'category': 3.0, 'menu': 2.0, 'option': 1.0}
+
+_lock = threading.Lock()
+# school_id -> StoreFullTextIndex
+_indexes = TTLCache(INDEX_MAX_SCHOOLS)
+
+
+# 검색어 비교용 n-gram (한 글자는 unigram, 두 글자 이상은 bigram)
+def ngrams(text: str):
+  if len(text) < 2:
+    return {text} if text else set()
+  return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class StoreFullTextIndex:
+  def __init__(self, school_id: int):
+    self.school_id = school_id
+    self.entries = {}                # sid -> 매장 목록 응답 dict
+    self.documents = {}              # doc_id -> (sid, field, 정규화된 텍스트, 메뉴명)
+    self.store_documents = {}        # sid -> [doc_id, ...]
+    self.postings = defaultdict(set) # n-gram -> {doc_id, ...}
+    self._next_doc_id = 0
+
+  def _add_document(self, sid: int, field: str, text: str, menu_name: str = None):
+    normalized = hangul.normalize(text or "")
+    if not normalized:
+      return
+
+    doc_id = self._next_doc_id
+    self._next_doc_id += 1
+
+    self.documents[doc_id] = (sid, field, normalized, menu_name)
+    self.store_documents.setdefault(sid, []).append(doc_id)
+
+    grams = ngrams(normalized)
+    if len(normalized) >= 2:
+      grams |= set(normalized)  # 한 글자 검색용 unigram
+    for gram in grams:
+      self.postings[gram].add(doc_id)
+
+  def remove_store(self, sid: int):
+    self.entries.pop(sid, None)
+    for doc_id in self.store_documents.pop(sid, []):
+      _, _, normalized, _ = self.documents.pop(doc_id)
+      for gram in ngrams(normalized) | set(normalized):
+        postings = self.postings.get(gram)
+        if postings is not None:
+          postings.discard(doc_id)
+          if not postings:
+            del self.postings[gram]
+
+  def set_store(self, store: Store, menus, options):
+    self.remove_store(store.sid)
+    self.entries[store.sid] = store_list_entry(store)
+
+    self._add_document(store.sid, 'store_name', store.store_name)
+    if store.category:
+      self._add_document(store.sid, 'category', store.category.main_category)
+      self._add_document(store.sid, 'category', store.category.sub_category)
+    for menu_name in menus:
+      self._add_document(store.sid, 'menu', menu_name, menu_name)
+    for menu_name, option_name in options:
+      self._add_document(store.sid, 'option', option_name, menu_name)
+
+  # 검색어 한 단어에 대해 매장별 (점수, 매칭된 메뉴) 계산
+  def _match_word(self, word: str):
+    grams = ngrams(word)
+    postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+    if not postings or not postings[0]:
+      return {}
+
+    candidates = set(postings[0])
+    for posting in postings[1:]:
+      candidates &= posting
+      if not candidates:
+        return {}
+
+    matches = {}
+    for doc_id in candidates:
+      sid, field, text, menu_name = self.documents[doc_id]
+      if word not in text:
+        continue
+
+      # 완전 일치 > 접두어 일치 > 부분 일치, 짧은 텍스트일수록 우선
+      if text == word:
+        closeness = 1.0
+      elif text.startswith(word):
+        closeness = 0.75
+      else:
+        closeness = 0.5
+      score = FIELD_WEIGHTS[field] * (closeness + len(word) / len(text)) / 2
+
+      best_score, menus = matches.get(sid, (0.0, []))
+      if menu_name and menu_name not in menus:
+        menus.append(menu_name)
+      matches[sid] = (max(best_score, score), menus)
+
+    return matches
+
+  # 모든 단어가 매칭된 매장을 점수순으로 반환
+  def search(self, query: str, limit: int):
+    words = [hangul.normalize(word) for word in query.split()]
+    words = [word for word in words if word]
+    if not words:
+      return []
+
+    scores = None
+    matched_menus = defaultdict(list)
+    for word in words:
+      matches = self._match_word(word)
+      word_scores = {sid: score for sid, (score, _) in matches.items()}
+      if scores is None:
+        scores = word_scores
+      else:
+        scores = {sid: scores[sid] + word_scores[sid] for sid in scores.keys() & word_scores.keys()}
+      for sid, (_, menus) in matches.items():
+        for menu_name in menus:
+          if menu_name not in matched_menus[sid]:
+            matched_menus[sid].append(menu_name)
+      if not scores:
+        return []
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [
+      {**self.entries[sid], 'matched_menus': matched_menus.get(sid, [])}
+      for sid, _ in ranked
+    ]
+
+
+# 매장(+카테고리) / 메뉴명 / 옵션명을 조회 (school_id 또는 store_id 기준)
+def _load_documents(db: Session, school_id: int = None, store_id: int = None):
+  store_query = db.query(Store).options(joinedload(Store.category))
+  menu_query = db.query(Menu.store_id, Menu.menu_name).join(Store, Menu.store_id == Store.sid)
+  option_query = db.query(Menu.store_id, Menu.menu_name, MenuOption.option_name).join(
+    MenuOption, MenuOption.menu_id == Menu.mid
+  ).join(Store, Menu.store_id == Store.sid)
+
+  if school_id is not None:
+    store_query = store_query.filter(Store.school_id == school_id)
+    menu_query = menu_query.filter(Store.school_id == school_id)
+    option_query = option_query.filter(Store.school_id == school_id)
+  if store_id is not None:
+    store_query = store_query.filter(Store.sid == store_id)
+    menu_query = menu_query.filter(Menu.store_id == store_id)
+    option_query = option_query.filter(Menu.store_id == store_id)
+
+  menus = defaultdict(list)
+  for sid, menu_name in menu_query.all():
+    menus[sid].append(menu_name)
+
+  options = defaultdict(list)
+  for sid, menu_name, option_name in option_query.all():
+    if option_name:
+      options[sid].append((menu_name, option_name))
+
+  return [(store, menus[store.sid], options[store.sid]) for store in store_query.order_by(Store.sid).all()]
+
+
+def build_index(db: Session, school_id: int) -> StoreFullTextIndex:
+  index = StoreFullTextIndex(school_id)
+
+  for store, menus, options in _load_documents(db, school_id=school_id):
+    index.set_store(store, menus, options)
+
+  _indexes.set(school_id, index, INDEX_MAX_AGE)
+  return index
+
+
+# 학교의 색인 반환 (없는 학교면 None)
+def get_index(db: Session, school_id: int):
+  index = _indexes.get(school_id)
+  if index is not None:
+    return index
+
+  # 요청으로 받은 school_id마다 색인이 쌓여 등록된 학교의 색인이 밀려나지 않도록 등록된 학교만 생성
+  if db.query(School.id).filter(School.id == school_id).first() is None:
+    return None
+  return build_index(db, school_id)
+
+
+# 매장명/카테고리/메뉴명/옵션명 n-gram 검색 (매칭된 메뉴 포함)
+def search_stores(db: Session, school_id: int, query: str, limit: int = 30):
+  index = get_index(db, school_id)
+  if index is None:
+    return []
+
+  with _lock:
+    results = index.search(query, limit)
+
+  return apply_current_status(db, results)
+
+
+# 매장 하나의 문서만 다시 색인 (매장/메뉴 수정 시 호출)
+def refresh_store_documents(db: Session, store_id: int):
+  loaded = _load_documents(db, store_id=store_id)
+
+  with _lock:
+    for index in _indexes.values():
+      index.remove_store(store_id)
+      for store, menus, options in loaded:
+        if store.school_id == index.school_id:
+          index.set_store(store, menus, options)
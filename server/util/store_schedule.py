@@ -0,0 +1,84 @@
+from sqlalchemy.orm import Session
+
+from server.models import StoreHours
+from server.util.store_status import status_from_week
+from server.util.time import get_skt_time
+from server.util.ttl_cache import TTLCache
+
+
+# 다른 워커에서 수정된 운영시간이 반영될 수 있도록 캐시를 다시 만드는 최대 주기(초)
+SCHEDULE_MAX_AGE = 600
+
+# 'all' -> {sid -> 요일별(월=0) (opening, closing, break_start, break_exit) 7개 튜플}
+_schedules = TTLCache(1)
+
+
+def _query_hours(db: Session, store_id: int = None):
+  query = db.query(
+    StoreHours.store_id,
+    StoreHours.day_of_week_id,
+    StoreHours.opening_time,
+    StoreHours.closing_time,
+    StoreHours.break_start_time,
+    StoreHours.break_exit_time,
+  )
+
+  if store_id is not None:
+    query = query.filter(StoreHours.store_id == store_id)
+
+  # 같은 요일의 운영시간이 여러 개면 첫 번째만 사용
+  schedules = {}
+  for sid, day_of_week_id, *hours in query.order_by(StoreHours.id.desc()).all():
+    if sid is None or not 1 <= (day_of_week_id or 0) <= 7:
+      continue
+    week = schedules.setdefault(sid, [None] * 7)
+    week[day_of_week_id - 1] = tuple(hours)
+
+  return {sid: tuple(week) for sid, week in schedules.items()}
+
+
+# 전체 매장의 주간 운영시간을 한 번에 조회하여 캐시
+def load_schedules(db: Session):
+  schedules = _query_hours(db)
+  _schedules.set('all', schedules, SCHEDULE_MAX_AGE)
+  return schedules
+
+
+def get_schedules(db: Session):
+  schedules = _schedules.get('all')
+  return schedules if schedules is not None else load_schedules(db)
+
+
+# 매장 하나의 운영시간만 다시 캐시 (운영시간 수정 시 호출, 캐시가 없으면 다음 조회 때 전체를 불러옴)
+def refresh_store_schedule(db: Session, store_id: int):
+  week = _query_hours(db, store_id).get(store_id)
+
+  def replace_week(schedules):
+    schedules = dict(schedules)
+    if week is None:
+      schedules.pop(store_id, None)
+    else:
+      schedules[store_id] = week
+    return schedules
+
+  _schedules.update('all', replace_week)
+
+
+# 요청 시점의 매장 상태를 계산하는 함수 반환 (sid -> 'opened' / 'breaktime' / 'closed')
+def status_lookup(db: Session):
+  schedules = get_schedules(db)
+  now = get_skt_time()
+
+  def status_of(sid: int) -> str:
+    week = schedules.get(sid)
+    return status_from_week(week, now) if week else 'closed'
+
+  return status_of
+
+
+# 매장 목록 응답 dict들의 is_open을 요청 시점 상태로 교체
+def apply_current_status(db: Session, entries):
+  status_of = status_lookup(db)
+  for entry in entries:
+    entry['is_open'] = status_of(entry['sid'])
+  return entries
@@ -0,0 +1,212 @@
+import bisect
+import threading
+
+from sqlalchemy.orm import Session
+
+from server.models import School, Store, StoreCategory, Menu
+from server.util import hangul
+from server.util.ttl_cache import TTLCache
+
+
+# 다른 워커에서 수정된 매장/메뉴가 반영될 수 있도록 색인을 다시 만드는 최대 주기(초)
+INDEX_MAX_AGE = 600
+# 색인을 유지하는 최대 학교 수
+INDEX_MAX_SCHOOLS = 100
+
+# 같은 접두어로 매칭되면 매장명 > 카테고리 > 메뉴 순으로 우선
+FIELD_RANKS = {'store_name': 0, 'category': 1, 'menu': 2}
+
+_lock = threading.Lock()
+# school_id -> StoreSearchIndex
+_indexes = TTLCache(INDEX_MAX_SCHOOLS)
+
+
+# 텍스트의 각 단어 시작 위치부터의 접미 문자열 ('GS25 학관' -> 'GS25 학관', '학관')
+def _token_suffixes(text: str):
+  tokens = text.split()
+  for position in range(len(tokens)):
+    yield position, " ".join(tokens[position:])
+
+
+# 매장 하나의 검색어들을 (자모 키, 초성 키, 순위) 목록으로 변환
+def _store_keys(sid: int, terms):
+  keys = []
+
+  for field, text in terms:
+    if not text:
+      continue
+    for position, suffix in _token_suffixes(text):
+      rank = (FIELD_RANKS[field], 0 if position == 0 else 1, len(text), sid)
+      keys.append((hangul.decompose(suffix), hangul.choseong(suffix), rank))
+
+  return keys
+
+
+# 검색 결과 순위 구간 (필드 순위, 단어 시작 위치) - 앞 구간에서 limit개를 채우면 뒤 구간은 확인하지 않음
+TIERS = [(field_rank, position) for field_rank in sorted(FIELD_RANKS.values()) for position in (0, 1)]
+
+
+# 정렬된 배열에서 항목 하나 제거
+def _discard(entries: list, entry):
+  index = bisect.bisect_left(entries, entry)
+  if index < len(entries) and entries[index] == entry:
+    del entries[index]
+
+
+class StoreSearchIndex:
+  def __init__(self, school_id: int):
+    self.school_id = school_id
+    self.store_names = {}  # sid -> store_name
+    self.store_keys = {}   # sid -> [(자모 키, 초성 키, 순위), ...]
+    # 순위 구간 -> 키 순서로 정렬된 [(키, 순위), ...]
+    self.jamo = {tier: [] for tier in TIERS}
+    self.choseong = {tier: [] for tier in TIERS}
+
+  # 여러 매장을 한 번에 색인 (색인을 처음 만들 때, 구간별로 한 번만 정렬)
+  def load_stores(self, stores: dict):
+    for sid, store in stores.items():
+      self.store_names[sid] = store['store_name']
+      self.store_keys[sid] = _store_keys(sid, store['terms'])
+      for jamo_key, choseong_key, rank in self.store_keys[sid]:
+        self.jamo[rank[:2]].append((jamo_key, rank))
+        self.choseong[rank[:2]].append((choseong_key, rank))
+
+    for tier in TIERS:
+      self.jamo[tier].sort()
+      self.choseong[tier].sort()
+
+  # 매장 하나의 키만 정렬된 배열에 끼워 넣음 (매장/메뉴 수정 시)
+  def set_store(self, sid: int, store_name: str, terms):
+    self.remove_store(sid)
+    self.store_names[sid] = store_name
+    self.store_keys[sid] = _store_keys(sid, terms)
+
+    for jamo_key, choseong_key, rank in self.store_keys[sid]:
+      bisect.insort(self.jamo[rank[:2]], (jamo_key, rank))
+      bisect.insort(self.choseong[rank[:2]], (choseong_key, rank))
+
+  def remove_store(self, sid: int) -> bool:
+    self.store_names.pop(sid, None)
+    keys = self.store_keys.pop(sid, None)
+    if keys is None:
+      return False
+
+    for jamo_key, choseong_key, rank in keys:
+      _discard(self.jamo[rank[:2]], (jamo_key, rank))
+      _discard(self.choseong[rank[:2]], (choseong_key, rank))
+    return True
+
+  # 접두어가 일치하는 매장명을 순위대로 최대 limit개 반환
+  # 순위 구간 순서로 확인하여 limit개를 채우면 나머지 구간은 확인하지 않음
+  def search(self, query: str, limit: int):
+    normalized = hangul.normalize(query)
+    if not normalized:
+      return []
+
+    if hangul.is_choseong_query(normalized):
+      tiers = self.choseong
+      prefix = normalized
+    else:
+      tiers = self.jamo
+      prefix = hangul.decompose(normalized)
+
+    results = []
+    seen_sids = set()
+    seen_names = set()
+    for tier in TIERS:
+      entries = tiers[tier]
+      ranks = []
+      index = bisect.bisect_left(entries, (prefix,))
+      while index < len(entries) and entries[index][0].startswith(prefix):
+        ranks.append(entries[index][1])
+        index += 1
+
+      # 앞 구간에서 나온 매장은 이미 더 높은 순위로 처리됨
+      for rank in sorted(ranks):
+        sid = rank[3]
+        if sid in seen_sids:
+          continue
+        seen_sids.add(sid)
+
+        store_name = self.store_names.get(sid)
+        if store_name and store_name not in seen_names:
+          seen_names.add(store_name)
+          results.append(store_name)
+          if len(results) >= limit:
+            return results
+
+    return results
+
+
+# 매장별 (매장명, 카테고리, 메뉴명) 검색어 조회
+def _load_store_terms(db: Session, school_id: int = None, store_id: int = None):
+  store_query = db.query(
+    Store.sid,
+    Store.school_id,
+    Store.store_name,
+    StoreCategory.main_category,
+    StoreCategory.sub_category,
+  ).outerjoin(StoreCategory, Store.category_id == StoreCategory.id)
+
+  menu_query = db.query(Menu.store_id, Menu.menu_name).join(Store, Menu.store_id == Store.sid)
+
+  if school_id is not None:
+    store_query = store_query.filter(Store.school_id == school_id)
+    menu_query = menu_query.filter(Store.school_id == school_id)
+  if store_id is not None:
+    store_query = store_query.filter(Store.sid == store_id)
+    menu_query = menu_query.filter(Menu.store_id == store_id)
+
+  stores = {}
+  for sid, store_school_id, store_name, main_category, sub_category in store_query.all():
+    terms = [('store_name', store_name), ('category', main_category), ('category', sub_category)]
+    stores[sid] = {'school_id': store_school_id, 'store_name': store_name, 'terms': terms}
+
+  for sid, menu_name in menu_query.all():
+    if sid in stores:
+      stores[sid]['terms'].append(('menu', menu_name))
+
+  return stores
+
+
+def build_index(db: Session, school_id: int) -> StoreSearchIndex:
+  index = StoreSearchIndex(school_id)
+  index.load_stores(_load_store_terms(db, school_id=school_id))
+
+  _indexes.set(school_id, index, INDEX_MAX_AGE)
+  return index
+
+
+# 학교의 색인 반환 (없는 학교면 None)
+def get_index(db: Session, school_id: int):
+  index = _indexes.get(school_id)
+  if index is not None:
+    return index
+
+  # 요청으로 받은 school_id마다 색인이 쌓여 등록된 학교의 색인이 밀려나지 않도록 등록된 학교만 생성
+  if db.query(School.id).filter(School.id == school_id).first() is None:
+    return None
+  return build_index(db, school_id)
+
+
+# 자동완성 검색 (매장명, 카테고리, 메뉴명의 접두어 / 초성 / 입력 중인 자모 매칭)
+def search_store_names(db: Session, school_id: int, query: str, limit: int = 10):
+  index = get_index(db, school_id)
+  if index is None:
+    return []
+
+  with _lock:
+    return index.search(query, limit)
+
+
+# 매장 하나의 검색어만 다시 색인 (매장/메뉴 수정 시 호출)
+def refresh_store_terms(db: Session, store_id: int):
+  stores = _load_store_terms(db, store_id=store_id)
+
+  with _lock:
+    for index in _indexes.values():
+      store = stores.get(store_id)
+      if store and store['school_id'] == index.school_id:
+        index.set_store(store_id, store['store_name'], store['terms'])
+      else:
+        index.remove_store(store_id)
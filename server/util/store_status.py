@@ -0,0 +1,75 @@
+from datetime import datetime, time, timedelta
+
+
+STORE_STATUSES = ('opened', 'breaktime', 'closed')
+
+# 자정(00:00)에 닫는 매장은 하루의 마지막 시각에 닫는 것으로 처리
+END_OF_DAY = time(23, 59, 59)
+
+
+# 해당 요일의 운영시간으로 현재 시각의 매장 상태 계산 ('opened' / 'breaktime' / 'closed')
+# 닫는 시각이 여는 시각보다 이르면 (예: 18:00 ~ 02:00) 그날은 자정까지 영업하는 것으로 처리
+def compute_store_status(opening_time, closing_time, break_start_time, break_exit_time, now: time) -> str:
+  if opening_time is None or closing_time is None:
+    return 'closed'
+
+  if closing_time == time(0, 0) or closing_time < opening_time:
+    closing_time = END_OF_DAY
+
+  if not opening_time <= now <= closing_time:
+    return 'closed'
+
+  if break_start_time and break_exit_time and break_start_time <= now <= break_exit_time:
+    return 'breaktime'
+
+  return 'opened'
+
+
+# 자정을 넘겨 다음 날까지 영업하는 운영시간인지 확인
+def is_overnight(hours) -> bool:
+  if hours is None:
+    return False
+  opening_time, closing_time = hours[0], hours[1]
+  return opening_time is not None and closing_time is not None and closing_time != time(0, 0) and closing_time < opening_time
+
+
+# 요일별(월=0) 운영시간 (opening, closing, break_start, break_exit) 7개로 현재 상태 계산
+# 전날 자정을 넘겨 영업하는 경우 전날 닫는 시각까지는 영업 중으로 판단
+def status_from_week(week_hours, now: datetime) -> str:
+  now_time = now.time().replace(microsecond=0)
+  today = week_hours[now.weekday()]
+
+  status = compute_store_status(*today, now_time) if today else 'closed'
+
+  if status == 'closed':
+    yesterday = week_hours[(now.weekday() - 1) % 7]
+    if is_overnight(yesterday) and now_time < yesterday[1]:
+      status = 'opened'
+
+  return status
+
+
+# 현재 시각 이후 매장 상태가 처음으로 바뀌는 시각 (일주일 안에 바뀌지 않으면 None)
+# 상태 비교 구간은 닫는 시각 / 브레이크 종료 시각까지 포함이므로 그 1초 뒤도 후보로 확인
+def next_transition(week_hours, now: datetime):
+  now = now.replace(microsecond=0)
+  current = status_from_week(week_hours, now)
+  midnight = now.replace(hour=0, minute=0, second=0)
+
+  for offset in range(8):
+    day = midnight + timedelta(days=offset)
+    weekday = day.weekday()
+
+    candidates = {timedelta(0)}
+    for hours in (week_hours[weekday], week_hours[(weekday - 1) % 7]):
+      for value in hours or ():
+        if value is not None:
+          at = timedelta(hours=value.hour, minutes=value.minute, seconds=value.second)
+          candidates.update((at, at + timedelta(seconds=1)))
+
+    for at in sorted(candidates):
+      when = day + at
+      if when > now and status_from_week(week_hours, when) != current:
+        return when
+
+  return None
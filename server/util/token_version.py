@@ -0,0 +1,45 @@
+from sqlalchemy.orm import Session
+
+from server.models import UserTokenVersion
+from server.util.ttl_cache import TTLCache
+from server.util.time import get_skt_time
+
+
+# 캐시한 토큰 버전을 다시 조회하는 최대 주기(초) (다른 워커에서 무효화된 토큰이 반영되는 최대 지연)
+TOKEN_VERSION_TTL = 30
+TOKEN_VERSION_MAX_SIZE = 10000
+
+_versions = TTLCache(TOKEN_VERSION_MAX_SIZE)
+
+
+# 유저의 현재 토큰 버전 (한 번도 무효화하지 않은 유저는 0)
+def get_token_version(db: Session, uid: int) -> int:
+  version = _versions.get(uid)
+  if version is not None:
+    return version
+
+  version = db.query(UserTokenVersion.version).filter(UserTokenVersion.uid == uid).scalar() or 0
+  _versions.set(uid, version, TOKEN_VERSION_TTL)
+  return version
+
+
+# 토큰 버전을 올려 이전에 발급된 토큰을 모두 무효화 (커밋 후 invalidate_token_version 호출)
+def bump_token_version(db: Session, uid: int):
+  updated = db.query(UserTokenVersion).filter(UserTokenVersion.uid == uid).update(
+    {UserTokenVersion.version: UserTokenVersion.version + 1, UserTokenVersion.updated_at: get_skt_time()},
+    synchronize_session=False,
+  )
+  if not updated:
+    db.add(UserTokenVersion(uid=uid, version=1, updated_at=get_skt_time()))
+    db.flush()
+
+
+# 토큰 버전을 올린 뒤 커밋이 끝나면 호출
+def invalidate_token_version(uid: int):
+  _versions.pop(uid)
+
+
+# 토큰의 버전(ver)이 현재 버전보다 낮으면 무효화된 토큰
+# ver가 없는 이전 토큰은 버전 0으로 보고 확인 (비밀번호 변경, 탈퇴 등으로 버전이 오르면 무효화됨)
+def is_token_current(db: Session, payload: dict) -> bool:
+  return payload.get('ver', 0) >= get_token_version(db, payload.get('uid'))
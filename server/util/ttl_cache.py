@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# 최대 크기와 항목별 만료 시각이 있는 LRU 캐시 (max_size가 None이면 크기 제한 없음)
+# 값이 없거나 만료되면 get이 None을 반환하므로 None은 저장하지 않음
+class TTLCache:
+  def __init__(self, max_size: int = None):
+    self.max_size = max_size
+    self._lock = threading.Lock()
+    self._items = OrderedDict()  # key -> (만료 시각, 값)
+
+  def get(self, key):
+    with self._lock:
+      item = self._items.get(key)
+      if item is None:
+        return None
+      if item[0] <= time.monotonic():
+        del self._items[key]
+        return None
+      self._items.move_to_end(key)
+      return item[1]
+
+  def set(self, key, value, ttl: float):
+    with self._lock:
+      self._items[key] = (time.monotonic() + ttl, value)
+      self._items.move_to_end(key)
+      while self.max_size is not None and len(self._items) > self.max_size:
+        self._items.popitem(last=False)
+
+  # 캐시된 값을 반환하고, 없거나 만료되었으면 build()로 만들어 저장 (build는 잠금 밖에서 실행, None을 반환하면 저장하지 않음)
+  def get_or_build(self, key, build, ttl: float):
+    value = self.get(key)
+    if value is None:
+      value = build()
+      if value is not None:
+        self.set(key, value, ttl)
+    return value
+
+  # 캐시된 값을 update(value)의 결과로 교체 (만료 시각은 유지, 없거나 만료되었으면 아무것도 하지 않음)
+  def update(self, key, update) -> bool:
+    with self._lock:
+      item = self._items.get(key)
+      if item is None or item[0] <= time.monotonic():
+        return False
+      self._items[key] = (item[0], update(item[1]))
+      return True
+
+  def pop(self, key):
+    with self._lock:
+      self._items.pop(key, None)
+
+  def clear(self):
+    with self._lock:
+      self._items.clear()
+
+  # 만료되지 않은 키 / 값 목록
+  def keys(self) -> list:
+    now = time.monotonic()
+    with self._lock:
+      return [key for key, (expires_at, _) in self._items.items() if expires_at > now]
+
+  def values(self) -> list:
+    now = time.monotonic()
+    with self._lock:
+      return [value for expires_at, value in self._items.values() if expires_at > now]
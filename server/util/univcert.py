@@ -0,0 +1,31 @@
+from server.util.config import UNIVCERT_API_KEY
+from server.util.http_client import get_client
+
+
+# Univcert 학교 이메일 인증 API (응답 JSON을 그대로 반환, 실패하면 UpstreamError)
+async def _post(path: str, payload: dict) -> dict:
+  headers = {
+    "Content-Type" : "application/json",
+  }
+
+  return await get_client('univcert').post_json(path, json={"key" : UNIVCERT_API_KEY, **payload}, headers=headers)
+
+
+# 인증 메일 발송
+async def certify(email: str, univ_name: str) -> dict:
+  return await _post("/certify", {"email" : email, "univName" : univ_name, "univ_check" : True})
+
+
+# 인증 코드 확인
+async def certify_code(email: str, univ_name: str, code: str) -> dict:
+  return await _post("/certifycode", {"email" : email, "univName" : univ_name, "code" : code})
+
+
+# 인증된 이메일 리스트 조회
+async def certified_list() -> dict:
+  return await _post("/certifiedlist", {})
+
+
+# 인증된 이메일 삭제 (email이 없으면 전체 삭제)
+async def clear(email: str = None) -> dict:
+  return await _post(f"/clear/{email}" if email else "/clear", {})
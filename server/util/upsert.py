@@ -0,0 +1,24 @@
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+# 한 행을 INSERT하고 기본 키가 이미 있으면 update 값으로 수정 (update가 없으면 그대로 둠)
+# MySQL은 INSERT ... ON DUPLICATE KEY UPDATE, 로컬 환경(SQLite)은 INSERT ... ON CONFLICT 로 한 문장에 처리
+# 없는 키를 SELECT ... FOR UPDATE 한 뒤 INSERT하면 InnoDB에서 갭 잠금끼리 교착 상태가 생기므로 대신 사용
+def upsert(db: Session, model, values: dict, update: dict = None):
+  table = model.__table__
+
+  if db.get_bind().dialect.name in ('mysql', 'mariadb'):
+    if not update:
+      update = {column.name: column for column in table.primary_key}
+    statement = mysql_insert(table).values(**values).on_duplicate_key_update(**update)
+  else:
+    statement = sqlite_insert(table).values(**values)
+    index_elements = [column.name for column in table.primary_key]
+    if update:
+      statement = statement.on_conflict_do_update(index_elements=index_elements, set_=update)
+    else:
+      statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+
+  db.execute(statement)
@@ -0,0 +1,321 @@
+import hashlib
+import hmac
+import math
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from server.models import VerificationCode
+from server.util.time import get_skt_time
+from server.util.upsert import upsert
+
+
+# 인증번호 유효 시간(초)과 인증번호 하나당 최대 확인 시도 횟수
+CODE_TTL = 180
+MAX_VERIFY_ATTEMPTS = 5
+# 인증 완료 후 회원가입을 마쳐야 하는 시간(초)
+VERIFIED_TTL = 1800
+
+# 같은 번호로 다시 보낼 수 있는 간격(초)과 시간당 최대 전송 횟수
+PHONE_RESEND_INTERVAL = 60
+PHONE_MAX_SENDS = 5
+PHONE_WINDOW = 3600
+# 같은 IP에서 시간당 요청할 수 있는 최대 전송 횟수
+IP_MAX_SENDS = 20
+IP_WINDOW = 3600
+
+# 메모리 저장소가 보관하는 최대 항목 수 (넘으면 가장 오래된 항목부터 제거)
+MAX_ENTRIES = int(os.getenv('VERIFICATION_MAX_ENTRIES', 100000))
+
+# 'db' : verification_code 테이블에 보관 (기본값, 여러 워커가 공유)
+# 'memory' : 워커 메모리에 보관 (워커가 하나일 때만 사용 가능, 개발/테스트용)
+VERIFICATION_STORE = os.getenv('VERIFICATION_STORE', 'db')
+
+# 메모리 저장소는 워커마다 따로 있어서 발급/확인 요청이 다른 워커로 가면 만료로 처리되고 전송 제한도 워커 수만큼 늘어남
+if VERIFICATION_STORE == 'memory' and int(os.getenv('WEB_CONCURRENCY', 1)) > 1:
+  raise RuntimeError("VERIFICATION_STORE=memory 는 워커가 하나일 때만 사용할 수 있습니다.")
+
+SECRET_KEY = os.getenv('SECRET_KEY') or ''
+
+
+# 전송 제한에 걸림 (retry_after초 후 다시 요청 가능)
+class VerificationThrottled(Exception):
+  def __init__(self, retry_after: int):
+    super().__init__(retry_after)
+    self.retry_after = max(1, int(math.ceil(retry_after)))
+
+
+def generate_code() -> str:
+  return str(random.SystemRandom().randint(0, 999999)).zfill(6)
+
+
+# 인증번호는 원문 대신 해시로 보관
+def _hash_code(phone_number: str, code: str) -> str:
+  return hmac.new(SECRET_KEY.encode(), f"{phone_number}:{code}".encode(), hashlib.sha256).hexdigest()
+
+
+# 최대 크기가 있는 만료 저장소 (타이머 휠로 저장/조회/만료 처리가 모두 O(1))
+class ExpiringStore:
+  def __init__(self, max_entries: int, wheel_size: int = 4096, resolution: float = 1.0):
+    self.max_entries = max_entries
+    self.resolution = resolution
+    self._entries = {}  # key -> [만료 시각, 값, 슬롯 번호] (추가된 순서 유지)
+    self._wheel = [set() for _ in range(wheel_size)]
+    self._tick = self._tick_of(time.monotonic())
+    self._lock = threading.Lock()
+
+  def _tick_of(self, at: float) -> int:
+    return int(at / self.resolution)
+
+  def _remove(self, key):
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      self._wheel[entry[2]].discard(key)
+
+  # 마지막으로 확인한 슬롯부터 현재 슬롯까지 만료된 항목 제거 (휠 한 바퀴보다 긴 유효 시간의 항목은 그대로 둠)
+  # 현재 슬롯은 같은 틱 안에서 나중에 만료되는 항목이 있으므로 다음 호출 때 다시 확인
+  def _advance(self, now: float):
+    now_tick = self._tick_of(now)
+    start = max(self._tick, now_tick - len(self._wheel) + 1)
+
+    for tick in range(start, now_tick + 1):
+      slot = self._wheel[tick % len(self._wheel)]
+      for key in [key for key in slot if self._entries[key][0] <= now]:
+        self._remove(key)
+
+    self._tick = now_tick
+
+  def get(self, key):
+    with self._lock:
+      now = time.monotonic()
+      self._advance(now)
+      entry = self._entries.get(key)
+      return entry[1] if entry is not None and entry[0] > now else None
+
+  # 남은 유효 시간(초) (없으면 0)
+  def ttl(self, key) -> float:
+    with self._lock:
+      now = time.monotonic()
+      entry = self._entries.get(key)
+      return max(0.0, entry[0] - now) if entry is not None else 0.0
+
+  def set(self, key, value, ttl: float):
+    with self._lock:
+      now = time.monotonic()
+      self._advance(now)
+      self._remove(key)
+
+      while len(self._entries) >= self.max_entries:
+        self._remove(next(iter(self._entries)))
+
+      expires_at = now + ttl
+      slot = self._tick_of(expires_at) % len(self._wheel)
+      self._entries[key] = [expires_at, value, slot]
+      self._wheel[slot].add(key)
+
+  # 만료 시각은 유지하고 값만 변경 (없거나 만료된 항목이면 False)
+  def replace(self, key, value) -> bool:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None or entry[0] <= time.monotonic():
+        return False
+      entry[1] = value
+      return True
+
+  def pop(self, key):
+    with self._lock:
+      self._remove(key)
+
+  def __len__(self):
+    return len(self._entries)
+
+
+# 워커 메모리에 보관하는 인증번호 저장소
+class MemoryVerificationStore:
+  def __init__(self, max_entries: int = MAX_ENTRIES):
+    self.codes = ExpiringStore(max_entries)      # 번호 -> [코드 해시, 확인 시도 횟수]
+    self.verified = ExpiringStore(max_entries)   # 번호 -> True
+    self.throttles = ExpiringStore(max_entries)  # ('cooldown' / 'phone' / 'ip', 값) -> 전송 횟수
+
+  def _count(self, key, limit: int, window: int):
+    count = self.throttles.get(key) or 0
+    if count >= limit:
+      raise VerificationThrottled(self.throttles.ttl(key))
+    return count
+
+  def _hit(self, key, count: int, window: int):
+    if not count or not self.throttles.replace(key, count + 1):
+      self.throttles.set(key, count + 1, window)
+
+  def check_and_record_send(self, db: Session, phone_number: str, ip: str):
+    if self.throttles.get(('cooldown', phone_number)):
+      raise VerificationThrottled(self.throttles.ttl(('cooldown', phone_number)))
+
+    phone_count = self._count(('phone', phone_number), PHONE_MAX_SENDS, PHONE_WINDOW)
+    ip_count = self._count(('ip', ip), IP_MAX_SENDS, IP_WINDOW) if ip else 0
+
+    self.throttles.set(('cooldown', phone_number), 1, PHONE_RESEND_INTERVAL)
+    self._hit(('phone', phone_number), phone_count, PHONE_WINDOW)
+    if ip:
+      self._hit(('ip', ip), ip_count, IP_WINDOW)
+
+  def save_code(self, db: Session, phone_number: str, code: str):
+    self.codes.set(phone_number, [_hash_code(phone_number, code), 0], CODE_TTL)
+    self.verified.pop(phone_number)
+
+  def confirm_code(self, db: Session, phone_number: str, code: str) -> str:
+    entry = self.codes.get(phone_number)
+    if entry is None:
+      return 'expired'
+
+    if not hmac.compare_digest(entry[0], _hash_code(phone_number, code)):
+      entry[1] += 1
+      if entry[1] >= MAX_VERIFY_ATTEMPTS:
+        self.codes.pop(phone_number)
+        return 'too_many_attempts'
+      return 'mismatch'
+
+    self.codes.pop(phone_number)
+    self.verified.set(phone_number, True, VERIFIED_TTL)
+    return 'verified'
+
+  def is_verified(self, db: Session, phone_number: str) -> bool:
+    return bool(self.verified.get(phone_number))
+
+  def consume_verified(self, db: Session, phone_number: str):
+    self.verified.pop(phone_number)
+
+
+# verification_code 테이블에 보관하는 인증번호 저장소 (여러 워커가 같은 인증번호를 확인할 수 있음)
+# 번호별 행('phone:...')에 인증번호와 전송 횟수를, IP별 행('ip:...')에 전송 횟수를 보관
+class DatabaseVerificationStore:
+  def _now(self):
+    return get_skt_time().replace(tzinfo=None)
+
+  # 행이 없으면 먼저 만든 뒤 잠금 (없는 키를 SELECT ... FOR UPDATE 하면 같은 키의 첫 요청들이 갭 잠금으로 교착 상태가 됨)
+  def _row(self, db: Session, key: str) -> VerificationCode:
+    upsert(db, VerificationCode, {'key': key, 'attempts': 0, 'send_count': 0})
+    return db.query(VerificationCode).filter(VerificationCode.key == key).with_for_update().one()
+
+  def _count(self, row: VerificationCode, now, limit: int, window: int):
+    if row.window_started_at is None or row.window_started_at + timedelta(seconds=window) <= now:
+      row.window_started_at = now
+      row.send_count = 0
+
+    if row.send_count >= limit:
+      raise VerificationThrottled((row.window_started_at + timedelta(seconds=window) - now).total_seconds())
+
+  def check_and_record_send(self, db: Session, phone_number: str, ip: str):
+    now = self._now()
+    try:
+      phone_row = self._row(db, f"phone:{phone_number}")
+      if phone_row.last_sent_at is not None and phone_row.last_sent_at + timedelta(seconds=PHONE_RESEND_INTERVAL) > now:
+        raise VerificationThrottled((phone_row.last_sent_at + timedelta(seconds=PHONE_RESEND_INTERVAL) - now).total_seconds())
+      self._count(phone_row, now, PHONE_MAX_SENDS, PHONE_WINDOW)
+
+      ip_row = self._row(db, f"ip:{ip}") if ip else None
+      if ip_row is not None:
+        self._count(ip_row, now, IP_MAX_SENDS, IP_WINDOW)
+        ip_row.send_count += 1
+
+      phone_row.send_count += 1
+      phone_row.last_sent_at = now
+      db.flush()
+    except VerificationThrottled:
+      db.rollback()
+      raise
+
+  def save_code(self, db: Session, phone_number: str, code: str):
+    row = self._row(db, f"phone:{phone_number}")
+    row.code_hash = _hash_code(phone_number, code)
+    row.attempts = 0
+    row.expires_at = self._now() + timedelta(seconds=CODE_TTL)
+    row.verified_until = None
+
+  def confirm_code(self, db: Session, phone_number: str, code: str) -> str:
+    now = self._now()
+    row = db.query(VerificationCode).filter(VerificationCode.key == f"phone:{phone_number}").with_for_update().first()
+
+    if row is None or row.code_hash is None or row.expires_at is None or row.expires_at <= now:
+      return 'expired'
+
+    if not hmac.compare_digest(row.code_hash, _hash_code(phone_number, code)):
+      row.attempts += 1
+      if row.attempts >= MAX_VERIFY_ATTEMPTS:
+        row.code_hash = None
+        row.expires_at = None
+        db.commit()
+        return 'too_many_attempts'
+      db.commit()
+      return 'mismatch'
+
+    row.code_hash = None
+    row.expires_at = None
+    row.verified_until = now + timedelta(seconds=VERIFIED_TTL)
+    db.commit()
+    return 'verified'
+
+  def is_verified(self, db: Session, phone_number: str) -> bool:
+    verified_until = db.query(VerificationCode.verified_until).filter(
+      VerificationCode.key == f"phone:{phone_number}"
+    ).scalar()
+    return verified_until is not None and verified_until > self._now()
+
+  def consume_verified(self, db: Session, phone_number: str):
+    db.query(VerificationCode).filter(VerificationCode.key == f"phone:{phone_number}").update(
+      {VerificationCode.verified_until: None}, synchronize_session=False
+    )
+
+  # 인증번호, 인증 완료 상태, 재전송 간격, 전송 횟수 기간이 모두 지난 행 삭제
+  def purge(self, db: Session) -> int:
+    now = self._now()
+    window_started = now - timedelta(seconds=max(PHONE_WINDOW, IP_WINDOW))
+    last_sent = now - timedelta(seconds=PHONE_RESEND_INTERVAL)
+
+    deleted = db.query(VerificationCode).filter(
+      or_(VerificationCode.expires_at.is_(None), VerificationCode.expires_at <= now),
+      or_(VerificationCode.verified_until.is_(None), VerificationCode.verified_until <= now),
+      or_(VerificationCode.window_started_at.is_(None), VerificationCode.window_started_at <= window_started),
+      or_(VerificationCode.last_sent_at.is_(None), VerificationCode.last_sent_at <= last_sent),
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+_store = DatabaseVerificationStore() if VERIFICATION_STORE == 'db' else MemoryVerificationStore()
+
+
+# 전송 제한을 확인하고 새 인증번호 발급 (제한에 걸리면 VerificationThrottled)
+# DB 저장소는 커밋하지 않으므로 호출한 쪽에서 메세지 전송 요청과 함께 커밋
+def issue_code(db: Session, phone_number: str, ip: str) -> str:
+  _store.check_and_record_send(db, phone_number, ip)
+
+  code = generate_code()
+  _store.save_code(db, phone_number, code)
+  return code
+
+
+# 인증번호 확인 -> 'verified' / 'mismatch' / 'expired' / 'too_many_attempts'
+def confirm_code(db: Session, phone_number: str, code: str) -> str:
+  return _store.confirm_code(db, phone_number, code)
+
+
+def is_phone_verified(db: Session, phone_number: str) -> bool:
+  return _store.is_verified(db, phone_number)
+
+
+# 회원가입에 사용한 인증 완료 상태 제거 (DB 저장소는 호출한 쪽에서 커밋)
+def consume_phone_verification(db: Session, phone_number: str):
+  _store.consume_verified(db, phone_number)
+
+
+# 기간이 지난 verification_code 행 삭제 (리더 워커의 매장 상태 스케쥴러가 주기적으로 호출, 메모리 저장소는 스스로 만료됨)
+def purge_verification_codes(db: Session) -> int:
+  if not isinstance(_store, DatabaseVerificationStore):
+    return 0
+  return _store.purge(db)
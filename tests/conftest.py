@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# server 모듈을 불러오기 전에 로컬 SQLite와 테스트용 설정 지정
+os.environ.setdefault('USER_DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'haksikmoji.db')}")
+os.environ.setdefault('SECRET_KEY', 'test')
+
+from server.models import Base
+
+
+# 테스트마다 새로 만드는 SQLite 세션
+@pytest.fixture
+def db(tmp_path):
+  engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+  Base.metadata.create_all(engine)
+  session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+  try:
+    yield session
+  finally:
+    session.close()
+    engine.dispose()
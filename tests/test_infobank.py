@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from server.scripts.stub_upstreams import create_app
+from server.util import http_client, infobank
+
+
+STUB_URL = 'http://stub/infobank'
+
+
+# 알림톡 요청이 InfoBank 스텁으로 가도록 infobank 클라이언트를 교체
+@pytest.fixture
+def stub(monkeypatch):
+  app = create_app()
+  client = http_client.UpstreamClient('infobank', **{**http_client.UPSTREAMS['infobank'], 'base_url': STUB_URL})
+  client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=STUB_URL)
+
+  monkeypatch.setitem(http_client._clients, 'infobank', client)
+  monkeypatch.setattr(infobank, 'INFO_BANK_IB_ID', 'test-client')
+  monkeypatch.setattr(infobank, 'token_manager', infobank.InfoBankTokenManager())
+  yield client
+  asyncio.run(client.close())
+
+
+async def stub_stats(client):
+  response = await client.client.get('http://stub/stats')
+  return response.json()
+
+
+def test_send_alimtalk_reuses_cached_token(stub):
+  async def scenario():
+    first = await infobank.send_alimtalk('01012345678', '인증번호 123456')
+    second = await infobank.send_alimtalk('01012345678', '인증번호 654321')
+    return first, second, await stub_stats(stub)
+
+  first, second, stats = asyncio.run(scenario())
+
+  assert first['result'] == 'Success' and second['result'] == 'Success'
+  assert stats['token'] == 1
+  assert stats['alimtalk'] == 2
+
+
+def test_send_alimtalk_refreshes_rejected_token_and_retries(stub):
+  # 만료 전이지만 InfoBank에서 거절되는 토큰이 캐시되어 있는 상태
+  now = time.monotonic()
+  infobank.token_manager._token = ('Bearer', 'revoked', now + 3600, now + 3000)
+
+  async def scenario():
+    result = await infobank.send_alimtalk('01012345678', '인증번호 123456')
+    return result, await stub_stats(stub)
+
+  result, stats = asyncio.run(scenario())
+
+  assert result['result'] == 'Success'
+  assert stats['token'] == 1
+  assert stats['alimtalk'] == 2
+  assert infobank.token_manager._token[1] != 'revoked'
+
+
+def test_send_alimtalk_gives_up_after_one_retry(stub, monkeypatch):
+  # 새로 발급받은 토큰도 거절되면 한 번만 다시 시도하고 UpstreamError
+  async def fetch_revoked_token():
+    return 'Bearer', 'revoked', 3600
+
+  monkeypatch.setattr(infobank, 'fetch_token', fetch_revoked_token)
+
+  async def scenario():
+    with pytest.raises(http_client.UpstreamError):
+      await infobank.send_alimtalk('01012345678', '인증번호 123456')
+    return await stub_stats(stub)
+
+  assert asyncio.run(scenario())['alimtalk'] == 2
+
+
+def test_concurrent_token_requests_share_one_fetch(stub):
+  # 토큰이 없는 상태에서 동시에 들어온 요청들은 하나의 발급 요청을 공유
+  async def scenario():
+    tokens = await asyncio.gather(*(infobank.token_manager.get() for _ in range(20)))
+    results = await asyncio.gather(*(infobank.send_alimtalk('01012345678', f'인증번호 {i}') for i in range(10)))
+    return tokens, results, await stub_stats(stub)
+
+  tokens, results, stats = asyncio.run(scenario())
+
+  assert len(set(tokens)) == 1
+  assert all(result['result'] == 'Success' for result in results)
+  assert stats['token'] == 1
+  assert stats['alimtalk'] == 10
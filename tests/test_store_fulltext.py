@@ -0,0 +1,115 @@
+import pytest
+
+from server.models import Menu, MenuCategory, MenuOption, School, Store, StoreCategory
+from server.util import store_fulltext, store_schedule
+from server.util.store_fulltext import refresh_store_documents, search_stores
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+  store_fulltext._indexes.clear()
+  store_schedule._schedules.clear()
+  yield
+  store_fulltext._indexes.clear()
+  store_schedule._schedules.clear()
+
+
+def add_store(db, sid, store_name, category_id, menus, school_id=1):
+  db.add(Store(sid=sid, store_name=store_name, store_number='0', store_location='loc', is_open='closed', school_id=school_id, category_id=category_id))
+  db.add(MenuCategory(id=sid, store_id=sid, category_name='메인'))
+  for menu_name, options in menus:
+    menu = Menu(store_id=sid, category_id=sid, menu_name=menu_name, menu_image_url='')
+    db.add(menu)
+    db.flush()
+    for option_name in options:
+      db.add(MenuOption(menu_id=menu.mid, option_name=option_name, price='3000'))
+
+
+@pytest.fixture
+def stores(db):
+  db.add_all([School(id=1, name='연세대', campus='미래'), School(id=2, name='연세대', campus='신촌')])
+  db.add_all([StoreCategory(id=1, main_category='음식점'), StoreCategory(id=2, main_category='카페')])
+  add_store(db, 1, '김밥천국', 1, [('참치김밥', []), ('라볶이', [])])
+  add_store(db, 2, '스타벅스', 2, [('아메리카노', ['샷 추가']), ('카페 라떼', [])])
+  add_store(db, 3, '학관 식당', 1, [('김밥', []), ('된장찌개', [])])
+  add_store(db, 4, '김밥나라', 1, [('김밥', [])], school_id=2)
+  db.commit()
+  return db
+
+
+def sids(results):
+  return [result['sid'] for result in results]
+
+
+def test_store_name_match_ranks_above_menu_match(stores):
+  results = search_stores(stores, 1, '김밥')
+
+  assert sids(results) == [1, 3]
+  assert results[0]['matched_menus'] == ['참치김밥']
+  assert results[1]['matched_menus'] == ['김밥']
+
+
+def test_exact_menu_match_ranks_above_partial_menu_match(stores):
+  add_store(stores, 5, '분식집', 1, [('꼬마 김밥 세트', [])])
+  stores.commit()
+
+  assert sids(search_stores(stores, 1, '김밥')) == [1, 3, 5]
+
+
+def test_menu_search_returns_matched_menus(stores):
+  results = search_stores(stores, 1, '아메리카노')
+
+  assert sids(results) == [2]
+  assert results[0]['matched_menus'] == ['아메리카노']
+  assert results[0]['store_name'] == '스타벅스'
+  assert 'is_open' in results[0]
+
+
+def test_option_match_returns_its_menu(stores):
+  results = search_stores(stores, 1, '샷')
+
+  assert sids(results) == [2]
+  assert results[0]['matched_menus'] == ['아메리카노']
+
+
+def test_category_match_has_no_matched_menus(stores):
+  results = search_stores(stores, 1, '음식점')
+
+  assert sids(results) == [1, 3]
+  assert all(result['matched_menus'] == [] for result in results)
+
+
+def test_every_word_must_match(stores):
+  # 띄어쓰기와 관계없이 비교하며, 모든 단어가 매칭된 매장만 응답
+  assert sids(search_stores(stores, 1, '카페라떼')) == [2]
+  assert sids(search_stores(stores, 1, '카페 라떼')) == [2]
+  assert search_stores(stores, 1, '김밥 라떼') == []
+
+
+def test_no_match_and_limit(stores):
+  assert search_stores(stores, 1, '피자') == []
+  assert sids(search_stores(stores, 1, '김밥', limit=1)) == [1]
+
+
+def test_search_is_scoped_to_school(stores):
+  assert sids(search_stores(stores, 2, '김밥')) == [4]
+
+
+def test_refresh_store_documents_reindexes_one_store(stores):
+  assert search_stores(stores, 1, '피자') == []
+
+  stores.add(Menu(store_id=3, category_id=3, menu_name='치즈 피자', menu_image_url=''))
+  stores.commit()
+  refresh_store_documents(stores, 3)
+
+  results = search_stores(stores, 1, '피자')
+  assert sids(results) == [3]
+  assert results[0]['matched_menus'] == ['치즈 피자']
+
+
+def test_unknown_school_is_not_cached(stores):
+  assert search_stores(stores, 1, '김밥')
+  for school_id in range(3, 300):
+    assert search_stores(stores, school_id, '김밥') == []
+
+  assert store_fulltext._indexes.keys() == [1]
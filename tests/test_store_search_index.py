@@ -0,0 +1,75 @@
+import pytest
+
+from server.models import Menu, MenuCategory, School, Store, StoreCategory
+from server.util import store_search_index
+from server.util.store_search_index import StoreSearchIndex, refresh_store_terms, search_store_names
+
+
+@pytest.fixture(autouse=True)
+def clear_indexes():
+  store_search_index._indexes.clear()
+  yield
+  store_search_index._indexes.clear()
+
+
+@pytest.fixture
+def stores(db):
+  db.add(School(id=1, name='연세대', campus='미래'))
+  db.add_all([StoreCategory(id=1, main_category='음식점'), StoreCategory(id=2, main_category='카페')])
+  for sid, store_name, category_id, menu_name in [
+    (1, '스타벅스', 2, '아메리카노'),
+    (2, '김밥천국', 1, '참치김밥'),
+    (3, '카페 딕셔너리', 2, '카페라떼'),
+    (4, '스시 하우스', 1, '연어 초밥'),
+  ]:
+    db.add(Store(sid=sid, store_name=store_name, store_number='0', store_location='loc', is_open='closed', school_id=1, category_id=category_id))
+    db.add(MenuCategory(id=sid, store_id=sid, category_name='메인'))
+    db.add(Menu(store_id=sid, category_id=sid, menu_name=menu_name, menu_image_url=''))
+  db.commit()
+  return db
+
+
+QUERIES = ['스', 'ㅅ', 'ㅅㅌ', '스타ㅂ', '카페', 'ㄱ', '아메', '김ㅂ', '음식', '초밥', 'zz']
+
+
+def test_prefix_choseong_and_partial_syllable(stores):
+  assert search_store_names(stores, 1, '스') == ['스타벅스', '스시 하우스']
+  assert search_store_names(stores, 1, 'ㅅㅌ') == ['스타벅스']
+  assert search_store_names(stores, 1, '스타ㅂ') == ['스타벅스']
+  # 매장명 > 카테고리 > 메뉴명 순
+  assert search_store_names(stores, 1, '카페') == ['카페 딕셔너리', '스타벅스']
+  assert search_store_names(stores, 1, '아메') == ['스타벅스']
+
+
+def test_limit_stops_at_higher_tiers(stores):
+  assert search_store_names(stores, 1, '카페', limit=1) == ['카페 딕셔너리']
+
+
+def test_incremental_refresh_matches_full_build(stores):
+  search_store_names(stores, 1, '스')
+
+  stores.query(Store).filter(Store.sid == 1).update({'store_name': '투썸플레이스'})
+  stores.add(Menu(store_id=2, category_id=2, menu_name='스팸 김밥', menu_image_url=''))
+  stores.query(Store).filter(Store.sid == 4).update({'school_id': None})
+  stores.commit()
+  for sid in (1, 2, 4):
+    refresh_store_terms(stores, sid)
+
+  refreshed = store_search_index._indexes.get(1)
+  rebuilt = StoreSearchIndex(1)
+  rebuilt.load_stores(store_search_index._load_store_terms(stores, school_id=1))
+
+  assert refreshed.jamo == rebuilt.jamo
+  assert refreshed.choseong == rebuilt.choseong
+  for query in QUERIES:
+    assert refreshed.search(query, 10) == rebuilt.search(query, 10)
+  assert search_store_names(stores, 1, 'ㅌㅆ') == ['투썸플레이스']
+  assert search_store_names(stores, 1, '스') == ['김밥천국']
+
+
+def test_unknown_school_is_not_cached(stores):
+  assert search_store_names(stores, 1, '스')
+  for school_id in range(2, 300):
+    assert search_store_names(stores, school_id, '스') == []
+
+  assert store_search_index._indexes.keys() == [1]
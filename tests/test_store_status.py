@@ -0,0 +1,80 @@
+from datetime import datetime, time
+
+import pytest
+
+from server.util.store_status import next_transition, status_from_week
+
+
+# 2024-01-01은 월요일
+def at(day: int, hour: int, minute: int = 0, second: int = 0) -> datetime:
+  return datetime(2024, 1, day, hour, minute, second)
+
+
+# 요일별(월=0) 운영시간 7개, 지정하지 않은 요일은 휴무
+def week(**days):
+  names = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+  return [days.get(name) for name in names]
+
+
+# 월요일 18:00 ~ 02:00 (화요일 새벽까지 영업), 화요일 휴무
+OVERNIGHT = week(mon=(time(18), time(2), None, None))
+# 월요일 10:00 ~ 00:00, 화요일 12:00 ~ 20:00
+MIDNIGHT = week(mon=(time(10), time(0), None, None), tue=(time(12), time(20), None, None))
+# 월요일 10:00 ~ 20:00, 브레이크 15:00 ~ 16:00
+BREAK = week(mon=(time(10), time(20), time(15), time(16)))
+# 매일 00:00 ~ 00:00 (항상 영업)
+ALWAYS_OPEN = [(time(0), time(0), None, None)] * 7
+ALWAYS_CLOSED = week()
+
+
+@pytest.mark.parametrize('week_hours, now, expected', [
+  # 전날 자정을 넘긴 영업시간
+  (OVERNIGHT, at(1, 17, 59, 59), 'closed'),
+  (OVERNIGHT, at(1, 18), 'opened'),
+  (OVERNIGHT, at(1, 23, 59, 59), 'opened'),
+  (OVERNIGHT, at(2, 0), 'opened'),
+  (OVERNIGHT, at(2, 1, 59, 59), 'opened'),
+  (OVERNIGHT, at(2, 2), 'closed'),
+  (OVERNIGHT, at(2, 18), 'closed'),
+  # 일요일 -> 월요일 새벽은 일요일이 휴무이므로 닫힘
+  (OVERNIGHT, at(1, 1), 'closed'),
+  # 00:00에 닫는 매장
+  (MIDNIGHT, at(1, 23, 59, 59), 'opened'),
+  (MIDNIGHT, at(2, 0), 'closed'),
+  (MIDNIGHT, at(2, 0, 30), 'closed'),
+  # 브레이크 시작 / 종료 경계 (종료 시각까지 브레이크)
+  (BREAK, at(1, 9, 59, 59), 'closed'),
+  (BREAK, at(1, 10), 'opened'),
+  (BREAK, at(1, 14, 59, 59), 'opened'),
+  (BREAK, at(1, 15), 'breaktime'),
+  (BREAK, at(1, 16), 'breaktime'),
+  (BREAK, at(1, 16, 0, 1), 'opened'),
+  (BREAK, at(1, 20), 'opened'),
+  (BREAK, at(1, 20, 0, 1), 'closed'),
+  (ALWAYS_OPEN, at(3, 0), 'opened'),
+  (ALWAYS_CLOSED, at(3, 12), 'closed'),
+])
+def test_status_from_week(week_hours, now, expected):
+  assert status_from_week(week_hours, now) == expected
+
+
+@pytest.mark.parametrize('week_hours, now, expected', [
+  (OVERNIGHT, at(1, 12), at(1, 18)),
+  (OVERNIGHT, at(1, 20), at(2, 2)),
+  (OVERNIGHT, at(2, 1, 59, 59), at(2, 2)),
+  # 화요일 새벽 영업이 끝나면 다음 주 월요일 18:00
+  (OVERNIGHT, at(2, 2), at(8, 18)),
+  (MIDNIGHT, at(1, 23), at(2, 0)),
+  (MIDNIGHT, at(2, 0), at(2, 12)),
+  (BREAK, at(1, 9), at(1, 10)),
+  (BREAK, at(1, 14, 59, 59), at(1, 15)),
+  (BREAK, at(1, 15), at(1, 16, 0, 1)),
+  (BREAK, at(1, 16, 0, 1), at(1, 20, 0, 1)),
+  # 1초 미만은 버림
+  (BREAK, at(1, 14, 59, 59).replace(microsecond=500000), at(1, 15)),
+  # 상태가 바뀌지 않는 매장
+  (ALWAYS_OPEN, at(3, 12), None),
+  (ALWAYS_CLOSED, at(3, 12), None),
+])
+def test_next_transition(week_hours, now, expected):
+  assert next_transition(week_hours, now) == expected
@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from server.models import VerificationCode
+from server.util import verification_store
+from server.util.verification_store import (
+  CODE_TTL, IP_MAX_SENDS, MAX_VERIFY_ATTEMPTS, PHONE_MAX_SENDS, PHONE_RESEND_INTERVAL, PHONE_WINDOW,
+  DatabaseVerificationStore, ExpiringStore, MemoryVerificationStore, VerificationThrottled,
+)
+
+
+class Clock:
+  def __init__(self, now: float = 1000.0):
+    self.now = now
+
+  def monotonic(self) -> float:
+    return self.now
+
+  def advance(self, seconds: float):
+    self.now += seconds
+
+
+# ExpiringStore / 저장소들이 사용하는 시각을 테스트에서 직접 움직임
+@pytest.fixture
+def clock(monkeypatch):
+  clock = Clock()
+  monkeypatch.setattr(verification_store, 'time', SimpleNamespace(monotonic=clock.monotonic))
+  monkeypatch.setattr(verification_store, 'get_skt_time', lambda: datetime(2026, 3, 2) + timedelta(seconds=clock.now))
+  return clock
+
+
+# *ExpiringStore*
+
+def test_entry_expires_inside_its_tick(clock):
+  store = ExpiringStore(10)
+  clock.now = 100.2
+  store.set('a', 1, 0.1)
+  store.set('b', 2, 0.7)
+
+  clock.now = 100.5
+  assert store.get('a') is None
+  assert store.get('b') == 2
+  assert len(store) == 1
+
+  # 같은 틱에서 나중에 만료되는 항목도 다음 확인 때 제거
+  clock.now = 100.95
+  assert store.get('b') is None
+  assert len(store) == 0
+
+
+def test_entry_expires_across_ticks(clock):
+  store = ExpiringStore(10)
+  store.set('a', 1, 5)
+
+  clock.advance(4.9)
+  assert store.get('a') == 1
+  assert store.ttl('a') == pytest.approx(0.1)
+
+  clock.advance(0.2)
+  assert store.get('a') is None
+  assert store.ttl('a') == 0.0
+  assert len(store) == 0
+
+
+def test_ttl_longer_than_one_wheel_turn(clock):
+  store = ExpiringStore(10, wheel_size=8)
+  store.set('a', 1, 20)
+
+  # 만료 슬롯을 한 바퀴 이상 지나쳐도 만료 시각 전에는 남아 있음
+  for _ in range(19):
+    clock.advance(1)
+    assert store.get('a') == 1
+
+  clock.advance(1.5)
+  assert store.get('a') is None
+  assert len(store) == 0
+
+
+def test_idle_longer_than_one_wheel_turn_expires_everything(clock):
+  store = ExpiringStore(10, wheel_size=8)
+  for key in range(5):
+    store.set(key, key, 1 + key)
+
+  clock.advance(100)
+  assert store.get(0) is None
+  assert len(store) == 0
+
+
+def test_max_entries_evicts_oldest(clock):
+  store = ExpiringStore(3)
+  for key in 'abc':
+    store.set(key, key, 60)
+
+  # 이미 있는 키를 다시 저장하면 다른 항목을 밀어내지 않음
+  store.set('a', 'A', 60)
+  assert [store.get(key) for key in 'abc'] == ['A', 'b', 'c']
+
+  store.set('d', 'd', 60)
+  assert store.get('b') is None
+  assert [store.get(key) for key in 'acd'] == ['A', 'c', 'd']
+  assert len(store) == 3
+
+
+def test_replace_keeps_expiry(clock):
+  store = ExpiringStore(10)
+  store.set('a', 1, 10)
+
+  clock.advance(6)
+  assert store.replace('a', 2)
+  assert store.get('a') == 2
+
+  clock.advance(5)
+  assert store.get('a') is None
+  assert not store.replace('a', 3)
+
+
+# *인증번호 저장소 (메모리 / DB)*
+
+@pytest.fixture(params=['memory', 'db'])
+def store(request, clock):
+  if request.param == 'memory':
+    return MemoryVerificationStore(100), None
+  return DatabaseVerificationStore(), request.getfixturevalue('db')
+
+
+def send(store, phone_number, ip='10.0.0.1'):
+  verification_store_, db = store
+  verification_store_.check_and_record_send(db, phone_number, ip)
+  verification_store_.save_code(db, phone_number, '123456')
+  if db is not None:
+    db.commit()
+
+
+def confirm(store, phone_number, code):
+  verification_store_, db = store
+  return verification_store_.confirm_code(db, phone_number, code)
+
+
+def test_resend_cooldown(store, clock):
+  send(store, '01012345678')
+
+  clock.advance(PHONE_RESEND_INTERVAL - 10)
+  with pytest.raises(VerificationThrottled) as throttled:
+    send(store, '01012345678')
+  assert throttled.value.retry_after == 10
+
+  clock.advance(10)
+  send(store, '01012345678')
+
+
+def test_phone_hourly_window(store, clock):
+  for _ in range(PHONE_MAX_SENDS):
+    send(store, '01012345678')
+    clock.advance(PHONE_RESEND_INTERVAL)
+
+  with pytest.raises(VerificationThrottled) as throttled:
+    send(store, '01012345678')
+  assert 0 < throttled.value.retry_after <= PHONE_WINDOW
+
+  clock.advance(throttled.value.retry_after)
+  send(store, '01012345678')
+
+
+def test_ip_hourly_window(store, clock):
+  for index in range(IP_MAX_SENDS):
+    send(store, f'0105555{index:04d}')
+
+  with pytest.raises(VerificationThrottled):
+    send(store, '01099999999')
+  # 다른 IP는 영향 없음
+  send(store, '01099999999', ip='10.0.0.2')
+
+
+def test_max_verify_attempts(store, clock):
+  send(store, '01012345678')
+
+  for _ in range(MAX_VERIFY_ATTEMPTS - 1):
+    assert confirm(store, '01012345678', '000000') == 'mismatch'
+  assert confirm(store, '01012345678', '000000') == 'too_many_attempts'
+  # 시도 횟수를 넘긴 인증번호는 맞게 입력해도 사용할 수 없음
+  assert confirm(store, '01012345678', '123456') == 'expired'
+
+
+def test_code_expiry_and_verification(store, clock):
+  verification_store_, db = store
+  send(store, '01012345678')
+
+  clock.advance(CODE_TTL + 1)
+  assert confirm(store, '01012345678', '123456') == 'expired'
+
+  send(store, '01012345678')
+  assert confirm(store, '01012345678', '123456') == 'verified'
+  assert confirm(store, '01012345678', '123456') == 'expired'
+  assert verification_store_.is_verified(db, '01012345678')
+
+  verification_store_.consume_verified(db, '01012345678')
+  assert not verification_store_.is_verified(db, '01012345678')
+
+
+def test_database_store_purges_finished_rows(db, clock):
+  store = DatabaseVerificationStore()
+  send((store, db), '01012345678')
+  assert store.purge(db) == 0
+
+  clock.advance(PHONE_WINDOW + 1)
+  send((store, db), '01099999999', ip='10.0.0.2')
+  assert store.purge(db) == 2
+  assert {row.key for row in db.query(VerificationCode)} == {'phone:01099999999', 'ip:10.0.0.2'}